@@ -0,0 +1,53 @@
+"""
+Benchmark for recalculating tables of mineral analyses to atoms per formula unit
+(:meth:`pyrolite.mineral.template.MineralTemplate.apfu`) and allocating cations to
+sites (:meth:`pyrolite.mineral.template.MineralTemplate.calculate_occupancy`) for
+synthetic pyroxene analyses.
+
+Run with :code:`python benchmarks/bench_apfu.py [nrows ...]`; to compare
+against another revision, run the same script with that revision checked out.
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from pyrolite.mineral.template import PYROXENE
+
+PYROXENE_ANALYSIS = pd.Series(
+    [57.10, 0.17, 0.70, 0.27, 0.60, 5.21, 0.17, 34.52, 0.62, 0.07],
+    index=["SiO2", "TiO2", "Al2O3", "Cr2O3", "Fe2O3", "FeO"]
+    + ["MnO", "MgO", "CaO", "Na2O"],
+)
+
+
+def synthetic_data(nrows, seed=32):
+    """
+    Generate synthetic pyroxene analyses by perturbing a reference analysis, with
+    ferric iron missing for some analyses.
+    """
+    rng = np.random.default_rng(seed)
+    X = PYROXENE_ANALYSIS.values * rng.uniform(0.8, 1.2, (nrows, 10))
+    df = pd.DataFrame(X, columns=PYROXENE_ANALYSIS.index)
+    df.loc[rng.random(nrows) < 0.3, "Fe2O3"] = np.nan
+    return df
+
+
+def run(sizes=(1000, 10000, 100000, 300000)):
+    """
+    Time recalculation and site allocation for a range of dataset sizes.
+    """
+    print("{:>10} {:>10} {:>14}".format("nrows", "apfu (s)", "occupancy (s)"))
+    for nrows in sizes:
+        df = synthetic_data(nrows)
+        start = time.perf_counter()
+        apfu = PYROXENE.apfu(df)
+        mid = time.perf_counter()
+        PYROXENE.calculate_occupancy(apfu)
+        end = time.perf_counter()
+        print("{:>10} {:>10.3f} {:>14.3f}".format(nrows, mid - start, end - mid))
+
+
+if __name__ == "__main__":
+    run(*([[int(s) for s in sys.argv[1:]]] if sys.argv[1:] else []))
@@ -0,0 +1,78 @@
+"""
+Benchmark for the CIPW norm (:func:`pyrolite.mineral.normative.CIPW_norm`) on
+synthetic major element compositions, comparing processing of the full array at
+once with row-chunked processing.
+
+Run with :code:`python benchmarks/bench_cipw.py [nrows ...]`; to compare against
+another revision, run the same script with that revision checked out.
+"""
+
+import sys
+import time
+import tracemalloc
+import warnings
+
+from pyrolite.mineral.normative import CIPW_norm
+from pyrolite.util.synthetic import normal_frame
+
+warnings.simplefilter("ignore")
+
+COLUMNS = ["SiO2", "TiO2", "Al2O3", "Fe2O3", "FeO", "MnO", "MgO", "CaO"] + [
+    "Na2O",
+    "K2O",
+    "P2O5",
+    "CO2",
+    "SO3",
+]
+
+
+def synthetic_data(nrows, seed=32):
+    """
+    Generate a synthetic dataset of major element compositions in wt%.
+    """
+    return normal_frame(columns=COLUMNS, size=nrows, seed=seed) * 100
+
+
+def timed(f, df, **kwargs):
+    """
+    Get the execution time and peak traced memory use of a function call on a copy
+    of a dataframe, from separate calls such that memory tracing doesn't affect the
+    timing.
+    """
+    start = time.perf_counter()
+    f(df.copy(), **kwargs)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    f(df.copy(), **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run(sizes=(1000, 10000, 100000), chunksizes=(None, 100000, 10000, 1000)):
+    """
+    Time the CIPW norm for a range of dataset sizes and chunk sizes.
+    """
+    print(
+        "{:>10} {:>10} {:>10} {:>12}".format(
+            "nrows", "chunksize", "time (s)", "peak (MB)"
+        )
+    )
+    for nrows in sizes:
+        df = synthetic_data(nrows)
+        for chunksize in chunksizes:
+            try:
+                elapsed, peak = timed(CIPW_norm, df, chunksize=chunksize)
+            except TypeError:  # revisions without chunked processing
+                if chunksize is not None:
+                    continue
+                elapsed, peak = timed(CIPW_norm, df)
+            print(
+                "{:>10} {:>10} {:>10.3f} {:>12.1f}".format(
+                    nrows, str(chunksize), elapsed, peak / 1e6
+                )
+            )
+
+
+if __name__ == "__main__":
+    run(*([[int(s) for s in sys.argv[1:]]] if sys.argv[1:] else []))
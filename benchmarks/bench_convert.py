@@ -0,0 +1,54 @@
+"""
+Benchmark for converting tables of major element oxides and trace elements to
+different sets of components (:func:`pyrolite.geochem.transform.convert_chemistry`),
+for synthetic data, including the compilation of conversion plans
+(:func:`pyrolite.geochem.transform.get_conversion_plan`) on the first call.
+
+Run with :code:`python benchmarks/bench_convert.py [nrows ...]`; to compare
+against another revision, run the same script with that revision checked out.
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from pyrolite.geochem.transform import convert_chemistry
+
+COLUMNS = ["SiO2", "TiO2", "Al2O3", "Fe2O3", "FeO", "MnO", "MgO", "CaO", "Na2O"]
+COLUMNS += ["K2O", "P2O5", "Cr", "Ni", "Rb", "Sr", "Ba", "Zr", "La", "Ce"]
+TARGETS = ["SiO2", "TiO2", "Al2O3", "FeOT", "MnO", "MgO", "CaO", "Na2O", "K2O"]
+TARGETS += ["P2O5", "Cr2O3", "NiO", "Rb", "Sr", "Ba", "Zr", "La", "Ce"]
+
+
+def synthetic_data(nrows, seed=32):
+    """
+    Generate a table of positive values, with some missing values.
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.lognormal(0, 1, (nrows, len(COLUMNS))), columns=COLUMNS)
+    return df.mask(rng.random(df.shape) < 0.1)
+
+
+def run(sizes=(1000, 10000, 100000, 1000000)):
+    """
+    Time conversions for a range of dataset sizes, for a single target and the
+    full set of targets (with and without iron speciation).
+    """
+    print(
+        "{:>10} {:>10} {:>10} {:>10}".format("nrows", "FeOT (s)", "all (s)", "Fe (s)")
+    )
+    speciated = TARGETS[:3] + [{"FeO": 0.9, "Fe2O3": 0.1}] + TARGETS[4:]
+    for nrows in sizes:
+        df = synthetic_data(nrows)
+        times = []
+        for to in [["FeOT"], TARGETS, speciated]:
+            start = time.perf_counter()
+            convert_chemistry(df, to=to)
+            times.append(time.perf_counter() - start)
+        print("{:>10} {:>10.3f} {:>10.3f} {:>10.3f}".format(nrows, *times))
+
+
+if __name__ == "__main__":
+    run(*([[int(s) for s in sys.argv[1:]]] if sys.argv[1:] else []))
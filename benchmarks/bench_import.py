@@ -0,0 +1,51 @@
+"""
+Benchmark for the time taken to import pyrolite and its submodules, as measured by
+:code:`python -X importtime` in a fresh interpreter, together with which of the
+slower optional dependencies (e.g. matplotlib, sympy) are imported along the way.
+
+Run with :code:`python benchmarks/bench_import.py [module ...]`; to compare
+against another revision, run the same script with that revision checked out.
+"""
+import subprocess
+import sys
+
+HEAVY_MODULES = ["matplotlib", "mpltern", "sympy", "scipy.stats", "sklearn"]
+
+
+def import_times(module):
+    """
+    Import a module in a new interpreter, and get the cumulative import time
+    (in seconds) for each module imported along the way.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import {}".format(module)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def run(modules=("pyrolite", "pyrolite.geochem", "pyrolite.comp", "pyrolite.plot")):
+    """
+    Time imports for a number of modules, each in a fresh interpreter.
+    """
+    print("{:>20} {:>10}  {}".format("module", "time (s)", "heavy imports"))
+    for module in modules:
+        times = import_times(module)
+        heavy = [m for m in HEAVY_MODULES if m in times]
+        print(
+            "{:>20} {:>10.3f}  {}".format(
+                module, times[module], ", ".join(heavy) or "-"
+            )
+        )
+
+
+if __name__ == "__main__":
+    run(*([sys.argv[1:]] if sys.argv[1:] else []))
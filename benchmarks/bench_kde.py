@@ -0,0 +1,95 @@
+"""
+Benchmark for kernel density estimates sampled over a grid
+(:func:`pyrolite.util.distributions.sample_kde`), comparing exact evaluation at each
+grid node with evaluation from binned data, for synthetic bivariate data. Estimates
+at the data points themselves (e.g. for
+:meth:`~pyrolite.plot.pyroplot.heatscatter`) are also compared for the binned and
+tree-based methods.
+
+Run with :code:`python benchmarks/bench_kde.py [npoints ...]`; to compare
+against another revision, run the same script with that revision checked out.
+"""
+import sys
+import time
+
+import numpy as np
+
+from pyrolite.util.distributions import sample_kde
+
+
+def synthetic_data(npoints, seed=32):
+    """
+    Generate a bimodal bivariate dataset.
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.multivariate_normal([0, 0], [[1, 0.6], [0.6, 2]], npoints)
+    X[: npoints // 3] += [3, 1]
+    return X
+
+
+def run(sizes=(1000, 10000, 100000, 1000000), bins=200, exact_limit=10**9):
+    """
+    Time KDEs sampled over a grid for a range of dataset sizes. Exact estimates are
+    skipped where they would require more than `exact_limit` kernel evaluations.
+    """
+    print(
+        "{:>10} {:>8} {:>10} {:>11} {:>10}".format(
+            "npoints", "grid", "exact (s)", "binned (s)", "max error"
+        )
+    )
+    for npoints in sizes:
+        X = synthetic_data(npoints)
+        xs, ys = (np.linspace(X[:, i].min(), X[:, i].max(), bins) for i in range(2))
+        grid = np.meshgrid(xs, ys)
+        start = time.perf_counter()
+        binned = sample_kde(X, grid, kde_method="binned")
+        t_binned = time.perf_counter() - start
+        if npoints * bins**2 <= exact_limit:
+            start = time.perf_counter()
+            exact = sample_kde(X, grid, kde_method="exact")
+            t_exact = time.perf_counter() - start
+            error = np.abs(binned - exact).max() / exact.max()
+            t_exact, error = "{:.3f}".format(t_exact), "{:.2e}".format(error)
+        else:
+            t_exact, error = "-", "-"
+        print(
+            "{:>10} {:>8} {:>10} {:>11.3f} {:>10}".format(
+                npoints, "{}x{}".format(bins, bins), t_exact, t_binned, error
+            )
+        )
+
+
+def run_points(sizes=(1000, 10000, 100000, 300000), exact_limit=10**9):
+    """
+    Time KDEs evaluated at each data point for a range of dataset sizes, with
+    errors relative to the exact estimate where it is evaluated.
+    """
+    print(
+        "{:>10} {:>10} {:>11} {:>10} {:>12} {:>10}".format(
+            "npoints", "exact (s)", "binned (s)", "error", "tree (s)", "error"
+        )
+    )
+    for npoints in sizes:
+        X = synthetic_data(npoints)
+        exact, row = None, [npoints]
+        if npoints**2 <= exact_limit:
+            start = time.perf_counter()
+            exact = sample_kde(X, X, kde_method="exact")
+            row.append("{:.3f}".format(time.perf_counter() - start))
+        else:
+            row.append("-")
+        for method in ["binned", "tree"]:
+            start = time.perf_counter()
+            zi = sample_kde(X, X, kde_method=method)
+            row.append("{:.3f}".format(time.perf_counter() - start))
+            if exact is not None:
+                row.append("{:.2e}".format(np.abs(zi - exact).max() / exact.max()))
+            else:
+                row.append("-")
+        print("{:>10} {:>10} {:>11} {:>10} {:>12} {:>10}".format(*row))
+
+
+if __name__ == "__main__":
+    sizes = [[int(s) for s in sys.argv[1:]]] if sys.argv[1:] else []
+    run(*sizes)
+    run_points(*sizes)
@@ -0,0 +1,96 @@
+"""
+Benchmark for fitting the lattice strain model to partition coefficients
+(:func:`pyrolite.mineral.lattice.fit_lattice_strain`) for synthetic samples with
+missing data, comparing the batched fit with individual fits of each sample using
+:func:`scipy.optimize.least_squares`.
+
+Run with :code:`python benchmarks/bench_lattice.py [nrows ...]`; to compare
+against another revision, run the same script with that revision checked out.
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import least_squares
+
+from pyrolite.geochem.ind import get_ionic_radii
+from pyrolite.mineral.lattice import fit_lattice_strain, strain_coefficient
+
+IONS = ["Ca", "Sr", "Ba", "Mg", "Mn", "Fe", "Pb", "Cd", "Zn"]
+RADII = np.array(get_ionic_radii(IONS, charge=2, coordination=8))
+
+
+def synthetic_data(nrows, seed=32):
+    """
+    Generate partition coefficients for a range of lattice strain parameters and
+    temperatures, with 1% noise and 10% missing values.
+    """
+    rng = np.random.default_rng(seed)
+    D0 = np.exp(rng.uniform(-1, 2, nrows))
+    r0 = rng.uniform(1.0, 1.2, nrows)
+    E = rng.uniform(60, 250, nrows) * 10**9
+    T = rng.uniform(1100, 1600, nrows)
+    D = np.array(
+        [
+            d0 * strain_coefficient(_r0, RADII, r0=_r0, E=_E, T=_T)
+            for d0, _r0, _E, _T in zip(D0, r0, E, T)
+        ]
+    )
+    D *= np.exp(rng.normal(0, 0.01, D.shape))
+    D[rng.random(D.shape) < 0.1] = np.nan
+    return pd.DataFrame(D, columns=IONS), T
+
+
+def fit_rows(D, T):
+    """
+    Fit each sample individually with :func:`scipy.optimize.least_squares`.
+    """
+    k = 4.0 * np.pi * 6.023 * 10**23 * 10**-21 / (8.314 * T)
+
+    def residuals(p, r, y, k):
+        d = r - p[1]
+        return p[0] - k * p[2] * (p[1] / 2 * d**2 + d**3 / 3) - y
+
+    out = np.ones((D.shape[0], 3)) * np.nan
+    for ix, row in enumerate(D.values):
+        present = np.isfinite(row)
+        if present.sum() < 3:
+            continue
+        y = np.log(row[present])
+        x0 = [y.max(), RADII[present][y.argmax()], 100.0]
+        fit = least_squares(residuals, x0, args=(RADII[present], y, k[ix]))
+        out[ix] = fit.x
+    return out
+
+
+def run(sizes=(100, 1000, 10000, 100000), rowwise_limit=10000):
+    """
+    Time lattice strain fits for a range of dataset sizes. Individual fits are
+    skipped for more than `rowwise_limit` samples.
+    """
+    print(
+        "{:>10} {:>12} {:>12} {:>12}".format(
+            "nrows", "rowwise (s)", "batched (s)", "max Δr0 (Å)"
+        )
+    )
+    for nrows in sizes:
+        D, T = synthetic_data(nrows)
+        start = time.perf_counter()
+        batched = fit_lattice_strain(D, radii=RADII, T=T)
+        t_batched = time.perf_counter() - start
+        if nrows <= rowwise_limit:
+            start = time.perf_counter()
+            rowwise = fit_rows(D, T)
+            t_rowwise = "{:.3f}".format(time.perf_counter() - start)
+            error = "{:.2e}".format(np.nanmax(np.abs(batched["r0"] - rowwise[:, 1])))
+        else:
+            t_rowwise, error = "-", "-"
+        print(
+            "{:>10} {:>12} {:>12.3f} {:>12}".format(nrows, t_rowwise, t_batched, error)
+        )
+
+
+if __name__ == "__main__":
+    sizes = [[int(s) for s in sys.argv[1:]]] if sys.argv[1:] else []
+    run(*sizes)
@@ -0,0 +1,51 @@
+"""
+Benchmark for missing data pattern detection
+(:func:`pyrolite.util.missing.md_pattern`) on synthetic arrays with varying numbers
+of rows, columns and missing data patterns.
+
+Run with :code:`python benchmarks/bench_md_pattern.py [nrows ...]`; to compare
+against another revision, run the same script with that revision checked out.
+"""
+import sys
+import time
+
+import numpy as np
+
+from pyrolite.util.missing import md_pattern
+
+
+def synthetic_data(nrows, ncols, missing=0.1, seed=32):
+    """
+    Generate a synthetic array with values missing completely at random; higher
+    proportions of missing values and more columns give more distinct patterns.
+    """
+    rng = np.random.default_rng(seed)
+    Y = rng.random((nrows, ncols))
+    Y[rng.random((nrows, ncols)) < missing] = np.nan
+    return Y
+
+
+def run(sizes=(1000, 10000, 100000), shapes=((10, 0.05), (30, 0.1), (60, 0.2))):
+    """
+    Time missing data pattern detection for a range of dataset sizes and shapes.
+    """
+    print(
+        "{:>10} {:>6} {:>8} {:>10} {:>10}".format(
+            "nrows", "ncols", "missing", "patterns", "time (s)"
+        )
+    )
+    for nrows in sizes:
+        for ncols, missing in shapes:
+            Y = synthetic_data(nrows, ncols, missing=missing)
+            start = time.perf_counter()
+            _, patterns = md_pattern(Y)
+            elapsed = time.perf_counter() - start
+            print(
+                "{:>10} {:>6} {:>8} {:>10} {:>10.3f}".format(
+                    nrows, ncols, missing, len(patterns), elapsed
+                )
+            )
+
+
+if __name__ == "__main__":
+    run(*([[int(s) for s in sys.argv[1:]]] if sys.argv[1:] else []))
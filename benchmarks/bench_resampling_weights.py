@@ -0,0 +1,67 @@
+"""
+Benchmark for spatiotemporal resampling weights
+(:func:`pyrolite.util.resampling.get_spatiotemporal_resampling_weights`) on
+synthetic global sample locations and ages, comparing the exact (streamed-block)
+calculation with the approximate (spatial index) calculation.
+
+Run with :code:`python benchmarks/bench_resampling_weights.py [nrows ...]`.
+"""
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from pyrolite.util.resampling import get_spatiotemporal_resampling_weights
+
+warnings.simplefilter("ignore")
+
+
+def synthetic_data(nrows, seed=32):
+    """
+    Generate a synthetic dataset of clustered sample locations and ages.
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.uniform([-60, -180, 0], [60, 180, 3000], size=(50, 3))
+    data = centres[rng.integers(0, 50, nrows)] + rng.normal(
+        scale=[5, 5, 100], size=(nrows, 3)
+    )
+    return pd.DataFrame(data, columns=["Latitude", "Longitude", "Age"])
+
+
+def run(sizes=(1000, 10000, 30000), truncations=(None, 30, 10)):
+    """
+    Time the weight calculation for a range of dataset sizes, exactly
+    (:code:`truncation=None`) and approximately for different truncation radii.
+    """
+    print(
+        "{:>10} {:>10} {:>10} {:>12}".format(
+            "nrows", "truncation", "time (s)", "max rel. err"
+        )
+    )
+    for nrows in sizes:
+        df = synthetic_data(nrows)
+        for truncation in truncations:
+            start = time.perf_counter()
+            if truncation is None:
+                get_spatiotemporal_resampling_weights(df)
+                error = 0.0
+            else:
+                _, errors = get_spatiotemporal_resampling_weights(
+                    df,
+                    approximate=True,
+                    truncation=truncation,
+                    return_error_bounds=True,
+                )
+                error = errors.max()
+            elapsed = time.perf_counter() - start
+            print(
+                "{:>10} {:>10} {:>10.3f} {:>12.2e}".format(
+                    nrows, str(truncation), elapsed, error
+                )
+            )
+
+
+if __name__ == "__main__":
+    run(*([[int(s) for s in sys.argv[1:]]] if sys.argv[1:] else []))
@@ -0,0 +1,58 @@
+"""
+Benchmark for the sulfur content at sulfate and sulfide saturation
+(:func:`pyrolite.geochem.magma.SCSS`) evaluated over a temperature-pressure grid
+for synthetic melt compositions, for full outputs (as float64 and float32 arrays)
+and for per-composition summaries over the grid.
+
+Run with :code:`python benchmarks/bench_scss.py [nrows ...]`; to compare
+against another revision, run the same script with that revision checked out.
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from pyrolite.geochem.magma import SCSS
+
+MELT = pd.Series(
+    [50.0, 10.0, 1.0, 9.0, 10.0, 14.0, 1.6, 1.5, 0.5],
+    index=["SiO2", "FeO", "TiO2", "CaO", "MgO", "Al2O3", "Fe2O3", "Na2O", "H2O"],
+)
+
+
+def synthetic_data(nrows, seed=32):
+    """
+    Generate synthetic melt compositions by perturbing a reference composition.
+    """
+    rng = np.random.default_rng(seed)
+    X = MELT.values * rng.uniform(0.8, 1.2, (nrows, MELT.size))
+    return pd.DataFrame(X, columns=MELT.index)
+
+
+def run(sizes=(100, 1000, 10000, 50000), gridsize=200, full_limit=10**8):
+    """
+    Time SCSS over a temperature-pressure grid for a range of dataset sizes. Full
+    outputs are skipped where they would have more than `full_limit` values.
+    """
+    T, P = np.linspace(900, 1400, gridsize), np.linspace(0.001, 20, gridsize)
+    print(
+        "{:>10} {:>12} {:>12} {:>12}".format(
+            "nrows", "float64 (s)", "float32 (s)", "summary (s)"
+        )
+    )
+    for nrows in sizes:
+        df = synthetic_data(nrows)
+        times = []
+        for kwargs in [dict(), dict(dtype="float32"), dict(summary=["min", "max"])]:
+            if "summary" not in kwargs and nrows * gridsize**2 > full_limit:
+                times.append("-")
+                continue
+            start = time.perf_counter()
+            SCSS(df, T, P, grid="grid", **kwargs)
+            times.append("{:.3f}".format(time.perf_counter() - start))
+        print("{:>10} {:>12} {:>12} {:>12}".format(nrows, *times))
+
+
+if __name__ == "__main__":
+    run(*([[int(s) for s in sys.argv[1:]]] if sys.argv[1:] else []))
@@ -40,6 +40,13 @@ ts.named_age(1212.1, level="Epoch")
 # The timescale can also do the inverse for you, and return the timing information for a
 # given named age:
 ts.text2age("Holocene")
+########################################################################################
+# Both of these lookups can also be performed for whole arrays or series at once,
+# with names returned as a categorical array:
+#
+ts.named_ages([0.01, 150.0, 1212.1], level="Period")
+########################################################################################
+ts.text2ages(["Holocene", "Jurassic", "Mesoproterozoic"])
 #########################################################################################
 # We can use this to create a simple template to visualise the geological timescale:
 #
@@ -9,13 +9,27 @@ del get_versions
 import importlib
 import pkgutil
 
-import matplotlib.style
-
 from .util.log import Handle
-from .util.plot.style import _export_mplstyle  # this import adds the style used below
 
 logger = Handle(__name__)
 
+# submodules are imported on first access (see __getattr__ below), such that
+# importing pyrolite doesn't also import plotting libraries
+_submodules = ["comp", "data", "extensions", "geochem", "mineral", "plot", "util"]
+
+
+def __getattr__(name):
+    """
+    Import pyrolite submodules on first access (e.g. :code:`pyrolite.plot`).
+    """
+    if name in _submodules:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_submodules))
+
 
 def load_extensions(base="pyrolite_", replace=["util"]):
     """
@@ -42,8 +56,5 @@ def load_extensions(base="pyrolite_", replace=["util"]):
         setattr(extensions, n, m)
 
 
-# _export_pyrolite_mplstyle() should be called in .plot import regardless
-matplotlib.style.use("pyrolite")
-
 from . import _version
 __version__ = _version.get_versions()['version']
@@ -170,7 +170,95 @@ def nan_weighted_compositional_mean(
         return mean
 
 
-def cross_ratios(df: pd.DataFrame):
+class RatioView(object):
+    """
+    Lazy view of the ratios between the columns of an array, equivalent to (but
+    without materialising) a 3D array of shape :code:`(n, D, D)` where
+    :code:`view[r, i, j] = X[r, i] / X[r, j]`. Ratios are calculated only for the
+    records and pairs of columns which are requested.
+
+    Parameters
+    ---------------
+    X : :class:`numpy.ndarray`
+        2D array of compositions to create ratios of.
+    transpose : :class:`bool`
+        Whether to transpose the ratio matrix for each record, such that
+        :code:`view[r, i, j] = X[r, j] / X[r, i]`.
+    dtype : :class:`str` | :class:`numpy.dtype`
+        Data type for calculated ratios.
+
+    Notes
+    ------
+    Index arrays for the last two axes are applied independently (i.e. as per
+    :func:`numpy.ix_`), giving ratios for all combinations of the specified
+    columns. To get ratios for specific pairs of columns, use :meth:`pairs`.
+    """
+
+    def __init__(self, X, transpose=False, dtype="float64"):
+        self.X = np.asarray(X, dtype=dtype)
+        self.transpose = transpose
+        self.dtype = self.X.dtype
+
+    @property
+    def shape(self):
+        """Shape of the equivalent array of ratios."""
+        n, D = self.X.shape
+        return (n, D, D)
+
+    @property
+    def ndim(self):
+        return 3
+
+    def __len__(self):
+        return self.X.shape[0]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        rows, i, j = key + (slice(None),) * (3 - len(key))
+        X = self.X[rows]
+        single = X.ndim == 1  # a single record
+        X = X.reshape(-1, self.X.shape[1])
+        columns = np.arange(X.shape[1])
+        # column values for the second and third axes, as (n, ) or (n, k) arrays
+        A, B = [
+            X[:, ix] if isinstance(ix, (int, np.integer)) else X[:, columns[ix]]
+            for ix in (i, j)
+        ]
+        if A.ndim == 2 and B.ndim == 2:
+            A, B = A[:, :, np.newaxis], B[:, np.newaxis, :]
+        elif A.ndim != B.ndim:
+            A, B = (A, B[:, np.newaxis]) if A.ndim == 2 else (A[:, np.newaxis], B)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratios = B / A if self.transpose else A / B
+        return ratios[0] if single else ratios
+
+    def pairs(self, i, j):
+        """
+        Get the ratios for specific pairs of columns.
+
+        Parameters
+        ---------------
+        i, j : :class:`int` | :class:`list` | :class:`numpy.ndarray`
+            Indexes of the columns for each pair, as would be used for the last two
+            axes of the equivalent array.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of shape :code:`(n, k)` (or :code:`(n, )` for a single pair).
+        """
+        if self.transpose:
+            i, j = j, i
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.X[:, i] / self.X[:, j]
+
+    def __array__(self, dtype=None):
+        out = self[:, :, :]
+        return out if dtype is None else out.astype(dtype)
+
+
+def cross_ratios(df: pd.DataFrame, dtype="float64", lazy=False):
     """
     Takes ratios of values across a dataframe, such that columns are
     denominators and the row indexes the numerators, to create a square array.
@@ -180,21 +268,25 @@ def cross_ratios(df: pd.DataFrame):
     ---------------
     df : :class:`pandas.DataFrame`
         Dataframe of compositions to create ratios of.
+    dtype : :class:`str` | :class:`numpy.dtype`
+        Data type for the output (e.g. :code:`"float32"` to halve memory use).
+    lazy : :class:`bool`
+        Whether to return a :class:`RatioView` which calculates ratios as they are
+        accessed, rather than an array.
 
     Returns
     -------
-    :class:`numpy.ndarray`
+    :class:`numpy.ndarray` | :class:`RatioView`
         A 3D array of ratios.
     """
-    ratios = np.ones((len(df.index), len(df.columns), len(df.columns)))
-    for idx in range(df.index.size):
-        row_vals = df.iloc[idx, :].values
-        r1 = row_vals.T[:, np.newaxis] @ np.ones_like(row_vals)[np.newaxis, :]
-        ratios[idx] = r1 / r1.T
-    return ratios
+    X = np.asarray(df.values, dtype=dtype)
+    if lazy:
+        return RatioView(X, dtype=dtype)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return X[:, :, np.newaxis] / X[:, np.newaxis, :]
 
 
-def np_cross_ratios(X: np.ndarray, debug=False):
+def np_cross_ratios(X: np.ndarray, debug=False, dtype="float64", lazy=False):
     """
     Takes ratios of values across an array, such that columns are
     denominators and the row indexes the numerators, to create a square array.
@@ -204,29 +296,29 @@ def np_cross_ratios(X: np.ndarray, debug=False):
     ---------------
     X : :class:`numpy.ndarray`
         Array of compositions to create ratios of.
+    dtype : :class:`str` | :class:`numpy.dtype`
+        Data type for the output (e.g. :code:`"float32"` to halve memory use).
+    lazy : :class:`bool`
+        Whether to return a :class:`RatioView` which calculates ratios as they are
+        accessed, rather than an array.
 
     Returns
     -------
-    :class:`numpy.ndarray`
+    :class:`numpy.ndarray` | :class:`RatioView`
         A 3D array of ratios.
     """
-    X = X.copy()
+    X = np.array(X, dtype=dtype)
     with warnings.catch_warnings():
         # can get invalid values which raise RuntimeWarnings
         # consider changing to np.errstate
         warnings.simplefilter("ignore", category=RuntimeWarning)
         X[X <= 0] = np.nan
     if X.ndim == 1:
-        index_length = 1
         X = X.reshape((1, *X.shape))
-    else:
-        index_length = X.shape[0]
+    if lazy:
+        return RatioView(X, transpose=True, dtype=dtype)
     dims = X.shape[-1]
-    ratios = np.ones((index_length, dims, dims))
-    for idx in range(index_length):
-        row_vals = X[idx, :]
-        r1 = row_vals.T[:, np.newaxis] @ np.ones_like(row_vals)[np.newaxis, :]
-        ratios[idx] = r1.T / r1
+    ratios = X[:, np.newaxis, :] / X[:, :, np.newaxis]
 
     if debug:
         try:
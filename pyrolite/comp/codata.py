@@ -2,9 +2,6 @@ import warnings
 
 import numpy as np
 import pandas as pd
-import scipy.special
-import scipy.stats
-import sympy
 
 from ..util.log import Handle
 
@@ -322,6 +319,7 @@ def _aggregate_sympy_constants(expr):
     -------
     :class:`sympy.core.expr.Expr`
     """
+    import sympy  # imported on use, as it is slow to import
     const = expr.func(*[term for term in expr.args if not term.free_symbols])
     vars = expr.func(*[term for term in expr.args if term.free_symbols])
     if const:
@@ -352,6 +350,7 @@ def get_ALR_labels(df, mode="simple", ind=-1, **kwargs):
     If one of these column names is found, it will be replaced with a title-cased
     duplicated version of itself (e.g. 'S' will be replaced by 'Ss').
     """
+    import sympy  # imported on use, as it is slow to import
 
     names = [
         r"{} / {}".format(
@@ -406,6 +405,7 @@ def get_CLR_labels(df, mode="simple", **kwargs):
     If one of these column names is found, it will be replaced with a title-cased
     duplicated version of itself (e.g. 'S' will be replaced by 'Ss').
     """
+    import sympy  # imported on use, as it is slow to import
 
     names = [
         r"{} / γ".format(
@@ -460,6 +460,7 @@ def get_ILR_labels(df, mode="latex", **kwargs):
     If one of these column names is found, it will be replaced with a title-cased
     duplicated version of itself (e.g. 'S' will be replaced by 'Ss').
     """
+    import sympy  # imported on use, as it is slow to import
     D = df.columns.size
     # encode symbolic variables
     sym_vars = [sympy.var("c_{}".format(ix)) for ix in range(D)]
@@ -536,6 +537,8 @@ def boxcox(
         Box-Cox transformed array. If `return_lmbda` is true, tuple contains data and
         lambda value.
     """
+    import scipy.stats  # imported on use, as it is slow to import
+
     if isinstance(X, pd.DataFrame) or isinstance(X, pd.Series):
         _X = X.values
     else:
@@ -584,6 +587,8 @@ def inverse_boxcox(Y: np.ndarray, lmbda):
     :class:`numpy.ndarray`
         Inverse Box-Cox transformed array.
     """
+    import scipy.special  # imported on use, as it is slow to import
+
     return scipy.special.inv_boxcox(Y, lmbda)
 
 
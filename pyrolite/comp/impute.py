@@ -1,4 +1,10 @@
+import time
+from functools import partial
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+
 import numpy as np
+import pandas as pd
 import scipy.stats as stats
 
 from pyrolite.comp.codata import ALR, close, inverse_ALR
@@ -10,7 +16,7 @@ from ..util.log import Handle
 logger = Handle(__name__)
 
 
-def _little_sweep(G, k: int = 0, verify=False):
+def _little_sweep(G, k: int = 0, verify=False, inplace=False):
     """
     Parameters
     ---------------
@@ -20,6 +26,9 @@ def _little_sweep(G, k: int = 0, verify=False):
         Index to sweep on.
     verify : :class:`bool`
         Whether to verify valid matrix input.
+    inplace : :class:`bool`
+        Whether to sweep the (floating point) input array in place, rather than a
+        copy.
 
     Returns
     --------
@@ -42,7 +51,7 @@ def _little_sweep(G, k: int = 0, verify=False):
         h_jl = g_jl - g_jk * g_kl / g_kk ; j != k; l != k
 
     """
-    H = np.asarray(G).copy()
+    H = np.array(G, dtype=float) if not inplace else G
     n = H.shape[0]
     if verify:
         if H.shape != (n, n):
@@ -51,15 +60,13 @@ def _little_sweep(G, k: int = 0, verify=False):
             raise ValueError("Not all finite.")
         if not np.allclose(H - H.T, 0):
             raise ValueError("Not a symmetrical array")
-    inds = [i for i in np.linspace(0, n - 1, n).astype(int) if not np.isclose(i, k)]
-    assert np.isfinite(G[k, k]) & (G[k, k] != 0.0)
-    H[k, k] = -1 / G[k, k]
-    H[k, inds] = -G[k, inds] * H[k, k]  # divide row k by D
-    H[inds, k] = -G[inds, k] * H[k, k]  # divide column k by D
-    for j in inds:
-        for l in inds:
-            H[j, l] = G[j, l] - H[j, k] * G[k, l]
-
+    d = H[k, k]
+    assert np.isfinite(d) & (d != 0.0)
+    row, col = H[k, :] / d, H[:, k].copy()
+    H -= np.outer(col, row)  # rank-1 update, h_jl = g_jl - g_jk * g_kl / g_kk
+    H[k, :] = row
+    H[:, k] = col / d
+    H[k, k] = -1 / d
     return H
 
 
@@ -78,9 +85,9 @@ def _multisweep(G, ks):
     --------
     :class:`numpy.ndarray`
     """
-    H = G.copy()
+    H = np.array(G, dtype=float)
     for k in ks:
-        H = _little_sweep(H, k=k)
+        _little_sweep(H, k=k, inplace=True)
     return H
 
 
@@ -148,12 +155,122 @@ def _reg_sweep(M: np.ndarray, C: np.ndarray, varobs: np.ndarray, error_threshold
     return β, σ2_res
 
 
+def _pattern_regressions(M, C, varobs):
+    """
+    Regression coefficients and residual covariances for a number of missing data
+    patterns. Patterns are ordered by their observed variables such that sweeps of
+    the augmented covariance matrix over shared (leading) sets of observed variables
+    are performed only once, and are cached for subsequent patterns.
+
+    Parameters
+    -----------
+    M : :class:`numpy.ndarray`
+        Array of means of shape :code:`(D, )`.
+    C : :class:`numpy.ndarray`
+        Covariance of shape :code:`(D, D)`.
+    varobs : :class:`list`
+        List of integer arrays of the observed variables for each pattern.
+
+    Returns
+    --------
+    :class:`list`
+        List of tuples of regression coefficients and residual covariance for each
+        pattern, as returned by :func:`_reg_sweep`.
+    """
+    assert np.isfinite(M).all()
+    assert np.isfinite(C).all()
+    dimension = M.size
+    # matrices swept on the constant and successively more observed variables
+    swept = [_little_sweep(augmented_covariance_matrix(M, C), k=0)]
+    prefix = ()
+    out = [None] * len(varobs)
+    for ix in sorted(range(len(varobs)), key=lambda ix: tuple(varobs[ix])):
+        obs = tuple(varobs[ix])
+        shared = 0
+        while shared < min(len(obs), len(prefix)) and obs[shared] == prefix[shared]:
+            shared += 1
+        del swept[shared + 1 :]
+        for k in obs[shared:]:
+            swept.append(_little_sweep(swept[-1], k=k + 1))
+        prefix = obs
+        A = swept[-1]
+        assert np.isfinite(A).all()
+        dep = np.array([i for i in np.arange(dimension) if i not in obs]) + 1
+        β = A[np.ix_(np.concatenate(([0], np.array(obs, dtype=int) + 1)), dep)]
+        σ2_res = A[np.ix_(dep, dep)]
+        out[ix] = (β, σ2_res)
+    return out
+
+
+# state for EM imputation, set within each worker process
+_EM_STATE = {}
+
+
+def _init_em_worker(state):
+    """
+    Initialize a worker process for EM imputation with the (read-only) data shared by
+    all iterations, such that these are transferred once per process rather than
+    once per task.
+
+    Parameters
+    -----------
+    state : :class:`dict`
+        Log-ratio data and censure points for the imputation.
+    """
+    _EM_STATE.clear()
+    _EM_STATE.update(state)
+
+
+def _impute_patterns(tasks, state=None):
+    """
+    Estimate values below detection for a group of missing data patterns, using
+    regression against the observed variables with a Heckman correction for
+    censoring.
+
+    Parameters
+    -----------
+    tasks : :class:`list`
+        List of tuples of rows, observed variables, missing variables, regression
+        coefficients and residual covariance for each pattern.
+    state : :class:`dict`
+        Log-ratio data (:code:`Y`) and censure points (:code:`cpoints`). If not
+        specified, that of the current worker process will be used.
+
+    Returns
+    -------
+    :class:`list`
+        List of arrays of estimates for the missing variables of each pattern.
+    """
+    state = _EM_STATE if state is None else state
+    Y, cpoints = state["Y"], state["cpoints"]
+    out = []
+    for rows, varobs, varmiss, B, σ2_res in tasks:
+        Ystar = B[0, :] + Y[np.ix_(rows, varobs)] @ B[1:, :]
+        sigmas = np.sqrt(np.diag(σ2_res))
+        assert np.isfinite(sigmas).all()
+        # position of threshold values relative to estimated means
+        x = (cpoints[np.ix_(rows, varmiss)] - Ystar) / sigmas[np.newaxis, :]
+        assert np.isfinite(x).all()
+        # ----------------------------------------------------
+        # Calculate inverse Mills Ratio for Heckman correction
+        # ----------------------------------------------------
+        ϕ = stats.norm.pdf(x, loc=0, scale=1)  # pdf
+        Φ = stats.norm.cdf(x, loc=0, scale=1)  # cdf
+        Φ[np.isclose(Φ, 0)] = np.finfo(np.float64).eps * 2
+        assert (Φ > 0).all()  # if its not, infinity will be introduced
+        out.append(Ystar - sigmas * ϕ / Φ)
+    return out
+
+
 def EMCOMP(
     X,
     threshold=None,
     tol=0.0001,
     convergence_metric=lambda A, B, t: np.linalg.norm(np.abs(A - B)) < t,
     max_iter=30,
+    processes=None,
+    backend="process",
+    return_diagnostics=False,
 ):
     r"""
     EMCOMP replaces rounded zeros in a compositional data set based on a set of
@@ -175,6 +292,15 @@ def EMCOMP(
         tolerance argument.
     max_iter : :class:`int`
         Maximum number of iterations before an error is thrown.
+    processes : :class:`int`
+        Number of processes (or threads) across which to distribute the imputation of
+        groups of missing data patterns within each iteration. By default,
+        patterns are processed serially.
+    backend : :class:`str`, :code:`{'process', 'thread'}`
+        Whether to use a pool of processes or threads where :code:`processes > 1`.
+    return_diagnostics : :class:`bool`
+        Whether to also return a dataframe of convergence diagnostics for each
+        iteration.
 
     Returns
     --------
@@ -184,6 +310,10 @@ def EMCOMP(
        Proportion of zeros in the original data set.
     n_iters : :class:`int`
         Number of iterations needed for convergence.
+    diagnostics : :class:`pandas.DataFrame`
+        Norms of the change in the mean, covariance and imputed log-ratio values,
+        whether the convergence criteria were met and the time taken for each
+        iteration. Only returned where :code:`return_diagnostics=True`.
 
     Notes
     -----
@@ -242,97 +372,116 @@ def EMCOMP(
     # Stage 2: Find and enumerate missing data patterns
     # --------------------------------------------------
     pID, pD = md_pattern(Y)
+    order = np.argsort(pID, kind="stable")
+    bounds = np.flatnonzero(np.diff(pID[order])) + 1
+    patterns = []  # rows, observed and missing variables for each pattern
+    for rows in np.split(order, bounds):
+        pattern = pD[pID[rows[0]]]["pattern"]
+        varobs, varmiss = np.arange(LD)[~pattern], np.arange(LD)[pattern]
+        assert np.isfinite(Y[np.ix_(rows, varobs)]).all()
+        assert (~np.isfinite(Y[np.ix_(rows, varmiss)])).all()
+        if varobs.size and varmiss.size:  # Non-completely missing, but missing some
+            patterns.append((rows, varobs, varmiss))
+    # groups of patterns with similar numbers of values to impute, largest first
+    groups = [[] for _ in range(min(4 * (processes or 1), len(patterns)) or 1)]
+    sizes = np.zeros(len(groups))
+    counts = [rows.size * varmiss.size for (rows, _, varmiss) in patterns]
+    for ix in np.argsort(counts, kind="stable")[::-1]:
+        target = np.argmin(sizes)
+        groups[target].append(ix)
+        sizes[target] += counts[ix]
     # -------------------------------------------
     # Stage 3: Regression against other variables
     # -------------------------------------------
     logger.debug(
         "Starting Iterative Regression for Matrix : ({}, {})".format(n_obs, LD)
     )
+    state = dict(Y=Y, cpoints=cpoints)
+    if processes is None or processes <= 1:
+        pool = None
+        _map = partial(map, partial(_impute_patterns, state=state))
+    elif backend == "thread":
+        pool = ThreadPool(processes)
+        _map = partial(pool.imap, partial(_impute_patterns, state=state))
+    elif backend == "process":
+        pool = Pool(processes, initializer=_init_em_worker, initargs=(state,))
+        _map = partial(pool.imap, _impute_patterns)
+    else:
+        msg = "Backend {} not recognised.".format(backend)
+        raise NotImplementedError(msg)
+
+    diagnostics = []
     another_iter = True
     niters = 0
-    while another_iter:
-        niters += 1
-        Mnew, Cnew = M.copy(), C.copy()
-        Ystar = Y.copy()
-        V = np.zeros((LD, LD))
-
-        for p_no in np.unique(pID):
-            logger.debug("Pattern ID: {}, {}".format(p_no, pD[p_no]["pattern"]))
-            rows = np.arange(pID.size)[pID == p_no]  # rows with this pattern
-            varobs, varmiss = (
-                np.arange(D - 1)[~pD[p_no]["pattern"]],
-                np.arange(D - 1)[pD[p_no]["pattern"]],
+    Ystar = Y.copy()
+    try:
+        while another_iter:
+            niters += 1
+            start = time.perf_counter()
+            Mnew, Cnew = M.copy(), C.copy()
+            Yprev, Ystar = Ystar, Y.copy()
+            V = np.zeros((LD, LD))
+            regressions = _pattern_regressions(
+                Mnew, Cnew, [varobs for (_, varobs, _) in patterns]
+            )
+            tasks = [
+                [patterns[ix] + regressions[ix] for ix in group] for group in groups
+            ]
+            for group, estimates in zip(groups, _map(tasks)):
+                for ix, estimate in zip(group, estimates):
+                    rows, varobs, varmiss = patterns[ix]
+                    Ystar[np.ix_(rows, varmiss)] = estimate
+                    V[np.ix_(varmiss, varmiss)] += regressions[ix][1] * rows.size
+            assert np.isfinite(V).all()
+            # -----------------------------------------------
+            # Update and store parameter vector (μ(t), Σ(t)).
+            # -----------------------------------------------
+            logger.debug("Regression finished.")
+            M = np.nanmean(Ystar, axis=0)
+            Ydevs = Ystar - np.ones((n_obs, 1)) * M
+            Ydevs[~np.isfinite(Ydevs)] = 0.0  # remove nonfinite components
+            PC = np.dot(Ydevs.T, Ydevs)
+            logger.debug("Correlation:\n{}".format(PC / (n_obs - 1)))
+            C = (PC + V) / (n_obs - 1)
+
+            logger.debug("Average diff: {}".format(np.mean(Ydevs, axis=0)))
+            assert np.isfinite(C).all()
+            # --------------------
+            # Convergence checking
+            # --------------------
+            converged = convergence_metric(M, Mnew, tol) & convergence_metric(
+                C, Cnew, tol
+            )
+            if converged:
+                another_iter = False
+                logger.debug("Convergence achieved.")
+            diagnostics.append(
+                {
+                    "mean_change": np.linalg.norm(M - Mnew),
+                    "covariance_change": np.linalg.norm(C - Cnew),
+                    "imputed_change": np.linalg.norm(
+                        np.nan_to_num(Ystar - Yprev, nan=0.0)
+                    ),
+                    "converged": bool(converged),
+                    "time": time.perf_counter() - start,
+                }
             )
-            sigmas = np.zeros((LD))
-            assert np.isfinite(Y[np.ix_(rows, varobs)]).all()
-            assert (~np.isfinite(Y[np.ix_(rows, varmiss)])).all()
-            if varobs.size and varmiss.size:  # Non-completely missing, but missing some
-                logger.debug(
-                    "Regressing {} rows for pattern {} | {}.".format(
-                        rows.size,
-                        "".join(varobs.astype(str)),
-                        "".join(varmiss.astype(str)),
-                    )
-                )
-                B, σ2_res = _reg_sweep(Mnew, Cnew, varobs)
-                assert B.shape == (varobs.size + 1, varmiss.size)
-                assert σ2_res.shape == (varmiss.size, varmiss.size)
-                assert np.isfinite(B).all()
-                logger.debug(
-                    "Current Estimator (1, {})".format(
-                        ", ".join(["β{}".format(i) for i in range(B.shape[0] - 1)])
-                    )
-                )
-
-                Ystar[np.ix_(rows, varmiss)] = np.ones((rows.size, 1)) * B[0, :] + (
-                    (Y[np.ix_(rows, varobs)] @ B[1 : (varobs.size + 1), :])
-                )
-                sigmas[varmiss] = np.sqrt(np.diag(σ2_res))
-                assert np.isfinite(sigmas[varmiss]).all()
-
-                x = (  # position of threshold values relative to estimated means
-                    cpoints[np.ix_(rows, varmiss)] - Ystar[np.ix_(rows, varmiss)]
-                )
-                x /= sigmas[varmiss][np.newaxis, :]  # as standard deviations
-                assert np.isfinite(x).all()
-                # ----------------------------------------------------
-                # Calculate inverse Mills Ratio for Heckman correction
-                # ----------------------------------------------------
-                ϕ = stats.norm.pdf(x, loc=0, scale=1)  # pdf
-                Φ = stats.norm.cdf(x, loc=0, scale=1)  # cdf
-                Φ[np.isclose(Φ, 0)] = np.finfo(np.float64).eps * 2
-                assert (Φ > 0).all()  # if its not, infinity will be introduced
-                inversemills = ϕ / Φ
-                Ystar[np.ix_(rows, varmiss)] = (
-                    Ystar[np.ix_(rows, varmiss)] - sigmas[varmiss] * inversemills
-                )
-                V[np.ix_(varmiss, varmiss)] += σ2_res * rows.size
-        assert np.isfinite(V).all()
-        # -----------------------------------------------
-        # Update and store parameter vector (μ(t), Σ(t)).
-        # -----------------------------------------------
-        logger.debug("Regression finished.")
-        M = np.nanmean(Ystar, axis=0)
-        Ydevs = Ystar - np.ones((n_obs, 1)) * M
-        Ydevs[~np.isfinite(Ydevs)] = 0.0  # remove nonfinite components
-        PC = np.dot(Ydevs.T, Ydevs)
-        logger.debug("Correlation:\n{}".format(PC / (n_obs - 1)))
-        C = (PC + V) / (n_obs - 1)
-
-        logger.debug("Average diff: {}".format(np.mean(Ydevs, axis=0)))
-        assert np.isfinite(C).all()
-        # --------------------
-        # Convergence checking
-        # --------------------
-        if convergence_metric(M, Mnew, tol) & convergence_metric(C, Cnew, tol):
-            another_iter = False
-            logger.debug("Convergence achieved.")
-
-        another_iter = another_iter & (niters < max_iter)
-        logger.debug("Iterations Continuing: {}".format(another_iter))
+            logger.debug("Iteration {}: {}".format(niters, diagnostics[-1]))
+
+            another_iter = another_iter & (niters < max_iter)
+            logger.debug("Iterations Continuing: {}".format(another_iter))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
     # ----------------------------
     # Back to compositional space
     # ---------------------------
     logger.debug("Finished. Inverting to compositional space.")
     Xstar = inverse_ALR(Ystar, pos)
+    if return_diagnostics:
+        diagnostics = pd.DataFrame(
+            diagnostics, index=pd.RangeIndex(1, niters + 1, name="Iteration")
+        )
+        return Xstar, prop_zeroes, niters, diagnostics
     return Xstar, prop_zeroes, niters
@@ -624,14 +624,86 @@ class pyrochem(object):
 
     # pyrolite.geochem.norm functions
 
+    def _reference_names(self, reference):
+        """
+        Get a series of reference composition names aligned to the dataframe where
+        the reference is specified for each row, either by a series of names or by
+        the name of a column containing these.
+
+        Parameters
+        ----------
+        reference : :class:`str` | :class:`pandas.Series` | :class:`object`
+            Reference composition specification.
+
+        Returns
+        -------
+        :class:`pandas.Series` | :code:`None`
+            Series of reference composition names, or :code:`None` where the
+            reference is not specified for each row.
+
+        Notes
+        -----
+        Numeric series which aren't indexed like the dataframe (e.g. reference
+        abundances indexed by component) are not considered to be reference names.
+        """
+        if isinstance(reference, str) and reference in self._obj.columns:
+            reference = self._obj[reference]
+        if not isinstance(reference, pd.Series):
+            return None
+        aligned = reference.index.equals(self._obj.index)
+        if pd.api.types.is_numeric_dtype(reference) and not aligned:
+            return None
+        if not aligned:
+            reference = reference.reindex(self._obj.index)
+        return reference
+
+    def _reference_abundances(self, reference, units=None, convert=True):
+        """
+        Get an array of reference abundances for each row of the dataframe, based on
+        a series of reference composition names.
+
+        Parameters
+        ----------
+        reference : :class:`pandas.Series`
+            Names of the reference compositions for each row.
+        units : :class:`str`
+            Units of the input dataframe, to convert the reference compositions.
+        convert : :class:`bool`
+            Whether to convert the reference compositions to the components of the
+            dataframe (e.g. Ti to TiO2).
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of reference abundances with the same shape as the compositional
+            data. Rows without a reference composition are filled with
+            :code:`np.nan`.
+
+        Notes
+        -----
+        Each unique reference composition is retrieved (and converted) once, and
+        abundances for each row are indexed from the resulting table.
+        """
+        codes, names = pd.factorize(reference)
+        table = norm.get_reference_table(names, units=units)
+        if convert and names.size:
+            table = transform.convert_chemistry(table, self.list_compositional)
+        table = table.reindex(columns=self.list_compositional).values
+        # append a row of nan, which is indexed by rows without a reference (code -1)
+        table = np.vstack([table, np.full((1, table.shape[1]), np.nan)])
+        return table[codes]
+
     def normalize_to(self, reference=None, units=None, convert_first=False):
         """
         Normalise a dataframe to a given reference composition.
 
         Parameters
         ----------
-        reference : :class:`str` | :class:`~pyrolite.geochem.norm.Composition` | :class:`numpy.ndarray`
-            Reference composition to normalise to.
+        reference : :class:`str` | :class:`~pyrolite.geochem.norm.Composition` | :class:`numpy.ndarray` | :class:`pandas.Series`
+            Reference composition to normalise to. A series of reference composition
+            names (or the name of a column containing these) can be used to
+            normalise each row to a different reference composition; numeric series
+            are otherwise used as reference abundances.
         units : :class:`str`
             Units of the input dataframe, to convert the reference composition.
         convert_first : :class:`bool`
@@ -648,14 +720,18 @@ class pyrochem(object):
         -----
         This assumes that dataframes have a single set of units.
         """
-
-        if isinstance(reference, (str, norm.Composition)):
+        names = self._reference_names(reference)
+        if names is not None:
+            norm_abund = self._reference_abundances(
+                names, units=units, convert=convert_first
+            )
+        elif isinstance(reference, (str, norm.Composition)):
             if not isinstance(reference, norm.Composition):
-                N = norm.get_reference_composition(reference)
+                N = norm.get_reference_composition(reference, units=units)
             else:
                 N = reference
-            if units is not None:
-                N.set_units(units)
+                if units is not None:
+                    N.set_units(units)
             if convert_first:
                 N.comp = transform.convert_chemistry(N.comp, self.list_compositional)
             norm_abund = N[self.list_compositional]
@@ -672,8 +748,11 @@ class pyrochem(object):
 
         Parameters
         ----------
-        reference : :class:`str` | :class:`~pyrolite.geochem.norm.Composition` | :class:`numpy.ndarray`
-            Reference composition which the composition is normalised to.
+        reference : :class:`str` | :class:`~pyrolite.geochem.norm.Composition` | :class:`numpy.ndarray` | :class:`pandas.Series`
+            Reference composition which the composition is normalised to. A series of
+            reference composition names (or the name of a column containing these)
+            can be used to de-normalise each row from a different reference
+            composition; numeric series are otherwise used as reference abundances.
         units : :class:`str`
             Units of the input dataframe, to convert the reference composition.
 
@@ -686,14 +765,16 @@ class pyrochem(object):
         -----
         This assumes that dataframes have a single set of units.
         """
-
-        if isinstance(reference, (str, norm.Composition)):
+        names = self._reference_names(reference)
+        if names is not None:
+            norm_abund = self._reference_abundances(names, units=units)
+        elif isinstance(reference, (str, norm.Composition)):
             if not isinstance(reference, norm.Composition):
-                N = norm.get_reference_composition(reference)
+                N = norm.get_reference_composition(reference, units=units)
             else:
                 N = reference
-            if units is not None:
-                N.set_units(units)
+                if units is not None:
+                    N.set_units(units)
             N.comp = transform.convert_chemistry(N.comp, self.list_compositional)
             norm_abund = N[self.list_compositional]
         else:  # list, iterable, pd.Index etc
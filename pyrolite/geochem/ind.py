@@ -7,7 +7,9 @@ Todo
 * Incompatibility indexes for spider plot ordering.
 """
 
+import functools
 import re
+from collections import namedtuple
 
 import numpy as np
 import pandas as pd
@@ -28,16 +30,26 @@ __radii__ = {}
 
 
 def _load_radii():
-    """Import radii tables to a module-level dictionary indexed by reference."""
-    for name in ["shannon", "whittaker_muntus"]:
-        pth = (pyrolite_datafolder(subfolder="radii") / "{}.csv".format(name)).resolve()
-        assert pth.exists() and pth.is_file()
-        df = pd.read_csv(pth).set_index("index", drop=True)
-        assert hasattr(df, "element")
-        __radii__[name] = df
+    """
+    Import radii tables to a module-level dictionary indexed by reference. The
+    tables are read on first use, rather than on import.
+
+    Returns
+    -------
+    :class:`dict`
+        Dictionary of radii tables.
+    """
+    if not __radii__:
+        for name in ["shannon", "whittaker_muntus"]:
+            pth = pyrolite_datafolder(subfolder="radii") / "{}.csv".format(name)
+            pth = pth.resolve()
+            assert pth.exists() and pth.is_file()
+            df = pd.read_csv(pth).set_index("index", drop=True)
+            assert hasattr(df, "element")
+            __radii__[name] = df
+    return __radii__
 
 
-_load_radii()
 ########################################################################################
 
 
@@ -293,11 +305,142 @@ def get_cations(component: str, exclude=[], total_suffix="T"):
         component = remove_suffix(component, suffix=total_suffix)
 
     exclude += ["O"]
-    atms = pt.formula(component).atoms
+    atms = get_formula(component).atoms
     cations = [el for el in atms.keys() if el.__str__() not in exclude]
     return cations
 
 
+FormulaProperties = namedtuple(
+    "FormulaProperties", ["formula", "mass", "cations", "oxygen", "charge"]
+)
+FormulaProperties.__doc__ = """
+Cached properties of a chemical component.
+
+Attributes
+----------
+formula : :class:`periodictable.formulas.Formula`
+    Parsed formula for the component.
+mass : :class:`float`
+    Molecular mass of the component.
+cations : :class:`tuple`
+    Pairs of (atom, count) for all non-oxygen atoms in the component.
+oxygen : :class:`float`
+    Number of oxygen atoms in the component.
+charge : :class:`float` | :class:`int` | :code:`None`
+    Cation charge for simple oxides (as balanced by oxygen) and the
+    charge (or default charge) of single elements; :code:`None` otherwise.
+"""
+
+
+@functools.lru_cache(maxsize=None)  # cache outputs for speed
+def _parse_formula(component):
+    """Parse a string formula, caching the output."""
+    return pt.formula(component)
+
+
+def get_formula(component):
+    """
+    Get a parsed formula for a component, with string formulae parsed only once.
+
+    Parameters
+    -----------
+    component : :class:`str` | :class:`periodictable.formulas.Formula` | :class:`periodictable.core.Element`
+        Component to obtain a formula for.
+
+    Returns
+    -------
+    :class:`periodictable.formulas.Formula`
+
+    Notes
+    ------
+    Formulae for strings are shared between calls, and should not be modified
+    in place.
+    """
+    if isinstance(component, str):
+        return _parse_formula(component)
+    return pt.formula(component)
+
+
+def _formula_properties(component):
+    """
+    Calculate the mass, stoichiometry and charge of a component.
+
+    Parameters
+    -----------
+    component : :class:`str` | :class:`periodictable.formulas.Formula`
+        Component to obtain properties for.
+
+    Returns
+    -------
+    :class:`FormulaProperties`
+    """
+    formula = get_formula(component)
+    cations = tuple((str(a), n) for a, n in formula.atoms.items() if a is not pt.O)
+    oxygen = formula.atoms.get(pt.O, 0)
+    charge = None
+    if len(formula.atoms) == 1:  # single element or ion
+        atom = list(formula.atoms)[0]
+        charge = getattr(atom, "charge", 0) or getattr(atom, "default_charge", None)
+    elif oxygen and len(cations) == 1:  # simple oxide
+        charge = oxygen * 2 / cations[0][1]
+    return FormulaProperties(formula, formula.mass, cations, oxygen, charge)
+
+
+@functools.lru_cache(maxsize=None)  # cache outputs for speed
+def _formula_registry():
+    """
+    Build a registry of :class:`FormulaProperties` for common elements and oxides,
+    indexed by component name. Other string components are added as
+    they are looked up.
+    """
+    registry = {}
+    for component in sorted(_common_elements | _common_oxides):
+        try:
+            registry[component] = _formula_properties(component)
+        except ValueError:  # e.g. 'LOI'
+            pass
+    return registry
+
+
+def get_formula_properties(component):
+    """
+    Get the cached mass, cation and oxygen stoichiometry and charge of a component.
+
+    Parameters
+    -----------
+    component : :class:`str` | :class:`periodictable.formulas.Formula`
+        Component to obtain properties for.
+
+    Returns
+    -------
+    :class:`FormulaProperties`
+    """
+    if not isinstance(component, str):
+        return _formula_properties(component)
+    registry = _formula_registry()
+    properties = registry.get(component)
+    if properties is None:
+        properties = registry[component] = _formula_properties(component)
+    return properties
+
+
+def get_formula_masses(components):
+    """
+    Get the molecular masses for a list of components.
+
+    Parameters
+    -----------
+    components : :class:`list` | :class:`pandas.Index`
+        Components to obtain masses for, e.g. the columns of a dataframe.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Array of molecular masses.
+    """
+    return np.array([get_formula_properties(c).mass for c in components], dtype="float")
+
+
 def get_isotopes(ratio_text):
     """
     Regex for isotope ratios.
@@ -472,16 +615,17 @@ def get_ionic_radii(
             for e in element
         ]
 
+    radii = _load_radii()
     if "shannon" in source.lower():
-        df = __radii__["shannon"]
+        df = radii["shannon"]
         target = ["crystalradius", "ionicradius"][pauling]
     elif "whittaker" in source.lower():
-        df = __radii__["whittaker_muntus"]
+        df = radii["whittaker_muntus"]
         target = "ionicradius"
     else:
         raise AssertionError(
             "Invalid `source` argument. Options: {}".format(
-                " ,".join("'{}'".format(src) for src in __radii__.keys())
+                " ,".join("'{}'".format(src) for src in radii.keys())
             )
         )
 
@@ -5,6 +5,7 @@ from periodictable.core import Element
 from periodictable.formulas import Formula
 
 from ..util.log import Handle
+from .ind import _formula_registry
 
 logger = Handle(__name__)
 
@@ -87,3 +88,4 @@ def set_default_ionic_charges(charges=None):
     for el, c in charges.items():
         getattr(pt, el).default_charge = c
         assert isinstance(getattr(pt, el), Element)
+    _formula_registry.cache_clear()  # charges are cached with formula properties
@@ -8,7 +8,7 @@ import periodictable as pt
 from ..util.log import Handle
 from ..util.meta import update_docstring_references
 from ..util.units import scale
-from .ind import _common_elements, _common_oxides
+from .ind import _common_elements, _common_oxides, get_formula_properties
 from .transform import to_molecular
 
 logger = Handle(__name__)
@@ -94,8 +94,36 @@ def NaAt8MgO(Na2O: float, MgO: float) -> float:
     return Na8
 
 
+# coefficients for the composition (mole fraction) and temperature-pressure terms of
+# the log-sulfur content at sulfate and sulfide saturation
+_SCSS_COEFFICIENTS = {
+    "sulfate": (
+        10.07,
+        {"SiO2": -7.1, "MgO": -14.02, "Al2O3": -14.164},
+        (-1.151 * 10**4, 0.104),
+    ),
+    "sulfide": (
+        -1.76,
+        {"FeO": 5.559, "TiO2": 2.565, "CaO": 2.709, "SiO2": -3.192, "H2O": -3.049},
+        (-0.474 * 10**4, 0.021),
+    ),
+}
+
+
 @update_docstring_references
-def SCSS(df, T, P, kelvin=False, grid=None, outunit="wt%"):
+def SCSS(
+    df,
+    T,
+    P,
+    kelvin=False,
+    grid=None,
+    outunit="wt%",
+    summary=None,
+    dtype=None,
+    chunksize=None,
+    out=None,
+    memmap=None,
+):
     r"""
     Obtain the sulfur content at sulfate and sulfide saturation [#ref_1]_ [#ref_2]_.
 
@@ -112,11 +140,32 @@ def SCSS(df, T, P, kelvin=False, grid=None, outunit="wt%"):
     grid : :code:`None`, :code:`'geotherm'`, :code:`'grid'`
         Whether to consider temperature and pressure as a geotherm (:code:`geotherm`),
         or independently (as a grid, :code:`grid`).
+    outunit : :class:`str`
+        Units for the outputs.
+    summary : :class:`str` | :class:`list`
+        Statistic(s) (:code:`'min'`, :code:`'max'` or :code:`'mean'`) to summarise
+        the saturation sulfur contents of each composition over a geotherm or grid,
+        rather than returning values for each point in temperature-pressure space.
+    dtype : :class:`numpy.dtype`
+        Data type for the outputs, e.g. :code:`'float32'` to halve their size.
+    chunksize : :class:`int`
+        Number of compositions to evaluate at once for geotherms and grids. By
+        default, this is chosen to limit the size of each chunk to a few million
+        values.
+    out : :class:`tuple` of :class:`numpy.ndarray`
+        Preallocated arrays (e.g. a :class:`numpy.memmap`) for the sulfate and
+        sulfide outputs, for geotherms and grids.
+    memmap : :class:`str` | :class:`pathlib.Path`
+        Path prefix for memory-mapped outputs, saved as :code:`.npy` files suffixed
+        with :code:`_sulfate` and :code:`_sulfide` (which can be opened later with
+        :code:`numpy.load(..., mmap_mode='r')`), for geotherms and grids.
 
     Returns
     -------
     sulfate, sulfide : :class:`numpy.ndarray`, :class:`numpy.ndarray`
-        Arrays of mass fraction sulfate and sulfide abundances at saturation.
+        Arrays of mass fraction sulfate and sulfide abundances at saturation. Where
+        a :code:`summary` is specified, these are arrays of the summary statistic(s)
+        for each composition.
 
     Notes
     ------
@@ -151,6 +200,11 @@ def SCSS(df, T, P, kelvin=False, grid=None, outunit="wt%"):
         - 3.049 \cdot X_{H_2O}\\
         \end{align}
 
+    As these are the sum of a compositional term and a temperature-pressure term,
+    outputs for geotherms and grids are evaluated for chunks of compositions
+    directly into the output arrays, and summaries are calculated from the
+    temperature-pressure terms alone.
+
     References
     -----------
     .. [#ref_1] Li, C., and Ripley, E.M. (2009).
@@ -173,62 +227,98 @@ def SCSS(df, T, P, kelvin=False, grid=None, outunit="wt%"):
     if not kelvin:
         T = T + 273.15
 
-    C = np.ones(df.index.size)
+    n = df.index.size
     assert grid in [None, "geotherm", "grid"]
     if grid == "grid":
-        cc, tt, pp = np.meshgrid(C, T, P, indexing="ij")
+        T, P = T.reshape(-1, 1), P.reshape(1, -1)
     elif grid == "geotherm":
         assert T.shape == P.shape
-        cc = C[:, np.newaxis]
-        tt = T[np.newaxis, :]
-        pp = P[np.newaxis, :]
+        T, P = T.ravel(), P.ravel()
     elif grid is None:
-        _dims = C.size, T.size, P.size
+        _dims = n, T.size, P.size
         maxdim = max(_dims)
         assert all([x == maxdim or x == 1 for x in _dims])
-        cc, tt, pp = C, T, P
 
     comp = list(set(df.columns) & (_common_elements | _common_oxides))
     moldf = to_molecular(df.loc[:, comp], renorm=True) / 100.0  # mole-fraction
-    molsum = to_molecular(df.loc[:, comp], renorm=False).sum(axis=1)
-
-    def gridify(ser):
-        """
-        Create a parameter grid from a pandas series to facilitate
-        array-addition of each component.
-        """
-        arr = ser.replace(np.nan, 0).values
-        if grid == "grid":
-            return arr[:, np.newaxis, np.newaxis]
-        elif grid == "geotherm":
-            return arr[:, np.newaxis]
-        elif grid is None:
-            return arr
-
-    ln_sulfate = 10.07 * cc - 1.151 * 10**4 / tt + 0.104 * pp
-    for chem, D in [("SiO2", -7.1), ("MgO", -14.02), ("Al2O3", -14.164)]:
-        if chem in moldf.columns:
-            ln_sulfate += gridify(moldf[chem]) * D * cc
-
-    ln_sulfide = -1.76 * cc - 0.474 * 10**4 / tt + 0.021 * pp
-
-    for chem, D in [
-        ("FeO", 5.559),
-        ("TiO2", 2.565),
-        ("CaO", 2.709),
-        ("SiO2", -3.192),
-        ("H2O", -3.049),
-    ]:
-        if chem in moldf.columns:
-            ln_sulfide += gridify(moldf[chem]) * D * cc
-
-    sulfate, sulfide = np.exp(ln_sulfate), np.exp(ln_sulfide)
-
-    _s = gridify(molsum * pt.S.mass) * scale("wt%", outunit)
-    _so4 = gridify(molsum * pt.formula("SO4").mass) * scale("wt%", outunit)
-    sulfide *= _s
-    sulfate *= _so4
-
+    molsum = to_molecular(df.loc[:, comp], renorm=False).sum(axis=1).values
+    masses = {
+        "sulfate": get_formula_properties("SO4").mass,
+        "sulfide": pt.S.mass,
+    }
+
+    # compositional terms, temperature-pressure terms and scales for each output
+    terms = {}
+    for name, (intercept, coeffs, (Tcoeff, Pcoeff)) in _SCSS_COEFFICIENTS.items():
+        comp_term = np.full(n, intercept)
+        for chem, D in coeffs.items():
+            if chem in moldf.columns:
+                comp_term += moldf[chem].replace(np.nan, 0).values * D
+        TP_term = Tcoeff / T + Pcoeff * P
+        _scale = molsum * masses[name] * scale("wt%", outunit)
+        terms[name] = comp_term, TP_term, _scale
+
+    if summary is not None:
+        assert grid in ["geotherm", "grid"], "Summaries require a geotherm or grid."
+        stats = [summary] if isinstance(summary, str) else list(summary)
+        outputs = []
+        for comp_term, TP_term, _scale in terms.values():
+            values = []
+            for stat in stats:
+                if stat == "min":
+                    factor = np.exp(np.nanmin(TP_term))
+                elif stat == "max":
+                    factor = np.exp(np.nanmax(TP_term))
+                elif stat == "mean":
+                    factor = np.nanmean(np.exp(TP_term))
+                else:
+                    raise NotImplementedError(
+                        "Summary statistic {} not recognised.".format(stat)
+                    )
+                values.append(np.exp(comp_term) * _scale * factor)
+            values = np.stack(values, axis=-1).astype(dtype or "float")
+            outputs.append(values[:, 0] if isinstance(summary, str) else values)
+        return tuple(outputs)
+
+    if grid is None:
+        outputs = [
+            (np.exp(comp_term + TP_term) * _scale).astype(dtype or "float")
+            for comp_term, TP_term, _scale in terms.values()
+        ]
+    else:
+        shape = (n,) + terms["sulfate"][1].shape
+        if out is not None:
+            outputs = list(out)
+        elif memmap is not None:
+            outputs = [
+                np.lib.format.open_memmap(
+                    "{}_{}.npy".format(memmap, name),
+                    mode="w+",
+                    dtype=dtype or "float",
+                    shape=shape,
+                )
+                for name in terms
+            ]
+        else:
+            outputs = [np.empty(shape, dtype=dtype or "float") for _ in terms]
+        assert all(o.shape == shape for o in outputs)
+
+        fieldsize = int(np.prod(shape[1:]))
+        chunksize = chunksize or max(1, 2**22 // max(fieldsize, 1))
+        expand = (slice(None),) + (np.newaxis,) * (len(shape) - 1)
+        for start in range(0, n, chunksize):
+            rows = slice(start, start + chunksize)
+            for output, (comp_term, TP_term, _scale) in zip(outputs, terms.values()):
+                chunk = output[rows]
+                # accumulate in place within the output
+                np.add(comp_term[rows][expand], TP_term, out=chunk, casting="unsafe")
+                np.exp(chunk, out=chunk)
+                chunk *= _scale[rows][expand]
+        for output in outputs:
+            if isinstance(output, np.memmap):
+                output.flush()
+
+    sulfate, sulfide = outputs
     if sulfate.size == 1:  # 0D
         return sulfate.flatten()[0], sulfide.flatten()[0]
     else:  # 2D
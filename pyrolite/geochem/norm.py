@@ -2,7 +2,10 @@
 Reference compostitions and compositional normalisation.
 """
 
+import copy
+import functools
 import json
+import pickle
 from pathlib import Path
 
 import numpy as np
@@ -19,6 +22,82 @@ logger = Handle(__name__)
 __dbfile__ = pyrolite_datafolder(subfolder="geochem") / "refdb.json"
 
 
+def _reference_cachefile(path):
+    """
+    Get the location of the binary cache corresponding to a reference composition
+    database.
+
+    Parameters
+    -----------
+    path : :class:`str` | :class:`pathlib.Path`
+        Path to the reference composition database.
+
+    Returns
+    --------
+    :class:`pathlib.Path`
+    """
+    return Path(path).with_suffix(".pkl")
+
+
+@functools.lru_cache(maxsize=None)  # cache outputs for speed
+def _reference_database(path=None):
+    """
+    Load the records of the reference composition database, indexed by name. Where
+    an up-to-date binary cache of the database is present, this will be used.
+
+    Parameters
+    -----------
+    path : :class:`str` | :class:`pathlib.Path`
+        Path to the reference composition database.
+
+    Returns
+    --------
+    :class:`dict`
+        Dictionary of reference compositions, either as
+        :class:`~pyrolite.geochem.norm.Composition` objects or serialized JSON.
+    """
+    path = Path(path or __dbfile__)
+    cachefile = _reference_cachefile(path)
+    if cachefile.exists() and cachefile.stat().st_mtime >= path.stat().st_mtime:
+        try:
+            with open(str(cachefile), "rb") as f:
+                return pickle.load(f)
+        except Exception as e:  # e.g. created with incompatible versions
+            logger.debug("Could not load reference cache {}: {}".format(cachefile, e))
+    with TinyDB(str(path), access_mode="r") as db:
+        # there should be only one "_default" table
+        return {r["name"]: r["composition"] for r in db.all()}
+
+
+@functools.lru_cache(maxsize=None)  # cache outputs for speed
+def _reference_composition(name, units=None, path=None):
+    """
+    Get a cached reference composition, optionally in specific units. This should
+    not be modified; use :func:`get_reference_composition` to get a copy.
+
+    Parameters
+    ------------
+    name : :class:`str`
+        Name of the reference composition model.
+    units : :class:`str`
+        Units to convert the composition to.
+    path : :class:`str` | :class:`pathlib.Path`
+        Path to the reference composition database.
+
+    Returns
+    --------
+    :class:`pyrolite.geochem.norm.Composition`
+    """
+    if units is not None:
+        return _reference_composition(name, path=path).copy().set_units(units)
+    records = _reference_database(path)
+    assert name in records, "Reference composition {} not found.".format(name)
+    record = records[name]
+    if isinstance(record, Composition):
+        return record
+    return Composition(json.loads(record), name=name)
+
+
 def all_reference_compositions(path=None):
     """
     Get a dictionary of all reference compositions indexed by name.
@@ -31,17 +110,13 @@ def all_reference_compositions(path=None):
     --------
     :class:`dict`
     """
-    if path is None:
-        path = __dbfile__
-    with TinyDB(str(path), access_mode="r") as db:
-        refs = {}
-        for r in db.all():  # there should be only one "_default" table
-            n, c = r["name"], r["composition"]
-            refs[n] = Composition(json.loads(c), name=n)
-    return refs
+    return {
+        name: _reference_composition(name, path=path).copy()
+        for name in _reference_database(path)
+    }
 
 
-def get_reference_composition(name):
+def get_reference_composition(name, units=None):
     """
     Retrieve a particular composition from the reference database.
 
@@ -49,17 +124,51 @@ def get_reference_composition(name):
     ------------
     name : :class:`str`
         Name of the reference composition model.
+    units : :class:`str`
+        Units to convert the composition to.
 
     Returns
     --------
     :class:`pyrolite.geochem.norm.Composition`
+
+    Notes
+    ------
+    Reference compositions are loaded once and cached by name and units. Each call
+    returns a copy, which can be modified without affecting the cache.
+    """
+    return _reference_composition(name, units=units).copy()
+
+
+def get_reference_table(names, units=None):
     """
-    with TinyDB(str(__dbfile__), access_mode="r") as db:
-        res = db.search(Query().name == name)
-    assert len(res) == 1
-    res = res[0]
-    name, composition = res["name"], res["composition"]
-    return Composition(json.loads(composition), name=name)
+    Retrieve a number of compositions from the reference database as a single
+    table, with one row for each composition.
+
+    Parameters
+    ------------
+    names : :class:`list`
+        Names of the reference composition models.
+    units : :class:`str`
+        Units to convert the compositions to.
+
+    Returns
+    --------
+    :class:`pandas.DataFrame`
+        Dataframe of reference compositions indexed by name, with columns for each
+        component present in any of the compositions.
+
+    Notes
+    ------
+    This uses the same cache as :func:`get_reference_composition`, such that each
+    composition is only loaded (and converted to specific units) once.
+    """
+    names = list(names)
+    comps = [_reference_composition(name, units=units).comp for name in names]
+    if not comps:
+        return pd.DataFrame(index=pd.Index(names, name="name"), dtype=float)
+    table = pd.concat(comps, axis=0, sort=False)
+    table.index = pd.Index(names, name="name")
+    return table
 
 
 def get_reference_files(directory=None, formats=["csv"]):
@@ -85,10 +194,20 @@ def get_reference_files(directory=None, formats=["csv"]):
     return files
 
 
-def update_database(path=None, encoding="cp1252", **kwargs):
+def update_database(path=None, encoding="cp1252", cache=True, **kwargs):
     """
     Update the reference composition database.
 
+    Parameters
+    -----------
+    path : :class:`str` | :class:`pathlib.Path`
+        Path to the reference composition database.
+    encoding : :class:`str`
+        Encoding of the reference composition files.
+    cache : :class:`bool`
+        Whether to also write a binary cache of the database (alongside the database,
+        with a :code:`.pkl` suffix) which can be loaded more quickly.
+
     Notes
     ------
     This will take all csv files from the geochem/refcomp pyrolite data folder
@@ -96,17 +215,28 @@ def update_database(path=None, encoding="cp1252", **kwargs):
     """
     if path is None:
         path = __dbfile__
+    compositions = {}
     # require write access
     with TinyDB(str(path)) as db:
         db.truncate()
 
         for f in get_reference_files():
             C = Composition(f, encoding=encoding, **kwargs)
-            db.insert(
-                {"name": C.name, "composition": C._df.T.to_json(force_ascii=False)}
-            )
+            record = C._df.T.to_json(force_ascii=False)
+            db.insert({"name": C.name, "composition": record})
+            compositions[C.name] = Composition(json.loads(record), name=C.name)
         db.close()
 
+    cachefile = _reference_cachefile(path)
+    if cache:
+        with open(str(cachefile), "wb") as f:
+            pickle.dump(compositions, f)
+    elif cachefile.exists():  # remove the now out-of-date cache
+        cachefile.unlink()
+    # invalidate the cached reference compositions
+    _reference_database.cache_clear()
+    _reference_composition.cache_clear()
+
 
 class Composition(object):
     def __init__(
@@ -223,6 +353,20 @@ class Composition(object):
                 float
             )
 
+    def copy(self):
+        """
+        Get a copy of the composition, which can be modified independently.
+
+        Returns
+        --------
+        :class:`pyrolite.geochem.norm.Composition`
+        """
+        C = copy.copy(self)
+        for attr in ["comp", "units", "unc_2sigma", "_df"]:
+            if getattr(self, attr) is not None:
+                setattr(C, attr, getattr(self, attr).copy())
+        return C
+
     def set_units(self, to="wt%"):
         """
         Set the units of the dataframe.
@@ -0,0 +1,154 @@
+"""
+Chunked processing of geochemical data tables which are too large to be held in
+memory, applying a sequence of :class:`~pyrolite.geochem.pyrochem` operations to
+each chunk of rows in turn.
+"""
+from collections import deque
+from multiprocessing import Pool
+from pathlib import Path
+
+import pandas as pd
+
+from ..util.log import Handle
+from ..util.pd import read_table_chunks, write_table_chunks
+from . import pyrochem  # ensure the accessor is registered
+
+logger = Handle(__name__)
+
+
+def _parse_operation(operation):
+    """
+    Get a callable for a pipeline operation.
+
+    Parameters
+    -----------
+    operation : :class:`str` | :class:`tuple` | :class:`callable`
+        Name of a :class:`~pyrolite.geochem.pyrochem` method, a tuple of a method
+        name and a dictionary of keyword arguments, or a callable function f(df)
+        which returns a dataframe.
+
+    Returns
+    --------
+    :class:`callable`
+    """
+    if callable(operation):
+        return operation
+    if isinstance(operation, str):
+        name, kwargs = operation, {}
+    elif isinstance(operation, (tuple, list)) and len(operation) == 2:
+        name, kwargs = operation
+    else:
+        raise NotImplementedError("Unknown operation: {}.".format(operation))
+    if not hasattr(pyrochem, name):
+        raise NotImplementedError("Unknown pyrochem method: {}.".format(name))
+
+    def _operation(df):
+        return getattr(df.pyrochem, name)(**kwargs)
+
+    return _operation
+
+
+def _apply_operations(df, operations):
+    """
+    Apply a sequence of operations to a dataframe, with the output of each operation
+    being passed to the next.
+
+    Parameters
+    -----------
+    df : :class:`pandas.DataFrame`
+        Dataframe to process.
+    operations : :class:`list`
+        List of operations (see :func:`apply_pipeline`).
+
+    Returns
+    --------
+    :class:`pandas.DataFrame`
+    """
+    for operation in operations:
+        out = _parse_operation(operation)(df)
+        if isinstance(out, (pd.DataFrame, pd.Series)):  # otherwise modified in place
+            df = out
+    return df
+
+
+def apply_pipeline(chunks, operations, processes=None):
+    """
+    Apply a sequence of :class:`~pyrolite.geochem.pyrochem` operations to each of a
+    sequence of dataframes.
+
+    Parameters
+    -----------
+    chunks
+        Iterable of :class:`pandas.DataFrame`, e.g. from
+        :func:`~pyrolite.util.pd.read_table_chunks`.
+    operations : :class:`list`
+        List of operations, each of which is either the name of a
+        :class:`~pyrolite.geochem.pyrochem` method (e.g. :code:`"to_molecular"`), a
+        tuple of a method name and a dictionary of keyword arguments (e.g.
+        :code:`("normalize_to", dict(reference="Chondrite_PON"))`) or a callable
+        function f(df) which returns a dataframe. Where a method returns a dataframe,
+        this is passed to the next operation.
+    processes : :class:`int`
+        Number of worker processes to distribute chunks across. By default
+        (:code:`None`), chunks are processed serially.
+
+    Yields
+    -------
+    :class:`pandas.DataFrame`
+        Processed chunks, in the order they were supplied.
+
+    Notes
+    -----
+    Where using a pool of workers, at most two chunks per process are held at any
+    time, such that memory use remains bounded.
+    """
+    for operation in operations:  # validate the operations before processing
+        _parse_operation(operation)
+    if processes is None or processes <= 1:
+        for chunk in chunks:
+            yield _apply_operations(chunk, operations)
+        return
+    with Pool(processes=processes) as p:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(p.apply_async(_apply_operations, (chunk, operations)))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def process_table(
+    src, dst, operations, chunksize=10000, processes=None, index=True, **kwargs
+):
+    """
+    Apply a sequence of :class:`~pyrolite.geochem.pyrochem` operations to a csv,
+    excel or parquet file in chunks of rows, writing the results to a csv or parquet
+    file as they are processed.
+
+    Parameters
+    -----------
+    src : :class:`str` | :class:`pathlib.Path`
+        Path to the input file.
+    dst : :class:`str` | :class:`pathlib.Path`
+        Path to the output file.
+    operations : :class:`list`
+        List of operations (see :func:`apply_pipeline`).
+    chunksize : :class:`int`
+        Number of rows to process at a time.
+    processes : :class:`int`
+        Number of worker processes to distribute chunks across.
+    index : :class:`bool`
+        Whether to write the index to the output file.
+
+    Returns
+    --------
+    :class:`pathlib.Path`
+        Path to the output file.
+    """
+    if Path(src).resolve() == Path(dst).resolve():
+        raise ValueError("Output file must be different to the input file.")
+    chunks = read_table_chunks(src, chunksize=chunksize, **kwargs)
+    return write_table_chunks(
+        apply_pipeline(chunks, operations, processes=processes), dst, index=index
+    )
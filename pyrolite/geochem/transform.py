@@ -2,6 +2,7 @@
 Functions for converting, transforming and parameterizing geochemical data.
 """
 
+import functools
 from collections import Counter
 
 import numpy as np
@@ -9,12 +10,18 @@ import pandas as pd
 import periodictable as pt
 
 from ..comp.codata import close, renormalise
-from ..util import lambdas
 from ..util.log import Handle
 from ..util.meta import update_docstring_references
 from ..util.text import remove_suffix, titlecase
 from ..util.types import iscollection
-from .ind import _common_elements, _common_oxides, get_cations, simple_oxides
+from .ind import (
+    _common_elements,
+    _common_oxides,
+    get_cations,
+    get_formula,
+    get_formula_masses,
+    simple_oxides,
+)
 from .norm import Composition, get_reference_composition
 
 logger = Handle(__name__)
@@ -41,7 +48,7 @@ def to_molecular(df: pd.DataFrame, renorm=True):
     Does not convert units (i.e. mass% --> mol%; mass-ppm --> mol-ppm).
     """
     # df = df.to_frame()
-    MWs = [pt.formula(c).mass for c in df.columns]
+    MWs = get_formula_masses(df.columns)
     if renorm:
         return renormalise(df.div(MWs))
     else:
@@ -69,7 +76,7 @@ def to_weight(df: pd.DataFrame, renorm=True):
     Does not convert units (i.e. mol% --> mass%; mol-ppm --> mass-ppm).
     """
     # df = df.to_frame()
-    MWs = [pt.formula(c).mass for c in df.columns]
+    MWs = get_formula_masses(df.columns)
     if renorm:
         return renormalise(df.multiply(MWs))
     else:
@@ -125,9 +132,9 @@ def oxide_conversion(oxin, oxout, molecular=False):
         component to another.
     """
     if not isinstance(oxin, pt.formulas.Formula):
-        oxin = pt.formula(oxin)
+        oxin = get_formula(oxin)
     if not isinstance(oxout, pt.formulas.Formula):
-        oxout = pt.formula(oxout)
+        oxout = get_formula(oxout)
 
     inatoms = {k: v for (k, v) in oxin.atoms.items() if not str(k) == "O"}
     in_els = inatoms.keys()
@@ -242,6 +249,236 @@ def elemental_sum(
         )
 
 
+class ConversionPlan(object):
+    """
+    Compiled conversion of a set of columns to a set of target components, which
+    can be applied to any number of dataframes (or chunks of a dataframe) with
+    these columns.
+
+    Each target is calculated from the elemental sum of its principal cation over
+    the species present (see :func:`elemental_sum`), such that the conversion is a
+    single product of the data with a matrix of coefficients converting each
+    species to cation equivalents, followed by a conversion of these elemental sums
+    to each target.
+
+    Parameters
+    ----------
+    columns : :class:`list`
+        Columns of the dataframes to be converted.
+    to : :class:`list`
+        Components to convert to. Each item can be a single component or a
+        dictionary of components with proportions (see :func:`aggregate_element`).
+    molecular : :class:`bool`, :code:`False`
+        Whether the data are molecular rather than weight-based.
+    total_suffix : :class:`str`, 'T'
+        Suffix of 'total' variables. E.g. 'T' for FeOT, Fe2O3T.
+
+    Attributes
+    ----------
+    species : :class:`list`
+        Columns which contribute to the elemental sums.
+    cations : :class:`list`
+        Cations for which elemental sums are calculated.
+    coefficients : :class:`numpy.ndarray`
+        Coefficients converting each species to its cation equivalent
+        (:code:`species, cations`).
+    targets : :class:`list`
+        Names of the target components.
+    drop : :class:`list`
+        Columns which are replaced by the target components.
+    """
+
+    def __init__(self, columns, to, molecular=False, total_suffix="T"):
+        self.columns = list(columns)
+        self.molecular = molecular
+        self.total_suffix = total_suffix
+        self.species, self.cations, self.targets, self.drop = [], [], [], []
+        self._species_cations, self._target_cations, self._target_factors = [], [], []
+        for item in to:
+            self._add_target(item)
+        # species which are also targets will be replaced rather than dropped
+        self.drop = [
+            c for c in self.columns if c in self.drop and c not in self.targets
+        ]
+        self.coefficients = np.zeros((len(self.species), len(self.cations)))
+        for ix, (s, c) in enumerate(zip(self.species, self._species_cations)):
+            self.coefficients[ix, self.cations.index(c)] = oxide_conversion(
+                remove_suffix(s, suffix=total_suffix), c, molecular=molecular
+            )(1.0)
+
+    def __repr__(self):
+        return "{}({} -> {})".format(
+            self.__class__.__name__, ", ".join(self.species), ", ".join(self.targets)
+        )
+
+    def _add_target(self, to):
+        """
+        Add a target component (or dictionary of components) to the plan.
+        """
+        molecular, total_suffix = self.molecular, self.total_suffix
+        if isinstance(to, str):
+            cation = get_cations(to, total_suffix=total_suffix)[0]
+            targetnames = [to]
+            factors = [
+                oxide_conversion(
+                    cation, remove_suffix(to, suffix=total_suffix), molecular=molecular
+                )(1)
+            ]
+        elif isinstance(to, (pt.core.Element, pt.formulas.Formula)):
+            cation = get_cations(to, total_suffix=total_suffix)[0]
+            targetnames = [str(to)]
+            factors = [oxide_conversion(cation, to, molecular=molecular)(1)]
+        elif isinstance(to, dict):
+            targetnames = [str(t) for t in to.keys()]
+            cations = [get_cations(t, total_suffix=total_suffix)[0] for t in to]
+            assert all([c == cations[0] for c in cations])
+            cation = cations[0]
+            _props = np.array(list(to.values())).astype(float)
+            if _props.ndim == 2:
+                # proportions are a n-dimensional array (one array for each component)
+                props = close(_props.T).T
+            else:
+                props = close(_props)  # proportions are a series of floats
+            factors = [
+                oxide_conversion(cation, t, molecular=molecular)(p)
+                for t, p in zip(targetnames, props)
+            ]
+        else:
+            msg = "Not yet implemented for tuples, lists, arrays etc."
+            raise NotImplementedError(msg)
+
+        cationname = str(cation)
+        oxides = simple_oxides(cation)
+        oxides += [i + total_suffix for i in oxides]
+        poss_specs = [cationname, cationname + total_suffix] + oxides
+        species = [i for i in self.columns if i in poss_specs]
+        if not species:
+            logger.warning(
+                "No relevant species ({}) found to aggregate.".format(poss_specs)
+            )
+        if cationname not in self.cations:
+            self.cations.append(cationname)
+        for s in species:
+            if s not in self.species:
+                self.species.append(s)
+                self._species_cations.append(cationname)
+        # oxide species are replaced by the targets, elemental species are retained
+        self.drop += [i for i in species if i in oxides and i not in targetnames]
+        for t, f in zip(targetnames, factors):
+            self.targets.append(t)
+            self._target_cations.append(self.cations.index(cationname))
+            self._target_factors.append(f)
+
+    def elemental_sums(self, df: pd.DataFrame, logdata=False):
+        """
+        Calculate the elemental sums for each cation.
+
+        Parameters
+        ----------
+        df : :class:`pandas.DataFrame`
+            Dataframe to convert.
+        logdata : :class:`bool`, :code:`False`
+            Whether the data has been log transformed.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of elemental sums (:code:`rows, cations`), with non-positive sums
+            replaced by :code:`numpy.nan`.
+        """
+        X = df.loc[:, self.species].to_numpy(dtype=float)
+        if logdata:
+            X = np.exp(X)
+        # zero non-finite and negative values
+        X = np.fmax(X, 0.0)  # also replaces nan and -inf
+        X[X == np.inf] = 0.0
+        sums = X @ self.coefficients
+        sums[sums <= 0.0] = np.nan
+        return sums
+
+    def apply(self, df: pd.DataFrame, logdata=False):
+        """
+        Convert a dataframe to the target components.
+
+        Parameters
+        ----------
+        df : :class:`pandas.DataFrame`
+            Dataframe to convert, which should have the columns the plan was
+            compiled for.
+        logdata : :class:`bool`, :code:`False`
+            Whether the data has been log transformed.
+
+        Returns
+        -------
+        :class:`pandas.DataFrame`
+            Dataframe with the target components, in which the columns they replace
+            have been dropped.
+        """
+        sums = self.elemental_sums(df, logdata=logdata)
+        factors = self._target_factors
+        if any(np.ndim(f) for f in factors):  # proportions for individual rows
+            factors = [np.broadcast_to(f, df.index.size) for f in factors]
+            factors = np.column_stack(factors)
+        converted = sums[:, self._target_cations] * np.array(factors, dtype=float)
+        if logdata:
+            logger.debug("Log-transforming {} Data.".format(",".join(self.cations)))
+            converted = np.log(converted)
+        converted[converted == 0] = np.nan
+        df = df.drop(columns=self.drop)
+        df[self.targets] = converted
+        return df
+
+
+@functools.lru_cache(maxsize=None)  # cache outputs for speed
+def _get_conversion_plan(columns, to, molecular=False, total_suffix="T"):
+    return ConversionPlan(
+        columns,
+        [dict(t) if isinstance(t, tuple) else t for t in to],
+        molecular=molecular,
+        total_suffix=total_suffix,
+    )
+
+
+def get_conversion_plan(columns, to, molecular=False, total_suffix="T"):
+    """
+    Get a compiled conversion of a set of columns to a set of target components.
+    Plans are cached for each set of columns and targets, such that repeated
+    conversions (e.g. of chunks of a large table) only compile them once.
+
+    Parameters
+    ----------
+    columns : :class:`list`
+        Columns of the dataframes to be converted.
+    to : :class:`list`
+        Components to convert to. Each item can be a single component or a
+        dictionary of components with proportions (see :func:`aggregate_element`).
+    molecular : :class:`bool`, :code:`False`
+        Whether the data are molecular rather than weight-based.
+    total_suffix : :class:`str`, 'T'
+        Suffix of 'total' variables. E.g. 'T' for FeOT, Fe2O3T.
+
+    Returns
+    -------
+    :class:`ConversionPlan`
+
+    Notes
+    -----
+    Plans using proportions specified as arrays or with components specified as
+    :class:`~periodictable.formulas.Formula` objects are compiled for each call
+    rather than cached.
+    """
+    key = tuple(tuple(t.items()) if isinstance(t, dict) else t for t in to)
+    try:
+        hash(key)
+    except TypeError:  # not cacheable, e.g. with arrays of proportions
+        return ConversionPlan(
+            columns, to, molecular=molecular, total_suffix=total_suffix
+        )
+    return _get_conversion_plan(
+        tuple(columns), key, molecular=molecular, total_suffix=total_suffix
+    )
+
+
 def aggregate_element(
     df: pd.DataFrame, to, total_suffix="T", logdata=False, renorm=False, molecular=False
 ):
@@ -277,83 +514,16 @@ def aggregate_element(
     -------
     :class:`pandas.DataFrame`
         Dataframe with cation aggregated to the desired species.
+
+    See Also
+    --------
+    :func:`get_conversion_plan`
     """
-    # get the elemental sum for the specified cation
-    subsum = elemental_sum(
-        df, to, total_suffix=total_suffix, logdata=logdata, molecular=molecular
+    plan = get_conversion_plan(
+        df.columns, [to], molecular=molecular, total_suffix=total_suffix
     )
-    # split this elemental sum into different components
-    cation = subsum.name
-    species = simple_oxides(cation)
-    species += [i + total_suffix for i in species]
-    species = [i for i in species if i in df.columns]
-    _df = df.copy()
-    if isinstance(to, str):
-        logger.debug("Aggregating string-specified component {}.".format(to))
-        toform = remove_suffix(to, suffix=total_suffix)
-        drop = [i for i in species if str(i) != to]
-        targetnames = [to]
-        props = [1.0]  # 100%
-        coeff = [oxide_conversion(cation, toform, molecular=molecular)(1)]
-    elif isinstance(to, (pt.core.Element, pt.formulas.Formula)):
-        logger.debug("Aggregating object-specified component {}.".format(to))
-        to = str(to)
-        drop = [i for i in species if str(i) != to]
-        targetnames = [to]
-        props = [1.0]  # 100%
-        coeff = [oxide_conversion(cation, to, molecular=molecular)(1)]
-    elif isinstance(to, dict):
-        logger.debug(
-            "Aggregating dict-specified components {}.".format(",".join(to.keys()))
-        )
-        targets = list(to.items())
-        targetnames = [str(t[0]) for t in targets]
-        _props = np.array([t[1] for t in targets]).astype(float)
-        if _props.ndim == 2:
-            # proportions are a n-dimensional array (i.e. one array for each component)
-            props = close(_props.T).T
-        else:
-            props = close(_props)  # proportions are a series of floats
-        coeff = [
-            oxide_conversion(cation, t, molecular=molecular)(p)
-            for t, p in zip(targetnames, props)
-        ]
-        drop = [i for i in species if str(i) not in targetnames]
-    else:
-        raise NotImplementedError("Not yet implemented for tuples, lists, arrays etc.")
-
-    logger.debug(  # edited to deal with arrays
-        "Transforming {} to: {}".format(
-            cation,
-            {
-                k: (
-                    "{:2.1f}%".format(v * 100)
-                    if not isinstance(v, np.ndarray)
-                    else ",".join(list((v * 100).astype(str)))
-                )
-                for (k, v) in zip(targetnames, props)
-            },
-        )
-    )
-
-    for t in targetnames:
-        if t not in _df:
-            _df[t] = 0.0  # avoid missing column errors
-
-    coeff = np.array(coeff)
-    if coeff.ndim == 2:
-        _df.loc[:, targetnames] = subsum.values[:, np.newaxis] * coeff.T
-    else:
-        _df.loc[:, targetnames] = subsum.values[:, np.newaxis] @ coeff[np.newaxis, :]
-
-    if logdata:
-        logger.debug("Log-transforming {} Data.".format(cation))
-        _df.loc[:, targetnames] = np.log(_df.loc[:, targetnames])
-    if drop:
-        logger.debug("Dropping redundant columns: {}".format(", ".join(drop)))
-        df = df.drop(columns=drop)
-
-    df.loc[:, targetnames] = _df.loc[:, targetnames].replace(0, np.nan)
+    logger.debug("Aggregating {}.".format(plan))
+    df = plan.apply(df, logdata=logdata)
     if renorm:
         return renormalise(df)
     else:
@@ -565,6 +735,9 @@ def lambda_lnREE(
     :func:`~pyrolite.util.lambdas.params.orthogonal_polynomial_constants`
     :func:`~pyrolite.plot.REE_radii_plot`
     """
+    # imported on use, as lambdas imports plotting utilities
+    from ..util import lambdas
+
     # if there are no supplied params, they will be calculated in calc_lambdas
     ree = df.pyrochem.list_REE  # this excludes Pm
     # initialize normdf
@@ -583,8 +756,7 @@ def lambda_lnREE(
 
     if norm_to is not None:  # None = already normalised data
         if isinstance(norm_to, str):
-            norm = get_reference_composition(norm_to)
-            norm.set_units(scale)
+            norm = get_reference_composition(norm_to, units=scale)
             norm_abund = norm[ree]
         elif isinstance(norm_to, Composition):
             norm = norm_to
@@ -675,7 +847,7 @@ def convert_chemistry(
     * Implement generalised redox transformation.
     * Add check for dicitonary components (e.g. Fe) in tests
     """
-    df = input_df.copy(deep=True)
+    df = input_df  # the conversion plan below returns a new dataframe
     ####################################################################################
     # Parse what we need to get from the dataframe
     ####################################################################################
@@ -726,6 +898,7 @@ def convert_chemistry(
     logger.debug("Checking Iron Redox")
     # check if any of the coupled_sets dictionaries correspond to iron
     coupled_fe = [s for s in coupled_sets if all(["Fe" in k for k in s])]
+    aggregate = []  # components to aggregate, including speciated components
     if coupled_fe:
         assert (
             not out_fe_nonspeciated
@@ -739,15 +912,7 @@ def convert_chemistry(
             )
         except TypeError:
             pass  # this is likely because there are arrays etc in get_fe
-        df = aggregate_element(
-            df,
-            to=get_fe,
-            renorm=False,
-            logdata=logdata,
-            molecular=molecular,
-            total_suffix=total_suffix,
-            **kwargs,
-        )
+        aggregate.append(get_fe)
 
     # TODO: warning for duplication should also be crossed over into speciated components above.. 
     _duplicated_cations = [
@@ -759,9 +924,14 @@ def convert_chemistry(
     ]
     if _duplicated_cations:
         logger.warning("Cations duplicated in compositional components: {}. The output retains this duplication!".format(','.join(_duplicated_cations)))
-    # Aggregate the singular compositional items, then get new columns
-    for item in output_compositional:
-        df = aggregate_element(df, to=item, logdata=logdata, molecular=molecular)
+    # Aggregate the speciated and singular compositional items in one step
+    plan = get_conversion_plan(
+        df.columns,
+        aggregate + output_compositional,
+        molecular=molecular,
+        total_suffix=total_suffix,
+    )
+    df = plan.apply(df, logdata=logdata)
 
     ####################################################################################
     # Handle Ratios
@@ -29,9 +29,11 @@ References
 """
 
 import numpy as np
+import pandas as pd
 
 from ..util.log import Handle
 from ..util.meta import sphinx_doi_link, update_docstring_references
+from ..util.missing import md_pattern
 
 logger = Handle(__name__)
 
@@ -182,6 +184,281 @@ def youngs_modulus_approximation(z, r):
     return E
 
 
+def _strain_constant(T):
+    r"""
+    Get the constant :math:`4 \pi N / RT` relating the strain term
+    :math:`E (\frac{r_0}{2}(r_j - r_0)^2 + \frac{1}{3}(r_j - r_0)^3)` to
+    :math:`-ln(D_j / D_0)`, for Young's moduli in GPa and radii in angstroms.
+
+    Parameters
+    ----------
+    T : :class:`numpy.ndarray`
+        Temperatures, in Kelvin (K).
+
+    Returns
+    --------
+    :class:`numpy.ndarray`
+    """
+    return 4.0 * np.pi * 6.023 * 10**23 * 10**-21 / (8.314 * T)
+
+
+def _lattice_strain_model(params, radii, k):
+    """
+    Evaluate the log-partition coefficients and their Jacobian with respect to the
+    lattice strain parameters for a stack of parameter sets.
+
+    Parameters
+    ----------
+    params : :class:`numpy.ndarray`
+        Parameters :math:`ln(D_0)`, :math:`r_0` (Å) and :math:`E` (GPa) for each row
+        (shape :math:`n, 3`).
+    radii : :class:`numpy.ndarray`
+        Ionic radii at which to evaluate the model (Å).
+    k : :class:`numpy.ndarray`
+        Strain constants for each row (see :func:`_strain_constant`).
+
+    Returns
+    --------
+    lnD, jacobian : :class:`numpy.ndarray`
+        Log-partition coefficients (shape :math:`n, m`) and their Jacobian (shape
+        :math:`n, m, 3`).
+    """
+    lnD0, r0, E = params[:, :1], params[:, 1:2], params[:, 2:3]
+    k = k.reshape(-1, 1)
+    d = radii[np.newaxis, :] - r0
+    strain = r0 / 2.0 * d**2 + d**3 / 3.0
+    lnD = lnD0 - k * E * strain
+    jacobian = np.stack(
+        [
+            np.ones_like(lnD),
+            k * E * (d**2 / 2.0 + r0 * d),
+            -k * strain,
+        ],
+        axis=-1,
+    )
+    return lnD, jacobian
+
+
+def _lattice_strain_x0(y, radii, k, w):
+    """
+    Estimate starting parameters for lattice strain fits from weighted quadratic
+    fits to the log-partition coefficients.
+
+    Parameters
+    ----------
+    y : :class:`numpy.ndarray`
+        Log-partition coefficients (shape :math:`n, m`).
+    radii : :class:`numpy.ndarray`
+        Ionic radii (Å).
+    k : :class:`numpy.ndarray`
+        Strain constants for each row (see :func:`_strain_constant`).
+    w : :class:`numpy.ndarray`
+        Weights for each ion.
+
+    Returns
+    --------
+    :class:`numpy.ndarray`
+        Starting parameters (shape :math:`n, 3`).
+    """
+    X = np.vander(radii, 3) * w[:, np.newaxis]  # [r^2, r, 1]
+    a, b, c = np.linalg.pinv(X) @ (y * w).T
+    curved = a < 0  # concave-down parabolas have a maximum
+    r0 = np.where(curved, -b / (2 * np.where(curved, a, -1)), radii[y.argmax(axis=1)])
+    spread = np.ptp(radii)
+    r0 = np.clip(r0, radii.min() - spread, radii.max() + spread)
+    lnD0 = np.where(curved, a * r0**2 + b * r0 + c, y.max(axis=1))
+    E = np.where(curved, -2 * a / (k * r0), 100.0)
+    return np.column_stack([lnD0, r0, np.clip(E, 1.0, 10**4)])
+
+
+def _batch_lattice_strain(y, radii, k, w, max_iter=100, tol=1e-10):
+    """
+    Fit the lattice strain model to a stack of rows of log-partition coefficients
+    at once, using a Gauss-Newton iteration with Levenberg-Marquardt damping where
+    steps fail to reduce the cost.
+
+    Parameters
+    ----------
+    y : :class:`numpy.ndarray`
+        Log-partition coefficients (shape :math:`n, m`).
+    radii : :class:`numpy.ndarray`
+        Ionic radii (Å).
+    k : :class:`numpy.ndarray`
+        Strain constants for each row (see :func:`_strain_constant`).
+    w : :class:`numpy.ndarray`
+        Weights for each ion.
+    max_iter : :class:`int`
+        Maximum number of iterations.
+    tol : :class:`float`
+        Relative tolerance for the change in cost and parameters used to determine
+        convergence.
+
+    Returns
+    -------
+    params, residuals, jacobian : :class:`numpy.ndarray`
+        Optimized parameters (shape :math:`n, 3`), and the weighted residuals (shape
+        :math:`n, m`) and Jacobians (shape :math:`n, m, 3`) at these parameters.
+    """
+
+    def evaluate(params, rows):
+        lnD, jacobian = _lattice_strain_model(params, radii, k[rows])
+        return (lnD - y[rows]) * w, jacobian * w[:, np.newaxis]
+
+    params = _lattice_strain_x0(y, radii, k, w)
+    allrows = np.arange(y.shape[0])
+    damping = np.zeros(y.shape[0])
+    active = np.ones(y.shape[0], dtype=bool)
+    residuals, jacobian = evaluate(params, allrows)
+    cost = 0.5 * (residuals**2).sum(axis=1)
+    eye = np.eye(params.shape[1])
+    for iteration in range(max_iter):
+        rows = np.flatnonzero(active)
+        r, J = residuals[rows], jacobian[rows]
+        # solve the damped least squares problem for the step as an augmented system
+        scale = np.sqrt(damping[rows, None] * (J**2).sum(axis=1))
+        A = np.concatenate([J, scale[:, :, None] * eye], axis=1)
+        b = np.concatenate([r, np.zeros_like(scale)], axis=1)
+        step = -np.einsum("nkm,nm->nk", np.linalg.pinv(A), b)
+
+        _params = params[rows] + step
+        _residuals, _jacobian = evaluate(_params, rows)
+        _cost = 0.5 * (_residuals**2).sum(axis=1)
+        improved = _cost <= cost[rows]
+        converged = (
+            np.abs(cost[rows] - _cost) <= tol * np.maximum(cost[rows], tol)
+        ) | (np.abs(step).max(axis=1) <= tol * (np.abs(_params).max(axis=1) + tol))
+
+        accept = rows[improved]
+        params[accept], cost[accept] = _params[improved], _cost[improved]
+        residuals[accept], jacobian[accept] = _residuals[improved], _jacobian[improved]
+        damping[accept] /= 10.0
+        damping[rows[~improved]] = np.maximum(damping[rows[~improved]] * 10.0, 1e-3)
+        active[rows[converged]] = False
+        if not active.any():
+            break
+    return params, residuals, jacobian
+
+
+def fit_lattice_strain(
+    D,
+    radii=None,
+    T=298.15,
+    sigmas=None,
+    charge=None,
+    coordination=None,
+    max_iter=100,
+    tol=1e-10,
+):
+    r"""
+    Fit the lattice strain model [#ref_1]_ (see :func:`strain_coefficient`) to
+    partition coefficients for a number of samples at once, obtaining the
+    partition coefficient for the ideal ion :math:`D_0`, the radius of the ideal ion
+    :math:`r_0` and the Young's modulus :math:`E` of the site for each sample.
+
+    Parameters
+    -----------
+    D : :class:`pandas.DataFrame` | :class:`numpy.ndarray`
+        Partition coefficients for ions of a given charge (one row per sample and
+        one column per ion). Non-finite and non-positive values are treated as
+        missing.
+    radii : :class:`numpy.ndarray`
+        Ionic radii for each ion (Å). If not specified, these are obtained for the
+        columns of :code:`D` using :func:`~pyrolite.geochem.ind.get_ionic_radii`.
+    T : :class:`float` | :class:`numpy.ndarray`
+        Temperature, in Kelvin (K), either for all samples or for each sample.
+    sigmas : :class:`float` | :class:`numpy.ndarray`
+        Single value or 1D array of relative uncertainties for the partition
+        coefficients (:math:`\sigma_D / D`), which defaults to 1%.
+    charge : :class:`int`
+        Charge of the ions, used to obtain ionic radii where not specified.
+    coordination : :class:`int`
+        Coordination of the site, used to obtain ionic radii where not specified.
+    max_iter : :class:`int`
+        Maximum number of iterations.
+    tol : :class:`float`
+        Relative tolerance for the change in cost and parameters used to determine
+        convergence.
+
+    Returns
+    --------
+    :class:`pandas.DataFrame`
+        Dataframe of fitted parameters (:code:`D0`, :code:`r0` in Å and :code:`E` in
+        Pa), their uncertainties (1σ; e.g. :code:`D0_σ`) and reduced chi-squared
+        values (:code:`X2`). Samples with fewer than three partition coefficients
+        are not fitted, and uncertainties are not estimated for samples with
+        exactly three.
+
+    Notes
+    ------
+    The model is fitted to the natural logarithm of the partition coefficients,
+    such that the relative uncertainties :code:`sigmas` are the uncertainties of
+    :math:`ln(D)`. Samples which share the same pattern of missing data are fitted
+    together using a Levenberg-Marquardt algorithm with an analytical Jacobian.
+
+    See Also
+    ---------
+    :func:`strain_coefficient`
+    :func:`~pyrolite.geochem.ind.get_ionic_radii`
+    """
+    index = D.index if isinstance(D, pd.DataFrame) else None
+    if radii is None:
+        from ..geochem.ind import get_ionic_radii
+
+        radii = get_ionic_radii(
+            list(D.columns), charge=charge, coordination=coordination
+        )
+    radii = np.array(radii, dtype=float)
+    y = np.array(D, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        y = np.where(y > 0, np.log(y), np.nan)
+    y[~np.isfinite(y)] = np.nan
+    assert y.shape[1] == radii.size, "Need one ionic radius for each ion."
+    k = np.broadcast_to(_strain_constant(np.array(T, dtype=float)), y.shape[0])
+    sigmas = np.broadcast_to(np.array(0.01 if sigmas is None else sigmas), radii.shape)
+
+    params = np.ones((y.shape[0], 3)) * np.nan
+    s = np.ones((y.shape[0], 3)) * np.nan
+    χ2 = np.ones(y.shape[0]) * np.nan
+
+    md_inds, patterns = md_pattern(y)
+    for ind in np.unique(md_inds):
+        rows = np.flatnonzero(md_inds == ind)
+        present = ~patterns[ind]["pattern"]
+        nions = present.sum()
+        if nions < 3:
+            continue
+        _params, residuals, jacobian = _batch_lattice_strain(
+            y[np.ix_(rows, present)],
+            radii[present],
+            k[rows],
+            1 / sigmas[present],
+            max_iter=max_iter,
+            tol=tol,
+        )
+        params[rows] = _params
+        χ2[rows] = (residuals**2).sum(axis=1) / max(nions - 3, 1)
+        if nions > 3:
+            pcov = np.linalg.pinv(np.einsum("nmi,nmj->nij", jacobian, jacobian))
+            pcov *= χ2[rows, None, None]
+            s[rows] = np.sqrt(np.abs(np.einsum("nkk->nk", pcov)))
+        else:
+            s[rows] = np.inf
+
+    D0 = np.exp(params[:, 0])
+    return pd.DataFrame(
+        {
+            "D0": D0,
+            "r0": params[:, 1],
+            "E": params[:, 2] * 10**9,
+            "D0_" + chr(963): D0 * s[:, 0],
+            "r0_" + chr(963): s[:, 1],
+            "E_" + chr(963): s[:, 2] * 10**9,
+            "X2": χ2,
+        },
+        index=index,
+    )
+
+
 __doc__ = __doc__.format(
     brice1975=sphinx_doi_link("10.1016/0022-0248(75)90241-9"),
     blundy1994=sphinx_doi_link("10.1038/372452a0"),
@@ -10,11 +10,12 @@ Accessing and modifying the database across multiple with multiple threads/proce
 import functools
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import periodictable as pt
-from tinydb import Query, TinyDB
+from tinydb import TinyDB
 
-from ..util.database import _list_tindyb_unique_values
+from ..geochem.ind import get_formula
 from ..util.log import Handle
 from ..util.meta import pyrolite_datafolder
 from .transform import formula_to_elemental, merge_formulae
@@ -24,6 +25,95 @@ logger = Handle(__name__)
 __dbpath__ = pyrolite_datafolder(subfolder="mineral") / "mindb.json"
 
 
+class _MineralTable(object):
+    """
+    Columnar representation of the mineral database, with a numeric composition
+    matrix and indexes for mineral names and groups.
+
+    Parameters
+    -----------
+    records : :class:`list`
+        List of mineral records (dictionaries) from the database.
+
+    Attributes
+    -----------
+    metadata : :class:`dict`
+        Arrays of the names, groups and formulae of each of the minerals.
+    names, groups, formulae : :class:`numpy.ndarray`
+        Names, groups and formulae of each of the minerals.
+    elements : :class:`list`
+        Elements (and ions) of the composition matrix.
+    compositions : :class:`numpy.ndarray`
+        Composition matrix, with a row for each mineral and column for each element.
+    index : :class:`dict`
+        Row index of the each mineral, by name.
+    group_index : :class:`dict`
+        Row indexes of the members of each mineral group, by group name.
+    """
+
+    meta = ["name", "group", "formula"]
+
+    def __init__(self, records):
+        self.elements = []
+        for r in records:  # variables in order of appearance
+            self.elements += [k for k in r if k not in self.meta + self.elements]
+        self.metadata = {
+            m: np.array([r.get(m, None) for r in records], dtype=object)
+            for m in self.meta
+        }
+        self.names, self.groups, self.formulae = [self.metadata[m] for m in self.meta]
+        self.compositions = (
+            pd.DataFrame.from_records(records, columns=self.elements)
+            .apply(pd.to_numeric)
+            .fillna(0.0)
+            .values
+        )
+        self.index = {}
+        for ix, name in enumerate(self.names):
+            self.index.setdefault(name, ix)  # the first record for each name
+        groups = pd.unique(self.groups)
+        self.group_index = {g: np.flatnonzero(self.groups == g) for g in groups}
+
+    def frame(self, rows, meta=None):
+        """
+        Get a dataframe of a number of minerals.
+
+        Parameters
+        -----------
+        rows : :class:`numpy.ndarray`
+            Row indexes of the minerals.
+        meta : :class:`list`
+            Metadata columns to include. Defaults to all metadata.
+
+        Returns
+        --------
+        :class:`pandas.DataFrame`
+        """
+        meta = self.meta if meta is None else meta
+        df = pd.DataFrame(self.compositions[rows], columns=self.elements)
+        for ix, m in enumerate(meta):
+            df.insert(ix, m, self.metadata[m][rows])
+        return df
+
+
+@functools.lru_cache(maxsize=None)  # cache outputs for speed
+def _mineral_table(dbpath=None):
+    """
+    Load the mineral database as a columnar table.
+
+    Parameters
+    ------------
+    dbpath : :class:`pathlib.Path`, :class:`str`
+        Optional overriding of the default database path.
+
+    Returns
+    --------
+    :class:`_MineralTable`
+    """
+    with TinyDB(str(dbpath or __dbpath__), access_mode="r") as db:
+        return _MineralTable(db.all())
+
+
 @functools.lru_cache(maxsize=None)  # cache outputs for speed
 def list_groups():
     """
@@ -33,7 +123,7 @@ def list_groups():
     ----------
     :class:`list`
     """
-    return _list_tindyb_unique_values("group", dbpath=__dbpath__)
+    return list(_mineral_table().group_index)
 
 
 @functools.lru_cache(maxsize=None)  # cache outputs for speed
@@ -45,7 +135,7 @@ def list_minerals():
     ----------
     :class:`list`
     """
-    return _list_tindyb_unique_values("name", dbpath=__dbpath__)
+    return list(_mineral_table().index)
 
 
 @functools.lru_cache(maxsize=None)  # cache outputs for speed
@@ -57,7 +147,7 @@ def list_formulae():
     ----------
     :class:`list`
     """
-    return _list_tindyb_unique_values("formula", dbpath=__dbpath__)
+    return list(pd.unique(_mineral_table().formulae))
 
 
 def get_mineral(name="", dbpath=None):
@@ -75,14 +165,36 @@ def get_mineral(name="", dbpath=None):
     --------
     :class:`pd.Series`
     """
-    if dbpath is None:
-        dbpath = __dbpath__
+    table = _mineral_table(dbpath)
+    assert name in table.index
+    ix = table.index[name]
+    return pd.Series(
+        [table.names[ix], table.groups[ix], table.formulae[ix]]
+        + list(table.compositions[ix]),
+        index=table.meta + table.elements,
+    )
 
-    assert name in list_minerals()
-    with TinyDB(str(dbpath), access_mode="r") as db:
-        out = db.get(Query().name == name)
 
-    return pd.Series(out)
+def get_minerals(names, dbpath=None):
+    """
+    Get a number of minerals from the database.
+
+    Parameters
+    ------------
+    names : :class:`list`
+        Names of the desired minerals.
+    dbpath : :class:`pathlib.Path`, :class:`str`
+        Optional overriding of the default database path.
+
+    Returns
+    --------
+    :class:`pandas.DataFrame`
+        Dataframe with a row for each of the minerals, in the order given.
+    """
+    table = _mineral_table(dbpath)
+    missing = [n for n in names if n not in table.index]
+    assert not missing, "Minerals not found: {}".format(", ".join(map(str, missing)))
+    return table.frame(np.array([table.index[n] for n in names], dtype=int))
 
 
 def parse_composition(composition, drop_zeros=True):
@@ -109,7 +221,7 @@ def parse_composition(composition, drop_zeros=True):
     if composition is not None:
         if isinstance(composition, pd.Series):
             # convert to molecular oxides, then to formula, then to wt% elemental
-            components = [pt.formula(c) for c in composition.index]
+            components = [get_formula(c) for c in composition.index]
             values = composition.values
             formula = merge_formulae(
                 [v / c.mass * c for v, c in zip(values, components)]
@@ -122,7 +234,7 @@ def parse_composition(composition, drop_zeros=True):
                 mineral = get_mineral(composition)
             else:
                 try:  # formulae
-                    form = pt.formula(composition)
+                    form = get_formula(composition)
                     mineral = pd.Series(formula_to_elemental(form))
                     # could also check for formulae in the database, using f.atoms
                 except:
@@ -149,17 +261,9 @@ def get_mineral_group(group=""):
     :class:`pandas.DataFrame`
         Dataframe of group members and compositions.
     """
-    assert group in list_groups()
-    with TinyDB(str(__dbpath__), access_mode="r") as db:
-        grp = db.search(Query().group == group)
-
-    df = pd.DataFrame(grp)
-    meta, chem = (
-        ["name", "formula"],
-        [i for i in df.columns if i not in ["name", "formula", "group"]],
-    )
-    df = df.reindex(columns=meta + chem)
-    df.loc[:, chem] = df.loc[:, chem].apply(pd.to_numeric)
+    table = _mineral_table()
+    assert group in table.group_index
+    df = table.frame(table.group_index[group], meta=["name", "formula"])
     df = df.loc[:, (df != 0).any(axis=0)]  # remove zero-only columns
     return df
 
@@ -184,7 +288,7 @@ def update_database(path=None, **kwargs):
         + [str(a) for a in pt.formula(" ".join(list(mindf.formula.values))).atoms]
     )
     for ix in mindf.index:  # add elemental compositions
-        el = parse_composition(pt.formula(mindf.loc[ix, "formula"]))
+        el = parse_composition(get_formula(mindf.loc[ix, "formula"]))
         mindf.loc[ix, el.index] = el
 
     mindf = mindf.fillna(0.0)
@@ -200,3 +304,7 @@ def update_database(path=None, **kwargs):
         db.truncate()
         for k, v in mindf.T.to_dict().items():
             db.insert(v)
+
+    # invalidate the cached database tables and listings
+    for f in [_mineral_table, list_groups, list_minerals, list_formulae]:
+        f.cache_clear()
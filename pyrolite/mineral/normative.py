@@ -1,17 +1,17 @@
-import re
-
 import numpy as np
 import pandas as pd
 import periodictable as pt
 import scipy
 
 from ..comp.codata import close, renormalise
+from ..geochem.ind import get_formula, get_formula_masses, get_formula_properties
 from ..geochem.transform import convert_chemistry, to_molecular
 from ..util.classification import TAS
 from ..util.log import Handle
+from ..util.multip import multiprocess
 from ..util.pd import to_frame
 from ..util.units import scale
-from .mindb import get_mineral_group, list_minerals, parse_composition
+from .mindb import get_mineral_group, get_minerals, list_minerals, parse_composition
 
 logger = Handle(__name__)
 
@@ -67,13 +67,15 @@ NORM_MINERALS = {
 
 # Add standard masses to minerals
 for mineral in NORM_MINERALS.keys():
-    NORM_MINERALS[mineral]["mass"] = pt.formula(NORM_MINERALS[mineral]["formulae"]).mass
+    NORM_MINERALS[mineral]["mass"] = get_formula_properties(
+        NORM_MINERALS[mineral]["formulae"]
+    ).mass
 
 
-def unmix(comp, parts, order=1, det_lim=0.0001):
+def _unmix_minimize(comp, parts, order=1):
     """
-    From a composition and endmember components, find a set of weights which best
-    approximate the composition as a weighted sum of components.
+    Find endmember weights for a set of compositions using a single optimization
+    across all samples, constrained such that the weights sum to the number of samples.
 
     Parameters
     --------------
@@ -82,18 +84,14 @@ def unmix(comp, parts, order=1, det_lim=0.0001):
     parts : :class:`numpy.ndarray`
         Array of endmembers (shape :math:`n_E, n_C`).
     order : :class:`int`
-        Order of regularization, defaults to L1 for sparsity.
-    det_lim : :class:`float`
-        Detection limit, below which minor components will be omitted for sparsity.
+        Order of the norm used for the residuals.
 
     Returns
     --------
     :class:`numpy.ndarray`
-        Array of endmember modal abundances (shape :math:`n_S, n_E`)
+        Array of endmember weights (shape :math:`n_S, n_E`)
     """
-    nsamples, nscomponents = comp.shape
-    nparts, ncomponents = parts.shape
-    assert nscomponents == ncomponents
+    nsamples, nparts = comp.shape[0], parts.shape[0]
     weights = np.ones((nsamples, nparts))
     weights /= weights.sum()
     bounds = np.array([np.zeros(weights.size), np.ones(weights.size)]).T
@@ -109,7 +107,128 @@ def unmix(comp, parts, order=1, det_lim=0.0001):
         args=(comp, parts),
         constraints={"type": "eq", "fun": lambda x: np.sum(x) - nsamples},
     )
-    byparts = res.x.reshape(weights.shape)
+    return res.x.reshape(weights.shape)
+
+
+def _unmix_nnls(comp, parts):
+    """
+    Find endmember weights for each of a set of compositions using non-negative
+    least squares.
+
+    Parameters
+    --------------
+    comp : :class:`numpy.ndarray`
+        Array of compositions (shape :math:`n_S, n_C`).
+    parts : :class:`numpy.ndarray`
+        Array of endmembers (shape :math:`n_E, n_C`).
+
+    Returns
+    --------
+    :class:`numpy.ndarray`
+        Array of endmember weights (shape :math:`n_S, n_E`)
+    """
+    weights = np.zeros((comp.shape[0], parts.shape[0]))
+    for ix, c in enumerate(comp):
+        weights[ix] = scipy.optimize.nnls(parts.T, c)[0]
+    return weights
+
+
+def _unmix_projected_gradient(comp, parts, tol=1e-10, maxiter=10000):
+    """
+    Find endmember weights for a set of compositions using non-negative least squares,
+    solved for all samples at once using accelerated projected gradient descent.
+
+    Parameters
+    --------------
+    comp : :class:`numpy.ndarray`
+        Array of compositions (shape :math:`n_S, n_C`).
+    parts : :class:`numpy.ndarray`
+        Array of endmembers (shape :math:`n_E, n_C`).
+    tol : :class:`float`
+        Tolerance for the maximum change in weights between iterations, below which
+        the solution is considered converged.
+    maxiter : :class:`int`
+        Maximum number of iterations.
+
+    Returns
+    --------
+    :class:`numpy.ndarray`
+        Array of endmember weights (shape :math:`n_S, n_E`)
+    """
+    # the gradient of the residuals for all samples uses the same gram matrix
+    gram, target = parts @ parts.T, comp @ parts.T
+    step = 1.0 / np.linalg.eigvalsh(gram).max()
+    weights = np.full((comp.shape[0], parts.shape[0]), 1.0 / parts.shape[0])
+    momentum, t = weights.copy(), 1.0
+    for iteration in range(maxiter):
+        updated = np.maximum(momentum - step * (momentum @ gram - target), 0.0)
+        _t = (1.0 + np.sqrt(1.0 + 4.0 * t**2)) / 2.0
+        momentum = updated + ((t - 1.0) / _t) * (updated - weights)
+        change = np.abs(updated - weights).max(initial=0.0)
+        weights, t = updated, _t
+        if change <= tol:
+            break
+    else:
+        logger.warning("Unmixing did not converge after {} iterations.".format(maxiter))
+    return weights
+
+
+_UNMIX_METHODS = {
+    "minimize": _unmix_minimize,
+    "nnls": _unmix_nnls,
+    "projected_gradient": _unmix_projected_gradient,
+}
+
+
+def unmix(comp, parts, order=1, det_lim=0.0001, method="minimize", processes=None):
+    """
+    From a composition and endmember components, find a set of weights which best
+    approximate the composition as a weighted sum of components.
+
+    Parameters
+    --------------
+    comp : :class:`numpy.ndarray`
+        Array of compositions (shape :math:`n_S, n_C`).
+    parts : :class:`numpy.ndarray`
+        Array of endmembers (shape :math:`n_E, n_C`).
+    order : :class:`int`
+        Order of regularization, defaults to L1 for sparsity. Only used for
+        :code:`method="minimize"`.
+    det_lim : :class:`float`
+        Detection limit, below which minor components will be omitted for sparsity.
+    method : :class:`str`
+        Method used to find the weights; one of :code:`"minimize"` (a single
+        constrained optimization across all samples, the default), :code:`"nnls"`
+        (non-negative least squares for each sample) or
+        :code:`"projected_gradient"` (non-negative least squares for all samples at
+        once).
+    processes : :class:`int`
+        Number of processes across which to split the samples, if any. Not used for
+        :code:`method="minimize"`, as samples are not independent.
+
+    Returns
+    --------
+    :class:`numpy.ndarray`
+        Array of endmember modal abundances (shape :math:`n_S, n_E`)
+    """
+    nsamples, nscomponents = comp.shape
+    nparts, ncomponents = parts.shape
+    assert nscomponents == ncomponents
+    if method not in _UNMIX_METHODS:
+        raise NotImplementedError("Unknown unmixing method: {}.".format(method))
+
+    if method == "minimize":
+        byparts = _unmix_minimize(comp, parts, order=order)
+    elif processes is not None and processes > 1 and nsamples > 1:
+        chunks = np.array_split(comp, min(processes, nsamples))
+        byparts = np.vstack(
+            multiprocess(
+                _UNMIX_METHODS[method], [dict(comp=c, parts=parts) for c in chunks]
+            )
+        )
+    else:
+        byparts = _UNMIX_METHODS[method](comp, parts)
+
     byparts[(np.isclose(byparts, 0.0, atol=1e-06) | (byparts <= det_lim))] = 0.0
     # if the abundances aren't already molecular, this would be the last point
     # where access access to the composition of the endmembers is guaranteed
@@ -117,7 +236,14 @@ def unmix(comp, parts, order=1, det_lim=0.0001):
 
 
 def endmember_decompose(
-    composition, endmembers=[], drop_zeros=True, molecular=True, order=1, det_lim=0.0001
+    composition,
+    endmembers=[],
+    drop_zeros=True,
+    molecular=True,
+    order=1,
+    det_lim=0.0001,
+    method="nnls",
+    processes=None,
 ):
     """
     Decompose a given mineral composition to given endmembers.
@@ -137,6 +263,11 @@ def endmember_decompose(
         Order of regularization passed to :func:`unmix`, defaults to L1 for sparsity.
     det_lim : :class:`float`
         Detection limit, below which minor components will be omitted for sparsity.
+    method : :class:`str`
+        Method passed to :func:`unmix` to find the endmember weights, which defaults
+        to non-negative least squares for each sample (:code:`"nnls"`).
+    processes : :class:`int`
+        Number of processes passed to :func:`unmix` across which to split samples.
 
     Returns
     ---------
@@ -153,7 +284,7 @@ def endmember_decompose(
         elif isinstance(composition, (pt.formulas.Formula, str)):
             formula = composition
             if isinstance(composition, str):
-                formula = pt.formula(formula)
+                formula = get_formula(formula)
 
     # parse endmember compositions -----------------------------------------------------
     aliases = None
@@ -169,9 +300,18 @@ def endmember_decompose(
     elif isinstance(endmembers, (list, set, dict, tuple)):
         if isinstance(endmembers, dict):
             aliases, endmembers = list(endmembers.keys()), list(endmembers.values())
-        Y = pd.DataFrame(
-            [parse_composition(em) for em in endmembers], index=aliases or endmembers
-        )
+        endmembers = list(endmembers)
+        minerals = list_minerals()
+        if all(isinstance(em, str) and em in minerals for em in endmembers):
+            # look up all the minerals at once, treating zeros as absent
+            Y = get_minerals(endmembers)
+            Y = Y.where(Y != 0).dropna(axis=1, how="all")
+            Y.index = aliases or endmembers
+        else:
+            Y = pd.DataFrame(
+                [parse_composition(em) for em in endmembers],
+                index=aliases or endmembers,
+            )
     else:
         raise NotImplementedError("Unknown endmember specification format.")
 
@@ -187,7 +327,14 @@ def endmember_decompose(
         X, Y = to_molecular(X), to_molecular(Y)
     # optimise decomposition into endmember components
     modal = pd.DataFrame(
-        unmix(X.fillna(0).values, Y.fillna(0).values, order=order, det_lim=det_lim),
+        unmix(
+            X.fillna(0).values,
+            Y.fillna(0).values,
+            order=order,
+            det_lim=det_lim,
+            method=method,
+            processes=processes,
+        ),
         index=X.index,
         columns=Y.index,
     )
@@ -202,33 +349,79 @@ def endmember_decompose(
 # CIPW Norm and Related functions
 ################################################################################
 
-# fuctions which map <TAS field, [SiO2, Na2O + K2O]> to Fe2O3/FeO ratios.
+# Fe2O3/FeO mass ratios for TAS fields, as <field: (ratio, alkali threshold,
+# ratio above threshold)>; fields with a single ratio have an infinite threshold.
 _MiddlemostTASRatios = dict(
-    F=lambda t, x: 0.4 if x[1] > 10 else 0.3,
-    F1=lambda t, x: 0.1,
-    F2=lambda t, x: 0.2,
-    F3=lambda t, x: 0.3,
-    F4=lambda t, x: 0.4,
-    Ph=lambda t, x: 0.5,
-    T1=lambda t, x: 0.5,
-    T2=lambda t, x: 0.5,
-    R=lambda t, x: 0.5,
-    O3=lambda t, x: 0.4,
-    S3=lambda t, x: 0.4,
-    U3=lambda t, x: 0.4,
-    O2=lambda t, x: 0.35,
-    S2=lambda t, x: 0.35,
-    U2=lambda t, x: 0.35,
-    O1=lambda t, x: 0.3,
-    S1=lambda t, x: 0.3,
-    U1=lambda t, x: 0.3 if x[1] > 6 else 0.2,
-    Ba=lambda t, x: 0.2,
-    Bs=lambda t, x: 0.2,
-    Pc=lambda t, x: 0.15,
-    none=lambda t, x: 0.15,
+    F=(0.3, 10.0, 0.4),
+    F1=(0.1, np.inf, 0.1),
+    F2=(0.2, np.inf, 0.2),
+    F3=(0.3, np.inf, 0.3),
+    F4=(0.4, np.inf, 0.4),
+    Ph=(0.5, np.inf, 0.5),
+    T1=(0.5, np.inf, 0.5),
+    T2=(0.5, np.inf, 0.5),
+    R=(0.5, np.inf, 0.5),
+    O3=(0.4, np.inf, 0.4),
+    S3=(0.4, np.inf, 0.4),
+    U3=(0.4, np.inf, 0.4),
+    O2=(0.35, np.inf, 0.35),
+    S2=(0.35, np.inf, 0.35),
+    U2=(0.35, np.inf, 0.35),
+    O1=(0.3, np.inf, 0.3),
+    S1=(0.3, np.inf, 0.3),
+    U1=(0.2, 6.0, 0.3),
+    Ba=(0.2, np.inf, 0.2),
+    Bs=(0.2, np.inf, 0.2),
+    Pc=(0.15, np.inf, 0.15),
+    none=(0.15, np.inf, 0.15),
+)
+
+# coefficients for <mode: (intercept, SiO2, Na2O + K2O)> for LeMaitre (1976)
+# FeO/(FeO+Fe2O3) mass ratios
+_LeMaitreOxRatioCoefficients = dict(
+    volcanic=(0.93, -0.0042, -0.022),
+    plutonic=(0.88, -0.0016, -0.027),
 )
 
 
+def _TAS_coordinates(df, normalise=False):
+    """
+    Get SiO2 and total alkali (Na2O + K2O) abundances for a TAS classification.
+
+    Parameters
+    ----------
+    df : :class:`pandas.DataFrame`
+        Dataframe containing compositions in mass units.
+    normalise : :class:`bool`
+        Whether to normalise these abundances to an anhydrous major element
+        total of 100%.
+
+    Returns
+    -------
+    :class:`pandas.DataFrame`
+        Dataframe with columns SiO2 and Na2O + K2O.
+    """
+    SiO2 = df["SiO2"].values.astype(float)
+    alkali = df.reindex(columns=["Na2O", "K2O"]).sum(axis=1).values
+    if normalise:
+        to_sum = [
+            "SiO2",
+            "TiO2",
+            "Al2O3",
+            "Fe2O3",
+            "FeO",
+            "MnO",
+            "MgO",
+            "CaO",
+            "Na2O",
+            "K2O",
+            "P2O5",
+        ]
+        adjustment_factor = 100.0 / df[to_sum].sum(axis=1).values
+        SiO2, alkali = SiO2 * adjustment_factor, alkali * adjustment_factor
+    return pd.DataFrame({"SiO2": SiO2, "Na2O + K2O": alkali}, index=df.index)
+
+
 def MiddlemostOxRatio(df):
     """
     Apply a TAS classification to a dataframe, and get estimated Fe2O3/FeO ratios
@@ -251,55 +444,29 @@ def MiddlemostOxRatio(df):
     Classification of Volcanic Rocks. Chemical Geology 77, 1: 19–26.
     https://doi.org/10.1016/0009-2541(89)90011-9.
     """
-    to_sum = [
-        "SiO2",
-        "TiO2",
-        "Al2O3",
-        "Fe2O3",
-        "FeO",
-        "MnO",
-        "MgO",
-        "CaO",
-        "Na2O",
-        "K2O",
-        "P2O5",
-    ]
-
-    df = df.copy(deep=True)
-
-    df["sum"] = df[to_sum].sum(axis=1)
-    adjustment_factor = 100.0 / df["sum"]
-    df[to_sum] = df[to_sum].mul(adjustment_factor, axis=0)
-
-    TAS_input = df.apply(
-        lambda x: pd.Series(
-            {"SiO2": x.SiO2, "Na2O + K2O": x.reindex(index=["Na2O", "K2O"]).sum()}
-        ),
-        axis=1,
+    TAS_input = _TAS_coordinates(df, normalise=True)
+    alkali = TAS_input["Na2O + K2O"].values
+    TAS_fields = TAS().predict(TAS_input).values
+    # foidites are subdivided based on total alkalis
+    TAS_fields = np.select(
+        [
+            TAS_fields != "F",
+            alkali < 3,
+            (alkali >= 3) & (alkali < 7),
+            (alkali >= 7) & (alkali < 10),
+            alkali >= 10,
+        ],
+        [TAS_fields, "F1", "F2", "F3", "F4"],
+        default="F",
     )
-    TAS_fields = TAS().predict(TAS_input)
-    TAS_fields.name = "TAS"
-
-    TAS_fields[(TAS_fields == "F") & (TAS_input["Na2O + K2O"] < 3)] = "F1"
-    TAS_fields[
-        (TAS_fields == "F")
-        & (TAS_input["Na2O + K2O"] >= 3)
-        & (TAS_input["Na2O + K2O"] < 7)
-    ] = "F2"
-    TAS_fields[
-        (TAS_fields == "F")
-        & (TAS_input["Na2O + K2O"] >= 7)
-        & (TAS_input["Na2O + K2O"] < 10)
-    ] = "F3"
-    TAS_fields[(TAS_fields == "F") & (TAS_input["Na2O + K2O"] >= 10)] = "F4"
-
-    ratios = pd.concat([TAS_input, TAS_fields], axis=1).apply(
-        lambda x: _MiddlemostTASRatios.get(x.TAS, lambda t, x: np.nan)(
-            x.TAS, x.values[:2]
-        ),
-        axis=1,
+    fields = list(_MiddlemostTASRatios.keys())
+    table = np.array(list(_MiddlemostTASRatios.values()) + [(np.nan,) * 3])
+    # fields not in the table (e.g. missing classifications) map to the last row
+    codes = pd.Categorical(TAS_fields, categories=fields).codes
+    low, threshold, high = table[codes].T
+    ratios = pd.Series(
+        np.where(alkali > threshold, high, low), index=df.index, name="Fe2O3/FeO"
     )
-    ratios.name = "Fe2O3/FeO"
     return ratios
 
 
@@ -343,21 +510,17 @@ def LeMaitreOxRatio(df, mode=None):
 
     if mode.lower().startswith("volc"):
         logger.debug("Using LeMaitre Volcanic Fe Correction.")
-        ratio = (
-            0.93
-            - 0.0042 * df["SiO2"].fillna(0)
-            - 0.022 * df.reindex(columns=["Na2O", "K2O"]).sum(axis=1)
-        )
+        intercept, a, b = _LeMaitreOxRatioCoefficients["volcanic"]
     else:
         logger.debug("Using LeMaitre Plutonic Fe Correction.")
-        ratio = (
-            0.88
-            - 0.0016 * df["SiO2"].fillna(0)
-            - 0.027 * df.reindex(columns=["Na2O", "K2O"]).sum(axis=1)
-        )
-    ratio.loc[ratio.values < 0] = 0.0
-    ratio.name = "FeO/(FeO+Fe2O3)"
-    return ratio
+        intercept, a, b = _LeMaitreOxRatioCoefficients["plutonic"]
+    TAS_input = _TAS_coordinates(df)
+    ratio = (
+        intercept
+        + a * np.nan_to_num(TAS_input["SiO2"].values)
+        + b * TAS_input["Na2O + K2O"].values
+    )
+    return pd.Series(np.maximum(ratio, 0.0), index=df.index, name="FeO/(FeO+Fe2O3)")
 
 
 def Middlemost_Fe_correction(df):
@@ -381,7 +544,8 @@ def Middlemost_Fe_correction(df):
     """
     mass_ratios = MiddlemostOxRatio(df)  # mass ratios
     # note, the Fe2O3/FeO ratio instead of e.g. Fe2O3/(FeO + Fe2O3)
-    mole_ratios = mass_ratios / (pt.formula("Fe2O3").mass / pt.formula("FeO").mass)
+    mass_Fe2O3, mass_FeO = get_formula_masses(["Fe2O3", "FeO"])
+    mole_ratios = mass_ratios / (mass_Fe2O3 / mass_FeO)
     mole_ratios = mole_ratios * 2  # pyrolite's to_molecular uses moles Fe, not Fe2O3
     Fe2O3_mole_fraction = mole_ratios / (mole_ratios + 1)
     FeO_mole_fraction = 1 - Fe2O3_mole_fraction
@@ -419,8 +583,9 @@ def LeMaitre_Fe_correction(df, mode="volcanic"):
     """
     mass_ratios = LeMaitreOxRatio(df, mode=mode)  # mass ratios
     # convert mass ratios to mole (Fe) ratios - moles per unit mass for each
-    feo_moles = mass_ratios / pt.formula("FeO").mass
-    fe2O3_moles = (1 - mass_ratios) / pt.formula("Fe2O3").mass * 2
+    mass_FeO, mass_Fe2O3 = get_formula_masses(["FeO", "Fe2O3"])
+    feo_moles = mass_ratios / mass_FeO
+    fe2O3_moles = (1 - mass_ratios) / mass_Fe2O3 * 2
     Fe_mole_ratios = feo_moles / (feo_moles + fe2O3_moles)
 
     to = {"FeO": Fe_mole_ratios, "Fe2O3": 1 - Fe_mole_ratios}
@@ -430,68 +595,453 @@ def LeMaitre_Fe_correction(df, mode="volcanic"):
     ).pyrochem.convert_chemistry(to=[to])
 
 
-def _update_molecular_masses(mineral_dict, corrected_mass_df):
-    """
-    Update a dictionary of mineral molecular masses based on their oxide
-    components. Note that this modifies in place and has no return value.
+# components aggregated to major oxides in the CIPW norm, along with minor oxides
+# which substitute for them
+_CIPW_AGGREGATES = {
+    "FeO": ["MnO", "NiO", "CoO", "FeO"],
+    "CaO": ["BaO", "SrO", "CaO"],
+    "K2O": ["Rb2O", "Cs2O", "K2O"],
+    "Na2O": ["Li2O", "Na2O"],
+    "Cr2O3": ["V2O3", "Cr2O3"],
+}
 
-    Parameters
-    ----------
-    mineral_dict : :class:`dict`
-        Dictionary of minerals containing compositions and molecular masses.
-    corrected_mass_df : :class:`dict`
-        Dataframe containing columns which include corrected molecular masses
-        for specific oxide components.
-    """
-    for mineral, data in mineral_dict.items():
-        composition = data["formulae"]
-        masses = 0.0
-        for oxide in composition.split():
-            count = re.findall(r"(?<![a-zA-Z:])[-+]?\d*\.?\d+", oxide)
-            normalised_oxide_name = re.findall(r"[a-zA-Z\d]+", oxide)[0]
-
-            if len(count) > 0:
-                count = float(count[0])
-            else:
-                count = 1
-
-            if normalised_oxide_name in corrected_mass_df:
-                mass = count * corrected_mass_df[normalised_oxide_name]
-            else:
-                # get the components which don't have adjusted molecular weights
-                mass = pt.formula(normalised_oxide_name).mass * count
-            masses += mass
-        data["mass"] = masses
-
-
-def _aggregate_components(df, to_component, from_components, corrected_mass):
+# molecular masses of components used in the CIPW norm
+_CIPW_MASSES = {
+    c: get_formula_properties(c).mass
+    for c in sum(_CIPW_AGGREGATES.values(), [])
+    + ["SiO2", "TiO2", "Al2O3", "Fe2O3", "MgO", "P2O5", "F", "Cl", "S", "SO3"]
+    + ["CO2", "ZrO2", "O"]
+}
+
+# normative mineral masses as a function of corrected oxide masses, given as
+# {corrected component: stoichiometry} and the mass of the remainder of the formula
+_CIPW_CORRECTED_MASSES = {
+    "Fe-Hy": ({"FeO": 1}, get_formula_properties("SiO2").mass),
+    "Fe-Ol": ({"FeO": 2}, get_formula_properties("SiO2").mass),
+    "Mt": ({"FeO": 1}, get_formula_properties("Fe2O3").mass),
+    "Il": ({"FeO": 1}, get_formula_properties("TiO2").mass),
+    "An": ({"CaO": 1}, get_formula_properties("Al2O3 (SiO2)2").mass),
+    "Mg-Di": ({"CaO": 1}, get_formula_properties("MgO (SiO2)2").mass),
+    "Wo": ({"CaO": 1}, get_formula_properties("SiO2").mass),
+    "Cs": ({"CaO": 2}, get_formula_properties("SiO2").mass),
+    "Tn": ({"CaO": 1}, get_formula_properties("TiO2 SiO2").mass),
+    "Pf": ({"CaO": 1}, get_formula_properties("TiO2").mass),
+    "CaF2-Ap": (
+        {"CaO": 3, "Ca": 1 / 3},
+        (2 / 3) * pt.F.mass + get_formula_properties("P2O5").mass,
+    ),
+    "Ap": ({"CaO": 10 / 3}, get_formula_properties("P2O5").mass),
+    "Cc": ({"CaO": 1}, get_formula_properties("CO2").mass),
+    "Ab": ({"Na2O": 1}, get_formula_properties("Al2O3 (SiO2)6").mass),
+    "Ne": ({"Na2O": 1}, get_formula_properties("Al2O3 (SiO2)2").mass),
+    "Th": ({"Na2O": 1}, get_formula_properties("SO3").mass),
+    "Nc": ({"Na2O": 1}, get_formula_properties("CO2").mass),
+    "Ac": ({"Na2O": 1}, get_formula_properties("Fe2O3 (SiO2)4").mass),
+    "Ns": ({"Na2O": 1}, get_formula_properties("SiO2").mass),
+    "Or": ({"K2O": 1}, get_formula_properties("Al2O3 (SiO2)6").mass),
+    "Lc": ({"K2O": 1}, get_formula_properties("Al2O3 (SiO2)4").mass),
+    "Kp": ({"K2O": 1}, get_formula_properties("Al2O3 (SiO2)2").mass),
+    "Ks": ({"K2O": 1}, get_formula_properties("SiO2").mass),
+    "Fe-Di": ({"FeO": 1, "CaO": 1}, get_formula_properties("(SiO2)2").mass),
+    "Cm": ({"FeO": 1, "Cr2O3": 1}, 0.0),
+    "Hl": ({"Na": 1}, get_formula_properties("Cl").mass),
+    "Fr": ({"Ca": 1}, get_formula_properties("F2").mass),
+    "Pr": ({"Fe": 1}, get_formula_properties("S2").mass),
+}
+
+# molecular components used as inputs to the CIPW norm allocation
+_CIPW_INPUTS = (
+    ["SiO2", "TiO2", "Al2O3", "Fe2O3", "FeO", "MnO", "MgO", "CaO", "Na2O", "K2O"]
+    + ["P2O5", "F", "Cl", "S", "CO2", "NiO", "CoO", "SrO", "BaO", "Rb2O", "Cs2O"]
+    + ["Li2O", "ZrO2", "Cr2O3", "V2O3", "SO3"]
+)
+
+# free components output from the CIPW norm allocation
+_CIPW_FREE = ["FREE_O", "FREE_CO2", "FREE_OXIDES", "FREE_DEFSIO2"]
+
+# intermediate variables used within the CIPW norm allocation
+_CIPW_VARIABLES = (
+    _CIPW_INPUTS
+    + ["n_{}_corr".format(c) for c in _CIPW_AGGREGATES]
+    + ["x_{}".format(c) for c in sum(_CIPW_AGGREGATES.values(), [])]
+    + ["MW_{}_corr".format(c) for c in _CIPW_AGGREGATES]
+    + ["MW_Ca_corr", "MW_Na_corr", "MW_Fe_corr"]
+    + ["mass_{}".format(m) for m in NORM_MINERALS]
+    + ["wt_{}".format(m) for m in NORM_MINERALS]
+    + list(NORM_MINERALS)
+    + ["Y", "CaO_", "P2O5_", "ap_option", "CaO-Ap", "FREE_P2O5", "FREEO_12b"]
+    + ["FREEO_12c", "FREEO_13", "FREE_F", "Na2O_", "FREE_Cl", "FREEO_14"]
+    + ["FREE_SO3", "FeO_", "FREE_S", "FREEO_16", "FREECO2", "FREE_CR2O3", "TiO2_"]
+    + ["Or_p", "Al2O3_", "K2O_", "Ab_p", "Fe2O3_", "Tn_p", "MgFe_O", "MgO_ratio"]
+    + ["FeO_ratio", "Di_p", "MgFe_O_", "Hy_p", "Wo_p", "D", "Ol_", "D1", "Pf_"]
+    + ["D2", "Ne_", "D3", "D4", "D5", "Cs_", "Di_", "D6", "Lc_", "DEFSIO2"]
+    + _CIPW_FREE
+)
+
+
+def _CIPW_allocate(X, index):
     """
-    Aggregate minor components into major oxides and cacluate associated
-    minor component fractions and a corrected molecular weight for the major
-    oxide component. Note that this modifies in place and has no return value.
+    Allocate molecular abundances of components to normative minerals following the
+    CIPW norm of Verma et al. (2003). Note that this modifies the array in place and
+    has no return value.
 
     Parameters
     ----------
-    df : :class:`pandas.DataFrame`
-        Dataframe to aggregate molar components from.
-    to_component : :class:`str`
-        Major oxide component to aggreagte to.
-    from_components : :class:`list`
-        Minor oxide components to aggregate from.
-    corrected_mass : :class:`pandas.DataFrame`
-        Dataframe to put corrected masses.
+    X : :class:`numpy.ndarray`
+        Working array of shape (n_samples, n_variables) with molecular abundances of
+        the :data:`_CIPW_INPUTS` components, within which the intermediate variables
+        and outputs are calculated.
+    index : :class:`dict`
+        Dictionary mapping variable names to column indexes of `X`.
+
+    Notes
+    -----
+    Outputs are the mineral mass abundances (:code:`wt_<mineral>`) and the free
+    components (:data:`_CIPW_FREE`).
     """
-    target = "n_{}_corr".format(to_component)
-    # ensure the main component is included..
-    from_components = list(set([to_component] + from_components))
-    n_components = ["{}".format(f) for f in from_components]
-    x_components = ["x_{}".format(f) for f in from_components]
-    df[target] = df[n_components].sum(axis=1)
-    logger.debug("Aggregating {} to {}.".format(",".join(n_components), target))
-    df[x_components] = df[n_components].div(df[target], axis=0)
-    corrected_mass[to_component] = df[x_components] @ np.array(
-        [pt.formula(f.replace("n_", "")).mass for f in from_components]
+    v = {k: X[:, ix] for k, ix in index.items()}  # views of the working array
+
+    ############################################################################
+    # Combine minor components, compute minor component fractions and correct masses
+    ############################################################################
+    for major, components in _CIPW_AGGREGATES.items():
+        target = "n_{}_corr".format(major)
+        v[target][:] = np.nansum([v[c] for c in components], axis=0)
+        for c in components:
+            v["x_{}".format(c)][:] = v[c] / v[target]
+        v["MW_{}_corr".format(major)][:] = np.sum(
+            [v["x_{}".format(c)] * _CIPW_MASSES[c] for c in components], axis=0
+        )
+        v[major][:] = v[target]
+
+    # Corrected molecular weight of Ca, Na and Fe
+    v["MW_Ca_corr"][:] = v["MW_CaO_corr"] - _CIPW_MASSES["O"]
+    v["MW_Na_corr"][:] = (v["MW_Na2O_corr"] - _CIPW_MASSES["O"]) / 2
+    v["MW_Fe_corr"][:] = v["MW_FeO_corr"] - _CIPW_MASSES["O"]
+
+    for mineral, data in NORM_MINERALS.items():
+        if mineral in _CIPW_CORRECTED_MASSES:
+            corrected, remainder = _CIPW_CORRECTED_MASSES[mineral]
+            v["mass_" + mineral][:] = remainder
+            for c, count in corrected.items():
+                v["mass_" + mineral] += count * v["MW_{}_corr".format(c)]
+        else:
+            v["mass_" + mineral][:] = data["mass"]
+
+    ############################################################################
+    # Calculate normative components
+    ############################################################################
+    # Normative Zircon
+    v["Z"][:] = v["ZrO2"]
+    v["Y"][:] = v["Z"]
+
+    # Normative apatite
+    v["Ap"][:] = np.where(
+        v["CaO"] >= (3 + 1 / 3) * v["P2O5"], v["P2O5"], v["CaO"] / (3 + 1 / 3)
+    )
+    v["CaO_"][:] = np.where(
+        v["CaO"] >= (3 + 1 / 3) * v["P2O5"], v["CaO"] - (3 + 1 / 3) * v["Ap"], 0
+    )
+    v["P2O5_"][:] = np.where(v["CaO"] < (3 + 1 / 3) * v["P2O5"], v["P2O5"] - v["Ap"], 0)
+    v["CaO"][:] = v["CaO_"]
+
+    # apatite options where F in present
+    v["ap_option"][:] = np.where(v["F"] > 0, 3, 1)
+    v["ap_option"][:] = np.where(v["F"] >= ((2 / 3) * v["Ap"]), 2, v["ap_option"])
+    v["F"][:] = np.where(v["ap_option"] == 2, v["F"] - (2 / 3 * v["Ap"]), v["F"])
+    v["CaF2-Ap"][:] = np.where(v["ap_option"] == 3, v["F"] * 1.5, 0)
+    v["CaO-Ap"][:] = np.where(v["ap_option"] == 3, v["P2O5"] - (1.5 * v["F"]), 0)
+    v["Ap"][:] = np.where(v["ap_option"] == 3, v["CaF2-Ap"] + v["CaO-Ap"], v["Ap"])
+    v["F"][:] = np.where(v["ap_option"] == 3, 0, v["F"])
+
+    v["FREE_P2O5"][:] = v["P2O5_"]
+    v["FREEO_12b"][:] = np.where(v["ap_option"] == 2, 1 / 3 * v["Ap"], 0)
+    v["FREEO_12c"][:] = np.where(v["ap_option"] == 3, v["F"] / 2, 0)
+
+    # Normative Fluorite
+    fltr = v["CaO"] >= v["F"] / 2
+    v["Fr"][:] = np.where(fltr, v["F"] / 2, v["CaO"])
+    v["CaO_"][:] = np.where(fltr, v["CaO"] - v["Fr"], 0)
+    v["F"][:] = np.where(fltr, 0, v["F"] - (2 * v["Fr"]))
+    v["CaO"][:] = v["CaO_"]
+
+    v["FREEO_13"][:] = v["Fr"]
+    v["FREE_F"][:] = v["F"]
+
+    # Normative halite
+    fltr = v["Na2O"] >= (2 * v["Cl"])
+    v["Hl"][:] = np.where(fltr, v["Cl"], v["Na2O"] / 2)
+    v["Na2O_"][:] = np.where(fltr, v["Na2O"] - v["Hl"] / 2, 0)
+    v["Cl"][:] = np.where(fltr, 0, v["Cl"] - v["Hl"])
+    v["Na2O"][:] = v["Na2O_"]
+
+    v["FREE_Cl"][:] = v["Cl"]
+    v["FREEO_14"][:] = v["Hl"] / 2
+
+    # Normative thenardite
+    fltr = v["Na2O"] >= v["SO3"]
+    v["Th"][:] = np.where(fltr, v["SO3"], v["Na2O"])
+    v["Na2O_"][:] = np.where(fltr, v["Na2O"] - v["Th"], 0)
+    v["SO3"][:] = np.where(fltr, 0, v["SO3"] - v["Th"])
+    v["Na2O"][:] = v["Na2O_"]
+
+    v["FREE_SO3"][:] = v["SO3"]
+
+    # Normative Pyrite
+    fltr = v["FeO"] >= 2 * v["S"]
+    v["Pr"][:] = np.where(fltr, v["S"] / 2, v["FeO"])
+    v["FeO_"][:] = np.where(fltr, v["FeO"] - v["Pr"], 0)
+    v["S"][:] = np.where(fltr, 0, v["S"] - 2 * v["Pr"])
+    v["FeO"][:] = v["FeO_"]
+
+    v["FREE_S"][:] = v["S"]
+    v["FREEO_16"][:] = v["Pr"]
+
+    # Normative sodium carbonate (cancrinite) or calcite
+    fltr = v["Na2O"] >= v["CO2"]
+    v["Nc"][:] = np.where(fltr, v["CO2"], v["Na2O"])
+    v["Na2O_"][:] = np.where(fltr, v["Na2O"] - v["Nc"], 0)
+    v["CO2"][:] = np.where(fltr, 0, v["CO2"] - v["Nc"])
+    v["Na2O"][:] = v["Na2O_"]
+
+    fltr = v["CaO"] >= v["CO2"]
+    v["Cc"][:] = np.where(fltr, v["CO2"], v["CaO"])
+    v["CaO_"][:] = np.where(fltr, v["CaO"] - v["Cc"], 0)
+    v["CO2"][:] = np.where(fltr, 0, v["CO2"] - v["Cc"])
+    v["CaO"][:] = v["CaO_"]
+
+    v["FREECO2"][:] = v["CO2"]
+
+    # Normative Chromite
+    fltr = v["FeO"] >= v["Cr2O3"]
+    v["Cm"][:] = np.where(fltr, v["Cr2O3"], v["FeO"])
+    v["FeO_"][:] = np.where(fltr, v["FeO"] - v["Cm"], 0)
+    v["Cr2O3"][:] = np.where(fltr, v["Cr2O3"] - v["Cm"], v["Cr2O3"])
+    v["FeO"][:] = v["FeO_"]
+
+    v["FREE_CR2O3"][:] = v["Cr2O3"]
+
+    # Normative Ilmenite
+    fltr = v["FeO"] >= v["TiO2"]
+    v["Il"][:] = np.where(fltr, v["TiO2"], v["FeO"])
+    v["FeO_"][:] = np.where(fltr, v["FeO"] - v["Il"], 0)
+    v["TiO2_"][:] = np.where(fltr, 0, v["TiO2"] - v["Il"])
+    v["FeO"][:] = v["FeO_"]
+    v["TiO2"][:] = v["TiO2_"]
+
+    # Normative Orthoclase/potasium metasilicate
+    fltr = v["Al2O3"] >= v["K2O"]
+    v["Or_p"][:] = np.where(fltr, v["K2O"], v["Al2O3"])
+    v["Al2O3_"][:] = np.where(fltr, v["Al2O3"] - v["Or_p"], 0)
+    v["K2O_"][:] = np.where(fltr, 0, v["K2O"] - v["Or_p"])
+    v["Ks"][:] = v["K2O_"]
+    v["Y"][:] = np.where(
+        fltr, v["Y"] + (v["Or_p"] * 6), v["Y"] + (v["Or_p"] * 6 + v["Ks"])
     )
+    v["Al2O3"][:] = v["Al2O3_"]
+    v["K2O"][:] = v["K2O_"]
+
+    # Normative Albite
+    fltr = v["Al2O3"] >= v["Na2O"]
+    v["Ab_p"][:] = np.where(fltr, v["Na2O"], v["Al2O3"])
+    v["Al2O3_"][:] = np.where(fltr, v["Al2O3"] - v["Ab_p"], 0)
+    v["Na2O_"][:] = np.where(fltr, 0, v["Na2O"] - v["Ab_p"])
+    v["Y"] += v["Ab_p"] * 6
+    v["Al2O3"][:] = v["Al2O3_"]
+    v["Na2O"][:] = v["Na2O_"]
+
+    # Normative Acmite / sodium metasilicate
+    fltr = v["Na2O"] >= v["Fe2O3"]
+    v["Ac"][:] = np.where(fltr, v["Fe2O3"], v["Na2O"])
+    v["Na2O_"][:] = np.where(fltr, v["Na2O"] - v["Ac"], 0)
+    v["Fe2O3_"][:] = np.where(fltr, 0, v["Fe2O3"] - v["Ac"])
+    v["Ns"][:] = v["Na2O_"]
+    v["Y"][:] = np.where(fltr, v["Y"] + (4 * v["Ac"] + v["Ns"]), v["Y"] + 4 * v["Ac"])
+    v["Na2O"][:] = v["Na2O_"]
+    v["Fe2O3"][:] = v["Fe2O3_"]
+
+    # Normative Anorthite / Corundum
+    fltr = v["Al2O3"] >= v["CaO"]
+    v["An"][:] = np.where(fltr, v["CaO"], v["Al2O3"])
+    v["Al2O3_"][:] = np.where(fltr, v["Al2O3"] - v["An"], 0)
+    v["CaO_"][:] = np.where(fltr, 0, v["CaO"] - v["An"])
+    v["C"][:] = v["Al2O3_"]
+    v["Al2O3"][:] = v["Al2O3_"]
+    v["CaO"][:] = v["CaO_"]
+    v["Y"] += 2 * v["An"]
+
+    # Normative Sphene / Rutile
+    fltr = v["CaO"] >= v["TiO2"]
+    v["Tn_p"][:] = np.where(fltr, v["TiO2"], v["CaO"])
+    v["CaO_"][:] = np.where(fltr, v["CaO"] - v["Tn_p"], 0)
+    v["TiO2_"][:] = np.where(fltr, 0, v["TiO2"] - v["Tn_p"])
+    v["CaO"][:] = v["CaO_"]
+    v["TiO2"][:] = v["TiO2_"]
+    v["Ru"][:] = v["TiO2"]
+    v["Y"] += v["Tn_p"]
+
+    # Normative Magnetite / Hematite
+    fltr = v["Fe2O3"] >= v["FeO"]
+    v["Mt"][:] = np.where(fltr, v["FeO"], v["Fe2O3"])
+    v["Fe2O3_"][:] = np.where(fltr, v["Fe2O3"] - v["Mt"], 0)
+    v["FeO_"][:] = np.where(fltr, 0, v["FeO"] - v["Mt"])
+    v["Fe2O3"][:] = v["Fe2O3_"]
+    v["FeO"][:] = v["FeO_"]
+
+    # remaining Fe2O3 goes into haematite
+    v["Hm"][:] = v["Fe2O3"]
+
+    # Subdivision of some normative minerals
+    v["MgFe_O"][:] = v["FeO"] + v["MgO"]
+    v["MgO_ratio"][:] = v["MgO"] / v["MgFe_O"]
+    v["FeO_ratio"][:] = v["FeO"] / v["MgFe_O"]
+
+    # Provisional normative diopside, wollastonite / Hypersthene
+    fltr = v["CaO"] >= v["MgFe_O"]
+    v["Di_p"][:] = np.where(fltr, v["MgFe_O"], v["CaO"])
+    v["CaO_"][:] = np.where(fltr, v["CaO"] - v["Di_p"], 0)
+    v["MgFe_O_"][:] = np.where(fltr, 0, v["MgFe_O"] - v["Di_p"])
+    v["Hy_p"][:] = v["MgFe_O_"]
+    v["Wo_p"][:] = np.where(fltr, v["CaO_"], 0)
+    v["Y"][:] = np.where(
+        fltr,
+        v["Y"] + (2 * v["Di_p"] + v["Wo_p"]),
+        v["Y"] + (2 * v["Di_p"] + v["Hy_p"]),
+    )
+    v["CaO"][:] = v["CaO_"]
+    v["MgFe_O"][:] = v["MgFe_O_"]
+
+    # Normative quartz / undersaturated minerals
+    v["Q"][:] = np.where(v["SiO2"] >= v["Y"], v["SiO2"] - v["Y"], 0)
+    v["D"][:] = np.where(v["SiO2"] < v["Y"], v["Y"] - v["SiO2"], 0)
+    deficit = v["D"] > 0
+
+    # Normative Olivine / Hypersthene
+    fltr = v["D"] < v["Hy_p"] / 2
+    v["Ol_"][:] = np.where(fltr, v["D"], v["Hy_p"] / 2)
+    v["Hy"][:] = np.where(fltr, v["Hy_p"] - 2 * v["D"], 0)
+    v["D1"][:] = v["D"] - (v["Hy_p"] / 2)
+    v["Ol"][:] = np.where(deficit, v["Ol_"], 0)
+    v["Hy"][:] = np.where(deficit, v["Hy"], v["Hy_p"])
+    deficit = v["D1"] > 0
+
+    # Normative Sphene / Perovskite
+    fltr = v["D1"] < v["Tn_p"]
+    v["Tn"][:] = np.where(fltr, v["Tn_p"] - v["D1"], 0)
+    v["Pf_"][:] = np.where(fltr, v["D1"], v["Tn_p"])
+    v["D2"][:] = v["D1"] - v["Tn_p"]
+    v["Tn"][:] = np.where(deficit, v["Tn"], v["Tn_p"])
+    v["Pf"][:] = np.where(deficit, v["Pf_"], 0)
+    deficit = v["D2"] > 0
+
+    # Normative Nepheline / Albite
+    fltr = v["D2"] < 4 * v["Ab_p"]
+    v["Ne_"][:] = np.where(fltr, v["D2"] / 4, v["Ab_p"])
+    v["Ab"][:] = np.where(fltr, v["Ab_p"] - v["D2"] / 4, 0)
+    v["D3"][:] = v["D2"] - 4 * v["Ab_p"]
+    v["Ne"][:] = np.where(deficit, v["Ne_"], 0)
+    v["Ab"][:] = np.where(deficit, v["Ab"], v["Ab_p"])
+    deficit = v["D3"] > 0
+
+    # Normative Leucite / Orthoclase
+    fltr = v["D3"] < 2 * v["Or_p"]
+    v["Lc"][:] = np.where(fltr, v["D3"] / 2, v["Or_p"])
+    v["Or"][:] = np.where(fltr, v["Or_p"] - v["D3"] / 2, 0)
+    v["D4"][:] = v["D3"] - 2 * v["Or_p"]
+    v["Lc"][:] = np.where(deficit, v["Lc"], 0)
+    v["Or"][:] = np.where(deficit, v["Or"], v["Or_p"])
+    deficit = v["D4"] > 0
+
+    # Normative dicalcium silicate / wollastonite
+    fltr = v["D4"] < v["Wo_p"] / 2
+    v["Cs"][:] = np.where(fltr, v["D4"], v["Wo_p"] / 2)
+    v["Wo"][:] = np.where(fltr, v["Wo_p"] - 2 * v["D4"], 0)
+    v["D5"][:] = v["D4"] - v["Wo_p"] / 2
+    v["Cs"][:] = np.where(deficit, v["Cs"], 0)
+    v["Wo"][:] = np.where(deficit, v["Wo"], v["Wo_p"])
+    deficit = v["D5"] > 0
+
+    # Normative dicalcium silicate / Olivine Adjustment
+    fltr = v["D5"] < v["Di_p"]
+    v["Cs_"][:] = np.where(fltr, v["D5"] / 2 + v["Cs"], v["Di_p"] / 2 + v["Cs"])
+    v["Ol_"][:] = np.where(fltr, v["D5"] / 2 + v["Ol"], v["Di_p"] / 2 + v["Ol"])
+    v["Di_"][:] = np.where(fltr, v["Di_p"] - v["D5"], 0)
+    v["D6"][:] = v["D5"] - v["Di_p"]
+    v["Cs"][:] = np.where(deficit, v["Cs_"], v["Cs"])
+    v["Ol"][:] = np.where(deficit, v["Ol_"], v["Ol"])
+    v["Di"][:] = np.where(deficit, v["Di_"], v["Di_p"])
+    deficit = v["D6"] > 0
+
+    # Normative Kaliophilite / Leucite
+    fltr = v["Lc"] >= v["D6"] / 2
+    v["Kp"][:] = np.where(fltr, v["D6"] / 2, v["Lc"])
+    v["Lc_"][:] = np.where(fltr, v["Lc"] - v["D6"] / 2, 0)
+    v["Kp"][:] = np.where(deficit, v["Kp"], 0)
+    v["Lc"][:] = np.where(deficit, v["Lc_"], v["Lc"])
+    v["DEFSIO2"][:] = np.where(
+        (v["Lc"] < v["D6"] / 2) & deficit, v["D6"] - 2 * v["Kp"], 0
+    )
+    ############################################################################
+    # Allocate definite mineral proportions
+    # Subdivide Hypersthene, Diopside and Olivine into Mg- and Fe- varieties
+    # TODO: Add option for subdivision?
+    for m in ["Hy", "Di", "Ol"]:
+        v["Fe-" + m][:] = v[m] * v["FeO_ratio"]
+        v["Mg-" + m][:] = v[m] * v["MgO_ratio"]
+
+    ############################################################################
+    # calculate free component molecular abundances
+    ############################################################################
+    O_mass = _CIPW_MASSES["O"]
+    v["FREE_O"][:] = np.nansum(
+        [
+            (1 + ((0.1) * ((v["mass_CaF2-Ap"] / 328.86918) - 1)))
+            * O_mass
+            * v["FREEO_12b"],
+            (
+                1
+                + (
+                    (0.1)
+                    * (v["CaF2-Ap"] / v["Ap"])
+                    * ((v["mass_CaF2-Ap"] / 328.86918) - 1)
+                )
+            )
+            * O_mass
+            * v["FREEO_12c"],
+            (1 + ((_CIPW_MASSES["CaO"] / 56.0774) - 1)) * O_mass * v["FREEO_13"],
+            (1 + (0.5 * ((_CIPW_MASSES["Na2O"] / 61.9789) - 1)))
+            * O_mass
+            * v["FREEO_14"],
+            (1 + ((_CIPW_MASSES["FeO"] / 71.8444) - 1)) * O_mass * v["FREEO_16"],
+        ],
+        axis=0,
+    )
+
+    ############################################################################
+    # get masses of free components
+    ############################################################################
+    v["FREE_CO2"][:] = v["FREECO2"] * _CIPW_MASSES["CO2"]
+    v["FREE_OXIDES"][:] = np.nansum(
+        [
+            v["FREE_P2O5"] * _CIPW_MASSES["P2O5"],
+            v["FREE_F"] * _CIPW_MASSES["F"],
+            v["FREE_Cl"] * _CIPW_MASSES["Cl"],
+            v["FREE_SO3"] * _CIPW_MASSES["SO3"],
+            v["FREE_S"] * _CIPW_MASSES["S"],
+            v["FREE_CR2O3"] * _CIPW_MASSES["Cr2O3"],
+        ],
+        axis=0,
+    )
+    v["FREE_DEFSIO2"][:] = v["DEFSIO2"] * _CIPW_MASSES["SiO2"]
+
+    ############################################################################
+    # populate tables of molecular proportions and masses
+    ############################################################################
+    for mineral in NORM_MINERALS:
+        v["wt_" + mineral][:] = v[mineral] * v["mass_" + mineral]
+
+    for m in ["Ol", "Di", "Hy"]:
+        v["wt_" + m][:] = np.nansum([v["wt_Fe-" + m], v["wt_Mg-" + m]], axis=0)
 
 
 def CIPW_norm(
@@ -502,6 +1052,7 @@ def CIPW_norm(
     return_adjusted_input=False,
     return_free_components=False,
     rounding=3,
+    chunksize=10000,
 ):
     """
     Standardised calcuation of estimated mineralogy from bulk rock chemistry.
@@ -526,6 +1077,10 @@ def CIPW_norm(
         Whether to return the free components in the output.
     rounding : :class:`int`
         Rounding to be applied to input and output data.
+    chunksize : :class:`int`
+        Number of rows to allocate to normative minerals at a time. This limits the
+        size of the working array used for the calculation; use :code:`None` to
+        process all rows at once.
 
     Returns
     --------
@@ -548,7 +1103,6 @@ def CIPW_norm(
     in ppm.
     """
 
-    minerals = {**NORM_MINERALS}  # copy of NORM_MINERALS
     noncrit = [
         "CO2",
         "SO3",
@@ -692,613 +1246,43 @@ def CIPW_norm(
     # Mole Calculations
     # TODO: update to use df.pyrochem.to_molecular()
     ############################################################################
-    for component in majors + minors_trace:
-        df[component] = df[component] / pt.formula(component).mass
-
-    ############################################################################
-    # Combine minor components, compute minor component fractions and correct masses
-    ############################################################################
-
-    ###########################
-    # Code below does not work
-    ###########################
-
-    # corrected_mass = pd.DataFrame()
-
-    # for major, minors in [
-    #     ("FeO", ["MnO", "NiO", "CoO"]),
-    #     ("CaO", ["SrO", "BaO"]),
-    #     ("K2O", ["Rb2O", "Cs2O"]),
-    #     ("Na2O", ["Li2O"]),
-    #     ("Cr2O3", ["V2O3"]),
-    # ]:
-    #     _aggregate_components(df, major, minors, corrected_mass)
-
-    # # Corrected molecular weight of Ca, Na and Fe
-    # corrected_mass["Ca"] = corrected_mass["CaO"] - pt.O.mass
-    # corrected_mass["Na"] = (corrected_mass["Na2O"] - pt.O.mass) / 2
-    # corrected_mass["Fe"] = corrected_mass["FeO"] - pt.O.mass
-
-    # # Get mineral data, update with corrected masses
-
-    # minerals = {
-    #     k: {**v} for k, v in NORM_MINERALS.items()
-    # }  # copy the dictionary rather than edit it
-
-    # _update_molecular_masses(minerals, corrected_mass)
-
-    # Minor oxide combinations
-
-    df["n_FeO_corr"] = df[["FeO", "MnO", "NiO", "CoO"]].sum(axis=1)
-    df["n_CaO_corr"] = df[["CaO", "SrO", "BaO"]].sum(axis=1)
-    df["n_K2O_corr"] = df[["K2O", "Rb2O", "Cs2O"]].sum(axis=1)
-    df["n_Na2O_corr"] = df[["Na2O", "Li2O"]].sum(axis=1)
-    df["n_Cr2O3_corr"] = df[["Cr2O3", "V2O3"]].sum(axis=1)
-
-    # Corrected oxide molecular weight computations
-
-    df[["x_MnO", "x_FeO"]] = df[["MnO", "FeO"]] / df[["n_FeO_corr"]].values
-    df[["x_NiO", "x_CoO"]] = df[["NiO", "CoO"]] / df[["n_FeO_corr"]].values
-    df[["x_SrO", "x_BaO", "x_CaO"]] = (
-        df[["SrO", "BaO", "CaO"]] / df[["n_CaO_corr"]].values
-    )
-    df[["x_Rb2O", "x_Cs2O", "x_K2O"]] = (
-        df[["Rb2O", "Cs2O", "K2O"]] / df[["n_K2O_corr"]].values
-    )
-    df[["x_Li2O", "x_Na2O"]] = df[["Li2O", "Na2O"]] / df[["n_Na2O_corr"]].values
-    df[["x_V2O3", "x_Cr2O3"]] = df[["V2O3", "Cr2O3"]] / df[["n_Cr2O3_corr"]].values
-
-    df[["FeO", "CaO", "K2O", "Na2O", "Cr2O3"]] = df[
-        ["n_FeO_corr", "n_CaO_corr", "n_K2O_corr", "n_Na2O_corr", "n_Cr2O3_corr"]
-    ].values
-
-    # Corrected normative mineral molecular weight computations
-    def corr_m_wt(oxide):
-        return df["x_" + oxide] * pt.formula(oxide).mass
-
-    df["MW_FeO_corr"] = (
-        corr_m_wt("MnO") + corr_m_wt("NiO") + corr_m_wt("CoO") + corr_m_wt("FeO")
-    )
-    df["MW_CaO_corr"] = corr_m_wt("BaO") + corr_m_wt("SrO") + corr_m_wt("CaO")
-    df["MW_K2O_corr"] = corr_m_wt("Rb2O") + corr_m_wt("Cs2O") + corr_m_wt("K2O")
-    df["MW_Na2O_corr"] = corr_m_wt("Li2O") + corr_m_wt("Na2O")
-    df["MW_Cr2O3_corr"] = corr_m_wt("V2O3") + corr_m_wt("Cr2O3")
-
-    # Corrected molecular weight of Ca, Na and Fe
-    df["MW_Ca_corr"] = df["MW_CaO_corr"] - pt.O.mass
-    df["MW_Na_corr"] = (df["MW_Na2O_corr"] - pt.O.mass) / 2
-    df["MW_Fe_corr"] = df["MW_FeO_corr"] - pt.O.mass
-
-    for m in ["Q", "Z", "C", "Ru", "Hm", "Mg-Ol", "Mg-Hy"]:
-        minerals[m]["mass"] = pt.formula(minerals[m]["formulae"]).mass
-
-    minerals["Fe-Hy"]["mass"] = df["MW_FeO_corr"] + pt.formula("SiO2").mass
-    minerals["Fe-Ol"]["mass"] = (2 * df["MW_FeO_corr"]) + pt.formula("SiO2").mass
-    minerals["Mt"]["mass"] = df["MW_FeO_corr"] + pt.formula("Fe2O3").mass
-    minerals["Il"]["mass"] = df["MW_FeO_corr"] + pt.formula("TiO2").mass
-    minerals["An"]["mass"] = df["MW_CaO_corr"] + pt.formula("Al2O3 (SiO2)2").mass
-    minerals["Mg-Di"]["mass"] = df["MW_CaO_corr"] + pt.formula("MgO (SiO2)2").mass
-    minerals["Wo"]["mass"] = df["MW_CaO_corr"] + pt.formula("SiO2").mass
-    minerals["Cs"]["mass"] = (2 * df["MW_CaO_corr"]) + pt.formula("SiO2").mass
-    minerals["Tn"]["mass"] = df["MW_CaO_corr"] + pt.formula("TiO2 SiO2").mass
-    minerals["Pf"]["mass"] = df["MW_CaO_corr"] + pt.formula("TiO2").mass
-    minerals["CaF2-Ap"]["mass"] = (
-        3 * df["MW_CaO_corr"]
-        + (1 / 3) * df["MW_Ca_corr"]
-        + (2 / 3) * pt.F.mass
-        + pt.formula("P2O5").mass
-    )
-    minerals["Ap"]["mass"] = (10 / 3) * df["MW_CaO_corr"] + pt.formula("P2O5").mass
-    minerals["Cc"]["mass"] = df["MW_CaO_corr"] + pt.formula("CO2").mass
-    minerals["Ab"]["mass"] = df["MW_Na2O_corr"] + pt.formula("Al2O3 (SiO2)6").mass
-    minerals["Ne"]["mass"] = df["MW_Na2O_corr"] + pt.formula("Al2O3 (SiO2)2").mass
-    minerals["Th"]["mass"] = df["MW_Na2O_corr"] + pt.formula("SO3").mass
-    minerals["Nc"]["mass"] = df["MW_Na2O_corr"] + pt.formula("CO2").mass
-    minerals["Ac"]["mass"] = df["MW_Na2O_corr"] + pt.formula("Fe2O3 (SiO2)4").mass
-    minerals["Ns"]["mass"] = df["MW_Na2O_corr"] + pt.formula("SiO2").mass
-    minerals["Or"]["mass"] = df["MW_K2O_corr"] + pt.formula("Al2O3 (SiO2)6").mass
-    minerals["Lc"]["mass"] = df["MW_K2O_corr"] + pt.formula("Al2O3 (SiO2)4").mass
-    minerals["Kp"]["mass"] = df["MW_K2O_corr"] + pt.formula("Al2O3 (SiO2)2").mass
-    minerals["Ks"]["mass"] = df["MW_K2O_corr"] + pt.formula("SiO2").mass
-    minerals["Fe-Di"]["mass"] = (
-        df["MW_FeO_corr"] + df["MW_CaO_corr"] + pt.formula("(SiO2)2").mass
-    )
-    minerals["Cm"]["mass"] = df["MW_FeO_corr"] + df["MW_Cr2O3_corr"]
-    minerals["Hl"]["mass"] = df["MW_Na_corr"] + pt.formula("Cl").mass
-    minerals["Fr"]["mass"] = df["MW_Ca_corr"] + pt.formula("F2").mass
-    minerals["Pr"]["mass"] = df["MW_Fe_corr"] + pt.formula("S2").mass
-
-    df["Y"] = 0
-
-    ############################################################################
-    # Calculate normative components
-    ############################################################################
-    _index = df.index
-    df = {c: df[c] for c in df.columns}
-    # Normative Zircon
-    df["Z"] = df["ZrO2"]
-    df["Y"] = df["Z"]
-
-    # Normative apatite
-
-    df["Ap"] = np.where(
-        df["CaO"] >= (3 + 1 / 3) * df["P2O5"], df["P2O5"], df["CaO"] / (3 + 1 / 3)
-    ).T
-
-    df["CaO_"] = np.where(
-        df["CaO"] >= (3 + 1 / 3) * df["P2O5"], df["CaO"] - (3 + 1 / 3) * df["Ap"], 0
-    ).T
-
-    df["P2O5_"] = np.where(
-        df["CaO"] < (3 + 1 / 3) * df["P2O5"], df["P2O5"] - df["Ap"], 0
-    ).T
-
-    df["CaO"] = df["CaO_"]
-
-    # apatite options where F in present
-
-    df["ap_option"] = np.where(df["F"] > 0, 3, 1).T
-
-    df["ap_option"] = np.where(df["F"] >= ((2 / 3) * df["Ap"]), 2, df["ap_option"]).T
-
-    df["F"] = np.where(df["ap_option"] == 2, df["F"] - (2 / 3 * df["Ap"]), df["F"]).T
-
-    df["CaF2-Ap"] = np.where(df["ap_option"] == 3, df["F"] * 1.5, 0).T
-
-    df["CaO-Ap"] = np.where(df["ap_option"] == 3, df["P2O5"] - (1.5 * df["F"]), 0).T
-
-    df["Ap"] = np.where(
-        df["ap_option"] == 3, df["CaF2-Ap"] + df["CaO-Ap"], df["Ap"].T
-    ).T
-
-    df["F"] = np.where(df["ap_option"] == 3, 0, df["F"]).T
-
-    df["FREE_P2O5"] = df["P2O5_"]
-
-    df["FREEO_12b"] = np.where(df["ap_option"] == 2, 1 / 3 * df["Ap"], 0).T
-    df["FREEO_12c"] = np.where(df["ap_option"] == 3, df["F"] / 2, 0).T
-
-    # Normative Fluorite
-    df["Fr"] = np.where(df["CaO"] >= df["F"] / 2, df["F"] / 2, df["CaO"]).T
-
-    df["CaO_"] = np.where(df["CaO"] >= df["F"] / 2, df["CaO"] - df["Fr"], 0).T
-
-    df["F"] = np.where(df["CaO"] >= df["F"] / 2, 0, df["F"] - (2 * df["Fr"])).T
-
-    df["CaO"] = df["CaO_"]
-    df["FREEO_13"] = df["Fr"]
-    df["FREE_F"] = df["F"]
-
-    # Normative halite
-    df["Hl"] = np.where(df["Na2O"] >= (2 * df["Cl"]), df["Cl"], df["Na2O"] / 2).T
-
-    df["Na2O_"] = np.where(df["Na2O"] >= (2 * df["Cl"]), df["Na2O"] - df["Hl"] / 2, 0).T
-
-    df["Cl"] = np.where(df["Na2O"] >= (2 * df["Cl"]), 0, df["Cl"] - df["Hl"]).T
-
-    df["Na2O"] = df["Na2O_"]
-
-    df["FREE_Cl"] = df["Cl"]
-    df["FREEO_14"] = df["Hl"] / 2
-
-    # Normative thenardite
-    df["Th"] = np.where(df["Na2O"] >= df["SO3"], df["SO3"], df["Na2O"]).T
-
-    df["Na2O_"] = np.where(df["Na2O"] >= df["SO3"], df["Na2O"] - df["Th"], 0).T
-
-    df["SO3"] = np.where(df["Na2O"] >= df["SO3"], 0, df["SO3"] - df["Th"]).T
-
-    df["Na2O"] = df["Na2O_"]
-
-    df["FREE_SO3"] = df["SO3"]
-
-    # Normative Pyrite
-    df["Pr"] = np.where(df["FeO"] >= 2 * df["S"], df["S"] / 2, df["FeO"]).T
-
-    df["FeO_"] = np.where(df["FeO"] >= 2 * df["S"], df["FeO"] - df["Pr"], 0).T
-
-    df["S"] = np.where(df["FeO"] >= 2 * df["S"], 0, df["S"] - 2 * df["Pr"]).T
-
-    df["FeO"] = df["FeO_"]
-
-    df["FREE_S"] = df["S"]
-    df["FREEO_16"] = df["Pr"]
-
-    # Normative sodium carbonate (cancrinite) or calcite
-
-    df["Nc"] = np.where(df["Na2O"] >= df["CO2"], df["CO2"], df["Na2O"]).T
-
-    df["Na2O_"] = np.where(df["Na2O"] >= df["CO2"], df["Na2O"] - df["Nc"], 0).T
-
-    df["CO2"] = np.where(df["Na2O"] >= df["CO2"], 0, df["CO2"] - df["Nc"]).T
-
-    df["Na2O"] = df["Na2O_"]
-
-    df["Cc"] = np.where(df["CaO"] >= df["CO2"], df["CO2"], df["CaO"]).T
-
-    df["CaO_"] = np.where(df["CaO"] >= df["CO2"], df["CaO"] - df["Cc"], 0).T
-
-    df["CO2"] = np.where(df["CaO"] >= df["CO2"], 0, df["CO2"] - df["Cc"]).T
-
-    df["CaO"] = df["CaO_"]
-
-    df["FREECO2"] = df["CO2"]
-
-    # Normative Chromite
-    df["Cm"] = np.where(df["FeO"] >= df["Cr2O3"], df["Cr2O3"], df["FeO"]).T
-
-    df["FeO_"] = np.where(df["FeO"] >= df["Cr2O3"], df["FeO"] - df["Cm"], 0).T
-
-    df["Cr2O3"] = np.where(
-        df["FeO"] >= df["Cr2O3"], df["Cr2O3"] - df["Cm"], df["Cr2O3"]
-    ).T
-
-    df["FeO"] = df["FeO_"]
-
-    df["FREE_CR2O3"] = df["Cr2O3"]
-
-    # Normative Ilmenite
-    df["Il"] = np.where(df["FeO"] >= df["TiO2"], df["TiO2"], df["FeO"]).T
-
-    df["FeO_"] = np.where(df["FeO"] >= df["TiO2"], df["FeO"] - df["Il"], 0).T
-
-    df["TiO2_"] = np.where(df["FeO"] >= df["TiO2"], 0, df["TiO2"] - df["Il"]).T
-
-    df["FeO"] = df["FeO_"]
-
-    df["TiO2"] = df["TiO2_"]
-
-    # Normative Orthoclase/potasium metasilicate
-
-    df["Or_p"] = np.where(df["Al2O3"] >= df["K2O"], df["K2O"], df["Al2O3"]).T
-
-    df["Al2O3_"] = np.where(df["Al2O3"] >= df["K2O"], df["Al2O3"] - df["Or_p"], 0).T
-
-    df["K2O_"] = np.where(df["Al2O3"] >= df["K2O"], 0, df["K2O"] - df["Or_p"]).T
-
-    df["Ks"] = df["K2O_"]
-
-    df["Y"] = np.where(
-        df["Al2O3"] >= df["K2O"],
-        df["Y"] + (df["Or_p"] * 6),
-        df["Y"] + (df["Or_p"] * 6 + df["Ks"]),
-    ).T
-
-    df["Al2O3"] = df["Al2O3_"]
-    df["K2O"] = df["K2O_"]
-
-    # Normative Albite
-    df["Ab_p"] = np.where(df["Al2O3"] >= df["Na2O"], df["Na2O"], df["Al2O3"]).T
-
-    df["Al2O3_"] = np.where(df["Al2O3"] >= df["Na2O"], df["Al2O3"] - df["Ab_p"], 0).T
-
-    df["Na2O_"] = np.where(df["Al2O3"] >= df["Na2O"], 0, df["Na2O"] - df["Ab_p"]).T
-
-    df["Y"] = df["Y"] + (df["Ab_p"] * 6)
-
-    df["Al2O3"] = df["Al2O3_"]
-    df["Na2O"] = df["Na2O_"]
-
-    # Normative Acmite / sodium metasilicate
-    df["Ac"] = np.where(df["Na2O"] >= df["Fe2O3"], df["Fe2O3"], df["Na2O"]).T
+    moles = df[_CIPW_INPUTS].values / np.array([_CIPW_MASSES[c] for c in _CIPW_INPUTS])
 
-    df["Na2O_"] = np.where(df["Na2O"] >= df["Fe2O3"], df["Na2O"] - df["Ac"], 0).T
-
-    df["Fe2O3_"] = np.where(df["Na2O"] >= df["Fe2O3"], 0, df["Fe2O3"] - df["Ac"]).T
-
-    df["Ns"] = df["Na2O_"]
-
-    df["Y"] = np.where(
-        df["Na2O"] >= df["Fe2O3"],
-        df["Y"] + (4 * df["Ac"] + df["Ns"]),
-        df["Y"] + 4 * df["Ac"],
-    ).T
-
-    df["Na2O"] = df["Na2O_"]
-    df["Fe2O3"] = df["Fe2O3_"]
-
-    # Normative Anorthite / Corundum
-    df["An"] = np.where(df["Al2O3"] >= df["CaO"], df["CaO"], df["Al2O3"]).T
-
-    df["Al2O3_"] = np.where(df["Al2O3"] >= df["CaO"], df["Al2O3"] - df["An"], 0).T
-
-    df["CaO_"] = np.where(df["Al2O3"] >= df["CaO"], 0, df["CaO"] - df["An"]).T
-
-    df["C"] = df["Al2O3_"]
-
-    df["Al2O3"] = df["Al2O3_"]
-
-    df["CaO"] = df["CaO_"]
-
-    df["Y"] = df["Y"] + 2 * df["An"]
-
-    # Normative Sphene / Rutile
-    df["Tn_p"] = np.where(df["CaO"] >= df["TiO2"], df["TiO2"], df["CaO"]).T
-
-    df["CaO_"] = np.where(df["CaO"] >= df["TiO2"], df["CaO"] - df["Tn_p"], 0).T
-
-    df["TiO2_"] = np.where(df["CaO"] >= df["TiO2"], 0, df["TiO2"] - df["Tn_p"]).T
-
-    df["CaO"] = df["CaO_"]
-    df["TiO2"] = df["TiO2_"]
-
-    df["Ru"] = df["TiO2"]
-
-    df["Y"] = df["Y"] + df["Tn_p"]
-
-    # Normative Magnetite / Hematite
-    df["Mt"] = np.where(df["Fe2O3"] >= df["FeO"], df["FeO"], df["Fe2O3"]).T
-
-    df["Fe2O3_"] = np.where(df["Fe2O3"] >= df["FeO"], df["Fe2O3"] - df["Mt"], 0).T
-
-    df["FeO_"] = np.where(df["Fe2O3"] >= df["FeO"], 0, df["FeO"] - df["Mt"]).T
-
-    df["Fe2O3"] = df["Fe2O3_"]
-
-    df["FeO"] = df["FeO_"]
-
-    # remaining Fe2O3 goes into haematite
-    df["Hm"] = df["Fe2O3"]
-
-    # Subdivision of some normative minerals
-    df["MgFe_O"] = df["FeO"] + df["MgO"]
-
-    df["MgO_ratio"] = df["MgO"] / df["MgFe_O"]
-    df["FeO_ratio"] = df["FeO"] / df["MgFe_O"]
-
-    # Provisional normative diopside, wollastonite / Hypersthene
-    df["Di_p"] = np.where(df["CaO"] >= df["MgFe_O"], df["MgFe_O"], df["CaO"]).T
-
-    df["CaO_"] = np.where(df["CaO"] >= df["MgFe_O"], df["CaO"] - df["Di_p"], 0).T
-
-    df["MgFe_O_"] = np.where(df["CaO"] >= df["MgFe_O"], 0, df["MgFe_O"] - df["Di_p"]).T
-
-    df["Hy_p"] = df["MgFe_O_"]
-
-    df["Wo_p"] = np.where(df["CaO"] >= df["MgFe_O"], df["CaO_"], 0).T
-
-    df["Y"] = np.where(
-        df["CaO"] >= df["MgFe_O"],
-        df["Y"] + (2 * df["Di_p"] + df["Wo_p"]),
-        df["Y"] + (2 * df["Di_p"] + df["Hy_p"]),
-    ).T
-
-    df["CaO"] = df["CaO_"]
-    df["MgFe_O"] = df["MgFe_O_"]
-
-    # Normative quartz / undersaturated minerals
-    df["Q"] = np.where(df["SiO2"] >= df["Y"], df["SiO2"] - df["Y"], 0).T
-
-    df["D"] = np.where(df["SiO2"] < df["Y"], df["Y"] - df["SiO2"], 0).T
-
-    df["deficit"] = df["D"] > 0
-
-    # Normative Olivine / Hypersthene
-    df["Ol_"] = np.where((df["D"] < df["Hy_p"] / 2), df["D"], df["Hy_p"] / 2).T
-
-    df["Hy"] = np.where((df["D"] < df["Hy_p"] / 2), df["Hy_p"] - 2 * df["D"], 0).T
-
-    df["D1"] = df["D"] - (df["Hy_p"] / 2)
-
-    df["Ol"] = np.where((df["deficit"]), df["Ol_"], 0).T
-
-    df["Hy"] = np.where((df["deficit"]), df["Hy"], df["Hy_p"]).T
-
-    df["deficit"] = df["D1"] > 0
-
-    # Normative Sphene / Perovskite
-    df["Tn"] = np.where((df["D1"] < df["Tn_p"]), df["Tn_p"] - df["D1"], 0).T
-
-    df["Pf_"] = np.where((df["D1"] < df["Tn_p"]), df["D1"], df["Tn_p"]).T
-
-    df["D2"] = df["D1"] - df["Tn_p"]
-
-    df["Tn"] = np.where((df["deficit"]), df["Tn"], df["Tn_p"]).T
-    df["Pf"] = np.where((df["deficit"]), df["Pf_"], 0).T
-
-    df["deficit"] = df["D2"] > 0
-
-    # Normative Nepheline / Albite
-    df["Ne_"] = np.where(df["D2"] < 4 * df["Ab_p"], df["D2"] / 4, df["Ab_p"]).T
-
-    df["Ab"] = np.where(df["D2"] < 4 * df["Ab_p"], df["Ab_p"] - df["D2"] / 4, 0).T
-
-    df["D3"] = df["D2"] - 4 * df["Ab_p"]
-
-    df["Ne"] = np.where((df["deficit"]), df["Ne_"], 0).T
-    df["Ab"] = np.where((df["deficit"]), df["Ab"], df["Ab_p"]).T
-
-    df["deficit"] = df["D3"] > 0
-
-    # Normative Leucite / Orthoclase
-    df["Lc"] = np.where((df["D3"] < 2 * df["Or_p"]), df["D3"] / 2, df["Or_p"]).T
-
-    df["Or"] = np.where((df["D3"] < 2 * df["Or_p"]), df["Or_p"] - df["D3"] / 2, 0).T
-
-    df["D4"] = df["D3"] - 2 * df["Or_p"]
-
-    df["Lc"] = np.where((df["deficit"]), df["Lc"], 0).T
-    df["Or"] = np.where((df["deficit"]), df["Or"], df["Or_p"]).T
-
-    df["deficit"] = df["D4"] > 0
-
-    # Normative dicalcium silicate / wollastonite
-    df["Cs"] = np.where((df["D4"] < df["Wo_p"] / 2), df["D4"], df["Wo_p"] / 2).T
-
-    df["Wo"] = np.where((df["D4"] < df["Wo_p"] / 2), df["Wo_p"] - 2 * df["D4"], 0).T
-
-    df["D5"] = df["D4"] - df["Wo_p"] / 2
-
-    df["Cs"] = np.where((df["deficit"]), df["Cs"], 0).T
-    df["Wo"] = np.where((df["deficit"]), df["Wo"], df["Wo_p"]).T
-
-    df["deficit"] = df["D5"] > 0
-
-    # Normative dicalcium silicate / Olivine Adjustment
-    df["Cs_"] = np.where(
-        (df["D5"] < df["Di_p"]), df["D5"] / 2 + df["Cs"], df["Di_p"] / 2 + df["Cs"]
-    ).T
-
-    df["Ol_"] = np.where(
-        (df["D5"] < df["Di_p"]), df["D5"] / 2 + df["Ol"], df["Di_p"] / 2 + df["Ol"]
-    ).T
-
-    df["Di_"] = np.where((df["D5"] < df["Di_p"]), df["Di_p"] - df["D5"], 0).T
-
-    df["D6"] = df["D5"] - df["Di_p"]
-
-    df["Cs"] = np.where((df["deficit"]), df["Cs_"], df["Cs"]).T
-    df["Ol"] = np.where((df["deficit"]), df["Ol_"], df["Ol"]).T
-    df["Di"] = np.where((df["deficit"]), df["Di_"], df["Di_p"]).T
-
-    df["deficit"] = df["D6"] > 0
-
-    # Normative Kaliophilite / Leucite
-    df["Kp"] = np.where((df["Lc"] >= df["D6"] / 2), df["D6"] / 2, df["Lc"]).T
-
-    df["Lc_"] = np.where((df["Lc"] >= df["D6"] / 2), df["Lc"] - df["D6"] / 2, 0).T
-
-    df["Kp"] = np.where((df["deficit"]), df["Kp"], 0).T
-    df["Lc"] = np.where((df["deficit"]), df["Lc_"], df["Lc"]).T
-
-    df["DEFSIO2"] = np.where(
-        (df["Lc"] < df["D6"] / 2) & (df["deficit"]), df["D6"] - 2 * df["Kp"], 0
-    ).T
     ############################################################################
-    # Allocate definite mineral proportions
-    # Subdivide Hypersthene, Diopside and Olivine into Mg- and Fe- varieties
-    # TODO: Add option for subdivision?
-
-    df["Fe-Hy"] = df["Hy"] * df["FeO_ratio"]
-    df["Fe-Di"] = df["Di"] * df["FeO_ratio"]
-    df["Fe-Ol"] = df["Ol"] * df["FeO_ratio"]
-
-    df["Mg-Hy"] = df["Hy"] * df["MgO_ratio"]
-    df["Mg-Di"] = df["Di"] * df["MgO_ratio"]
-    df["Mg-Ol"] = df["Ol"] * df["MgO_ratio"]
-
-    df = pd.DataFrame(df, index=_index)  # reconstruct df as a dataframe
+    # Allocate normative minerals, working through chunks of rows in a single
+    # preallocated array to limit the size of intermediate arrays
     ############################################################################
-    # calculate free component molecular abundances
-    ############################################################################
-    FREE = pd.DataFrame()
-
-    FREE["FREEO_12b"] = (
-        (1 + ((0.1) * ((minerals["CaF2-Ap"]["mass"] / 328.86918) - 1)))
-        * pt.O.mass
-        * df["FREEO_12b"]
-    )
-    FREE["FREEO_12c"] = (
-        (
-            1
-            + (
-                (0.1)
-                * (df["CaF2-Ap"] / df["Ap"])
-                * ((minerals["CaF2-Ap"]["mass"] / 328.86918) - 1)
-            )
-        )
-        * pt.O.mass
-        * df["FREEO_12c"]
-    )
-
-    FREE["FREEO_13"] = (
-        (1 + ((pt.formula("CaO").mass / 56.0774) - 1)) * pt.O.mass * df["FREEO_13"]
-    )
-
-    FREE["FREEO_14"] = (
-        (1 + (0.5 * ((pt.formula("Na2O").mass / 61.9789) - 1)))
-        * pt.O.mass
-        * df["FREEO_14"]
-    )
-
-    FREE["FREEO_16"] = (
-        (1 + ((pt.formula("FeO").mass / 71.8444) - 1)) * pt.O.mass * df["FREEO_16"]
-    )
-
-    FREE["O"] = FREE[
-        ["FREEO_12b", "FREEO_12c", "FREEO_13", "FREEO_14", "FREEO_16"]
-    ].sum(axis=1)
-
-    FREE.drop(
-        ["FREEO_12b", "FREEO_12c", "FREEO_13", "FREEO_14", "FREEO_16"],
-        axis=1,
-        inplace=True,
-    )
-
-    ############################################################################
-    # get masses of free components
-    ############################################################################
-    FREE["CO2"] = df["FREECO2"] * pt.formula("CO2").mass  # 44.0095
-
-    FREE["P2O5"] = df["FREE_P2O5"] * pt.formula("P2O5").mass  # 141.94452
-    FREE["F"] = df["FREE_F"] * pt.F.mass  # 18.9984032
-    FREE["Cl"] = df["FREE_Cl"] * pt.Cl.mass  # 35.4527
-    FREE["SO3"] = df["FREE_SO3"] * pt.formula("SO3").mass  # 80.0642
-    FREE["S"] = df["FREE_S"] * pt.S.mass  # 32.066
-    FREE["Cr2O3"] = df["FREE_CR2O3"] * pt.formula("Cr2O3").mass  # 151.990
-
-    FREE["OXIDES"] = FREE[["P2O5", "F", "Cl", "SO3", "S", "Cr2O3"]].sum(axis=1)
-
-    FREE["DEFSIO2"] = df["DEFSIO2"] * pt.formula("SiO2").mass  # 60.0843
-    FREE.drop(["P2O5", "F", "Cl", "SO3", "S", "Cr2O3"], axis=1, inplace=True)
-
-    ############################################################################
-    # populate tables of molecular proportions and masses
-    ############################################################################
-    mineral_proportions = pd.DataFrame()
-    mineral_pct_mm = pd.DataFrame()
-
-    for mineral in minerals.keys():
-        if mineral == ["Ap"]:
-            # deal with the results of apatite options
-            # get the abundance weighted total mass of apatite where split
-            # otherwise just get the apatite mass
-            mineral_pct_mm[mineral] = np.where(
-                df["ap_option"] == 1,
-                df[mineral] * minerals["Ap"]["mass"],
-                0,
-            )
-
-            mineral_pct_mm[mineral] = np.where(
-                df["ap_option"] == 2,
-                df[mineral] * minerals["CaF2-Ap"]["mass"],
-                mineral_pct_mm[mineral],
-            )
-
-            mineral_pct_mm[mineral] = np.where(
-                df["ap_option"] == 3,
-                (
-                    (df["CaF2-Ap"] * minerals["CaF2-Ap"]["mass"])
-                    + (df["CaO-Ap"] * minerals["Ap"]["mass"])
-                ),
-                mineral_pct_mm[mineral],
-            )
-
-        else:
-            mineral_proportions[mineral] = df[mineral]  # molar proportions
-            mineral_pct_mm[mineral] = df[mineral] * minerals[mineral]["mass"]
-
-    mineral_pct_mm["Ol"] = mineral_pct_mm[["Fe-Ol", "Mg-Ol"]].sum(axis=1)
-    mineral_pct_mm["Di"] = mineral_pct_mm[["Fe-Di", "Mg-Di"]].sum(axis=1)
-    mineral_pct_mm["Hy"] = mineral_pct_mm[["Fe-Hy", "Mg-Hy"]].sum(axis=1)
-
-    # rename columns with proper names rather than abbreviations
-    mineral_pct_mm.columns = [
-        minerals[mineral]["name"] for mineral in mineral_pct_mm.columns
-    ]
-    mineral_pct_mm.fillna(0, inplace=True)
+    index = {v: ix for ix, v in enumerate(_CIPW_VARIABLES)}
+    inputs = [index[c] for c in _CIPW_INPUTS]
+    wt = [index["wt_" + m] for m in NORM_MINERALS]
+    free = [index[c] for c in _CIPW_FREE]
+
+    nrows = moles.shape[0]
+    chunksize = max(int(chunksize or nrows), 1)
+    X = np.zeros((min(chunksize, nrows), len(_CIPW_VARIABLES)), order="F")
+    output = np.zeros((nrows, len(wt) + len(free)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, nrows, chunksize):
+            stop = min(start + chunksize, nrows)
+            chunk = X[: stop - start]
+            chunk[:, inputs] = moles[start:stop]
+            _CIPW_allocate(chunk, index)
+            output[start:stop, : len(wt)] = chunk[:, wt]
+            output[start:stop, len(wt) :] = chunk[:, free]
+
+    # use proper names rather than abbreviations for the minerals
+    mineral_pct_mm = pd.DataFrame(
+        output[:, : len(wt)],
+        index=df.index,
+        columns=[data["name"] for data in NORM_MINERALS.values()],
+    ).fillna(0)
 
     outputs = [mineral_pct_mm]
     if return_adjusted_input:
         outputs.append(adjusted.drop(columns=["intial_sum", "major_minor_sum"]))
     if return_free_components:
-        # make sure that these column names are distinc
         outputs.append(
-            FREE.rename(
-                columns={
-                    c: "FREE_" + c for c in FREE.columns if "FREE" not in c.upper()
-                }
-            )
+            pd.DataFrame(output[:, len(wt) :], index=df.index, columns=_CIPW_FREE)
         )
 
     return pd.concat(outputs, axis=1).round(rounding)
@@ -3,10 +3,11 @@ from collections import OrderedDict
 import numpy as np
 import pandas as pd
 import periodictable as pt
-import scipy.optimize
 
 from ..util.log import Handle
+from ..util.pd import to_frame
 from .mindb import get_mineral, parse_composition
+from .normative import unmix
 from .sites import MX, OX, TX, Site
 from .transform import recalc_cations
 
@@ -56,6 +57,146 @@ class MineralTemplate(object):
     def copy(self):
         return MineralTemplate(self.name, *self.components)
 
+    def apfu(
+        self,
+        df,
+        ideal_cations=None,
+        ideal_oxygens=None,
+        Fe_species=["FeO", "Fe", "Fe2O3"],
+        oxygen_constrained=False,
+    ):
+        """
+        Recalculate a table of compositions (e.g. microprobe analyses) to atoms per
+        formula unit, based on the ideal numbers of cations and oxygens for the
+        template.
+
+        Parameters
+        ----------
+        df : :class:`pandas.DataFrame`
+            Dataframe of compositions in simple oxides, with a row for each analysis.
+        ideal_cations : :class:`int`
+            Ideal number of cations to use for formulae calcuations, where oxygen is
+            not constrained. Defaults to that of the template.
+        ideal_oxygens : :class:`int`
+            Ideal number of oxygens to use for formulae calcuations, where oxygen is
+            constrained. Defaults to that of the template.
+        Fe_species : :class:`list`
+            List of iron species for identifying redox-defined compositions.
+        oxygen_constrained : :class:`bool`
+            Whether the oxygen is a closed or open system for all compositions.
+
+        Returns
+        -------
+        :class:`pandas.DataFrame`
+            Dataframe of atoms per formula unit for each ion.
+
+        See Also
+        ---------
+        :func:`~pyrolite.mineral.transform.recalc_cations`
+        """
+        apfu = recalc_cations(
+            to_frame(df),
+            ideal_cations=ideal_cations or self.ideal_cations,
+            ideal_oxygens=ideal_oxygens or self.ideal_oxygens,
+            Fe_species=Fe_species,
+            oxygen_constrained=oxygen_constrained,
+        )
+        return to_frame(apfu)
+
+    def calculate_occupancy(self, apfu, error=10e-6, balances=[["Fe{2+}", "Mg{2+}"]]):
+        """
+        Calculate the estimated site occupancy for a table of compositions. Ions will
+        be assigned to sites according to affinities, with all compositions
+        allocated together for each site and ion.
+
+        Parameters
+        -----------
+        apfu : :class:`pandas.DataFrame`
+            Dataframe of atoms per formula unit for each ion (see :meth:`apfu`), with
+            a row for each composition.
+        error : :class:`float`
+            Absolute error for floating point occupancy calculations.
+        balances : :class:`list`
+            List of iterables containing ions to balance across multiple sites. Note
+            that the partitioning will occur after non-balanced cations are assigned,
+            and that ions are only balanced between sites which have defined
+            affinities for all of the particular ions defined in the 'balance'.
+
+        Returns
+        -------
+        :class:`pandas.DataFrame`
+            Dataframe of site occupancy, with columns indexed by site and ion.
+        """
+        apfu = to_frame(apfu)
+        if "O{2-}" not in apfu.columns:  # oxygen from oxide recalculations
+            apfu = apfu.rename(columns={"O": "O{2-}"})
+        ions = list(apfu.columns)
+        sites = list(self.structure)
+        unknown_site_ions = [
+            i for i in ions if not any(i in site.affinities for site in sites)
+        ]
+        if len(unknown_site_ions):
+            logger.warn("Unknown site for: {}".format(unknown_site_ions))
+
+        inventory = apfu.values.astype(float)
+        occupancy, filled = {}, {}
+        for site in sites[::-1]:
+            accepts = [
+                i
+                for i in sorted(site.affinities, key=site.affinities.__getitem__)
+                if i in ions
+            ]
+            capacity = float(self.structure[site])
+            site_balances = [b for b in balances if all([i in accepts for i in b])]
+            direct_assign = [
+                [i] for i in accepts if not any([i in b for b in site_balances])
+            ]
+            site_occupancy = np.zeros((apfu.index.size, len(accepts)))
+            current = np.zeros(apfu.index.size)
+            # directly assigned ions are allocated before balanced groups of ions
+            for group in direct_assign + site_balances:
+                ion_ix = [ions.index(i) for i in group]
+                site_ix = [accepts.index(i) for i in group]
+                invent = inventory[:, ion_ix]
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    fractions = invent / np.nansum(invent, axis=1)[:, np.newaxis]
+                fractions = np.nan_to_num(fractions)  # e.g. where none are present
+                # sites which are full aren't assigned to
+                vacant = ~np.isclose(current, capacity + error)
+                assigning = np.fmin(capacity - current, np.nansum(invent, axis=1))
+                assigning = np.where(
+                    vacant[:, np.newaxis], assigning[:, np.newaxis] * fractions, 0.0
+                )
+                site_occupancy[:, site_ix] += assigning
+                inventory[:, ion_ix] -= assigning
+                current += np.nansum(assigning, axis=1)
+            occupancy[site] = (accepts, site_occupancy)
+            filled[site] = current >= capacity - error
+
+        # check for ions which couldn't be accommodated on filled sites
+        for site in sites:
+            accepts = occupancy[site][0]
+            remaining = inventory[:, [ions.index(i) for i in accepts]] > error
+            limited = filled[site] & remaining.any(axis=1)
+            if limited.any():
+                logger.warn(
+                    "{} capacity encountered for {} of {} compositions: {}".format(
+                        site,
+                        limited.sum(),
+                        limited.size,
+                        [i for i, r in zip(accepts, remaining[limited].T) if r.any()],
+                    )
+                )
+
+        columns = [(site, ion) for site in sites for ion in occupancy[site][0]]
+        return pd.DataFrame(
+            np.hstack([occupancy[site][1] for site in sites]),
+            index=apfu.index,
+            columns=pd.MultiIndex.from_arrays(
+                [[site for site, _ in columns], [ion for _, ion in columns]]
+            ),
+        )
+
     def __repr__(self):
         if self.structure != {}:
             component_string = ", ".join(
@@ -234,7 +375,8 @@ class Mineral(object):
 
         Notes
         -----
-        Currently implmented using optimization based on mass fractions.
+        Currently implmented using non-negative least squares based on mass fractions
+        (see :func:`~pyrolite.mineral.normative.unmix`).
 
         Todo
         -----
@@ -255,22 +397,11 @@ class Mineral(object):
             [c.composition for em, c in potential_components], axis=1, sort=False
         ).fillna(0)
         compositions.columns = [em for em, c in potential_components]
-        weights = np.ones((compositions.columns.size))
-        weights /= weights.sum()
-
         x = compositions.values.T
         y = self.composition.reindex(compositions.index).fillna(0).values
 
-        def mixture(weights, x, y):
-            return weights @ (x - y)
-
-        res = scipy.optimize.least_squares(
-            mixture,
-            weights,
-            bounds=([0.0] * weights.shape[0], [1.0] * weights.shape[0]),
-            args=(x, y),
-        )
-        abundances, cost = res.x, res.cost
+        abundances = unmix(y[np.newaxis, :], x, det_lim=0.0, method="nnls")[0]
+        cost = 0.5 * np.sum((abundances @ x - y) ** 2)
         if cost > det_lim:
             logger.warn("Residuals are higher than detection limits.")
 
@@ -319,82 +450,15 @@ class Mineral(object):
             if composition is None:
                 logger.warn("Composition not set. Cannot calculate occupancy.")
 
-            affinities = pd.DataFrame(
-                [site.affinities for site in self.template.structure]
-            ).T
-            affinities.columns = self.sites
-
-            occupancy = affinities.copy().reindex(composition.index)
-
-            unknown_site_ions = occupancy.loc[
-                occupancy.count(axis=1) == 0, :
-            ].index.values
-
-            if len(unknown_site_ions):
-                logger.warn("Unknown site for: {}".format(unknown_site_ions))
-
-            occupancy.loc[:, :] = 0.0
+            site_occupancy = self.template.calculate_occupancy(
+                composition.to_frame().T, error=error, balances=balances
+            ).iloc[0]
+            occupancy = pd.DataFrame(0.0, index=composition.index, columns=self.sites)
+            for (site, ion), value in site_occupancy.items():
+                occupancy.loc[ion, site] = value
 
             for site in self.sites:
-                site.occupancy = pd.Series(index=occupancy.index, dtype="float").fillna(
-                    0
-                )
-
-            inventory = composition.copy()
-            for site in self.sites[::-1]:
-                accepts = [
-                    i
-                    for i in sorted(site.affinities, key=site.affinities.__getitem__)
-                    if i in inventory.index
-                ]
-                capacity = float(self.template.structure[site])
-                site_balances = [b for b in balances if all([i in accepts for i in b])]
-                direct_assign = [
-                    i for i in accepts if not any([i in b for b in site_balances])
-                ]
-
-                for ion in direct_assign:
-                    current = site.occupancy.sum()
-                    if not np.isclose(current, capacity + error):
-                        assigning = np.nanmin([capacity - current, inventory[ion]])
-                        if not assigning + current - (capacity + error) > 0.0:
-                            logger.debug(
-                                "Assigning {:.3f} {} to Site {}".format(
-                                    assigning, ion, site
-                                )
-                            )
-                            occupancy.loc[ion, site] += assigning
-                            site.occupancy[ion] += occupancy.loc[ion, site]
-                            inventory[ion] -= assigning
-                        else:
-                            logger.warn(
-                                "{} capacity encountered: {} / {}".format(
-                                    site, assigning + current, capacity
-                                )
-                            )
-
-                for group in site_balances:
-                    current = site.occupancy.sum()
-                    invent = inventory.loc[group].sum()
-                    fractions = inventory.loc[group] / inventory.loc[group].sum()
-                    if not np.isclose(current, capacity + error):
-                        assigning = np.nanmin([capacity - current, invent])
-                        if not assigning + current - (capacity + error) > 0.0:
-                            logger.debug(
-                                "Assigning {:.3f} {} to Site {}".format(
-                                    assigning, ion, site
-                                )
-                            )
-                            assigning *= fractions
-                            occupancy.loc[group, site] += assigning
-                            site.occupancy[group] += occupancy.loc[group, site]
-                            inventory.loc[group] -= assigning
-                        else:
-                            logger.warn(
-                                "{} capacity encountered: {} / {}".format(
-                                    site, assigning + current, capacity
-                                )
-                            )
+                site.occupancy = occupancy[site].copy()
 
             # check sums across all sites equal the full composition
             self.template.site_occupancy = occupancy
@@ -1,7 +1,10 @@
+import functools
+
 import numpy as np
 import pandas as pd
 import periodictable as pt
 
+from ..geochem.ind import get_formula, get_formula_masses, get_formula_properties
 from ..util.log import Handle
 from ..util.pd import to_frame
 
@@ -10,7 +13,7 @@ logger = Handle(__name__)
 
 def formula_to_elemental(formula, weight=True):
     """Convert a periodictable.formulas.Formula to elemental composition."""
-    formula = pt.formula(formula)
+    formula = get_formula(formula)
     fmass = formula.mass
     composition = {}
     if weight:
@@ -35,10 +38,50 @@ def merge_formulae(formulas):
     """
     molecule = pt.formula("")
     for f in formulas:
-        molecule += pt.formula(f)
+        molecule += get_formula(f)
     return molecule
 
 
+@functools.lru_cache(maxsize=None)  # cache outputs for speed
+def _cation_schema(components):
+    """
+    Get the ionic stoichiometry of a set of components (simple oxides or elements),
+    with oxygen as the last column.
+
+    Parameters
+    -----------
+    components : :class:`tuple`
+        Components to get the stoichiometry for.
+
+    Returns
+    --------
+    :class:`pandas.DataFrame`
+        Dataframe of ion counts for each component, indexed by component. Note that
+        this is cached, and shouldn't be modified.
+    """
+    parts = [get_formula_properties(c) for c in components]
+    as_oxides = len(parts[0].formula.atoms) > 1
+    schema = []
+    if as_oxides:
+        for p in parts:
+            assert len(p.cations) == 1  # need to be simple oxides
+            other, count = p.cations[0]
+            ion = getattr(pt, other).ion[p.charge]
+            schema.append({str(ion): count, "O": p.oxygen})
+    else:
+        # elemental composition
+        for p in parts:
+            atom = list(p.formula.atoms)[0]
+            schema.append({atom.ion[p.charge]: 1})
+
+    ref = pd.DataFrame(data=schema).fillna(0.0)
+    ref.columns = ref.columns.map(str)
+    ref.index = pd.Index(components)
+    oxygen_index = [i for i in ref.columns if "O" in i][0]
+    cations = [i for i in ref.columns if not i == oxygen_index]
+    return ref.loc[:, cations + [oxygen_index]]
+
+
 def recalc_cations(
     df,
     ideal_cations=4,
@@ -48,76 +91,76 @@ def recalc_cations(
 ):
     """
     Recalculate a composition to a.p.f.u.
+
+    Parameters
+    -----------
+    df : :class:`pandas.Series` | :class:`pandas.DataFrame`
+        Composition, or dataframe of compositions (e.g. a table of microprobe
+        analyses), in simple oxides or elements.
+    ideal_cations : :class:`int`
+        Ideal number of cations to use for formulae calculations, used where oxygen
+        is not constrained.
+    ideal_oxygens : :class:`int`
+        Ideal number of oxygens to use for formulae calculations, used where oxygen
+        is constrained.
+    Fe_species : :class:`list`
+        List of iron species for identifying redox-defined compositions.
+    oxygen_constrained : :class:`bool`
+        Whether the oxygen is a closed or open system for all compositions. If
+        :code:`False`, compositions with multiple iron species defined will be
+        recalculated based on oxygen.
+
+    Returns
+    --------
+    :class:`pandas.Series` | :class:`pandas.DataFrame`
+        Atoms per formula unit for each ion. A dataframe with a row for each
+        composition is returned where multiple compositions are input; a single
+        composition (including a single-row dataframe) returns a series.
+
+    Notes
+    ------
+    The stoichiometry of each of the components is calculated once and cached, and
+    compositions are recalculated together as matrix operations.
     """
     assert ideal_cations is not None or ideal_oxygens is not None
     # if Fe2O3 and FeO are specified, calculate based on oxygen
     moles = to_frame(df)
-    moles = moles.div([pt.formula(c).mass for c in moles.columns])
+    single = moles.index.size == 1
+    moles = moles.div(get_formula_masses(moles.columns))
     moles = moles.where(~np.isclose(moles, 0.0), np.nan)
 
-    # determine whether oxygen is an open or closed system
+    # determine whether oxygen is an open or closed system for each composition
     Fe_species = [i for i in moles if i in Fe_species]  # keep dataframe ordering
-    count_iron_species = len(Fe_species)
-    oxygen_constrained = oxygen_constrained
+    constrained = np.full(moles.index.size, bool(oxygen_constrained))
     if not oxygen_constrained:
-        if count_iron_species > 1:  # check that only one is defined
-            oxygen_constrained = (
-                count_iron_species
-                - pd.isnull(moles.loc[:, Fe_species]).all(axis=1).sum()
-            ) > 1
-
-            if oxygen_constrained:
-                logger.info("Multiple iron species defined. Calculating using oxygen.")
+        if len(Fe_species) > 1:  # check that only one is defined
+            count_iron_species = moles.loc[:, Fe_species].count(axis=1).values
+            constrained = count_iron_species > 1
+            if constrained.any():
+                msg = "Multiple iron species defined for {} of {} compositions."
+                logger.info(
+                    (msg + " Calculating using oxygen.").format(
+                        constrained.sum(), constrained.size
+                    )
+                )
             else:
                 logger.info("Single iron species defined. Calculating using cations.")
 
-    components = moles.columns
-    as_oxides = len(list(pt.formula(components[0]).atoms)) > 1
-    schema = []
-    # if oxygen_constrained:  # need to specifically separate Fe2 and Fe3
-    if as_oxides:
-        parts = [pt.formula(c).atoms for c in components]
-        for p in parts:
-            oxygens = p[pt.O]
-            other_components = [i for i in list(p) if not i == pt.O]
-            assert len(other_components) == 1  # need to be simple oxides
-            other = other_components[0]
-            charge = oxygens * 2 / p[other]
-            ion = other.ion[charge]
-            schema.append({str(ion): p[other], "O": oxygens})
-    else:
-        # elemental composition
-        parts = components
-        for part in parts:
-            p = list(pt.formula(part).atoms)[0]
-            if p.charge != 0:
-                charge = p.charge
-            else:
-                charge = p.default_charge
-            schema.append({p.ion[charge]: 1})
-
-    ref = pd.DataFrame(data=schema)
-    ref.columns = ref.columns.map(str)
-    ref.index = components
-
-    # cation_masses = {c: pt.formula(c).mass for c in ref.columns}
-    oxygen_index = [i for i in ref.columns if "O" in i][0]
-    ref = ref.loc[:, [i for i in ref.columns if not i == oxygen_index] + [oxygen_index]]
-    moles_ref = ref.copy(deep=True)
-    moles_ref.loc[:, :] = (
-        ref.values * moles.T.values
-    )  # this works for series, not for frame
-
-    moles_O = moles_ref[oxygen_index].sum()
-    moles_cations = (
-        moles_ref.loc[:, [i for i in moles_ref.columns if not i == oxygen_index]]
-        .sum()
-        .sum()
+    ref = _cation_schema(tuple(moles.columns))
+    # moles of each ion, with oxygen in the last column
+    moles_ref = np.nan_to_num(moles.values.astype(float)) @ ref.values
+    moles_O = moles_ref[:, -1]
+    moles_cations = moles_ref[:, :-1].sum(axis=1)
+    scale = np.empty(moles.index.size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # where oxygen is unquantified, calculate using cations
+        if (~constrained).any():
+            scale[~constrained] = ideal_cations / moles_cations[~constrained]
+        if constrained.any():
+            scale[constrained] = ideal_oxygens / moles_O[constrained]
+    apfu = pd.DataFrame(
+        moles_ref * scale[:, np.newaxis], index=moles.index, columns=ref.columns
     )
-    if not oxygen_constrained:  # oxygen unquantified, try to calculate using cations
-        scale = ideal_cations / moles_cations
-    else:  # oxygen quantified, try to calculate using oxygen
-        scale = ideal_oxygens / moles_O
-
-    moles_ref *= scale
-    return moles_ref.sum(axis=0)
+    if single:
+        return apfu.iloc[0]
+    return apfu
@@ -175,6 +175,13 @@ class pyroplot(object):
             Whether to log-transform x values before the KDE for bivariate plots.
         logy : :class:`bool`, `False`
             Whether to log-transform y values before the KDE for bivariate plots.
+        kde_method : :class:`str`
+            Method used to evaluate the kernel density estimate at each point; see
+            :func:`~pyrolite.util.distributions.sample_kde`. For large datasets,
+            :code:`"binned"` (the default where there are many points) evaluates the
+            estimate over a grid and interpolates it to each point, while
+            :code:`"tree"` sums kernels truncated at a relative height :code:`tol`
+            over neighbouring points.
 
         {otherparams}
 
@@ -183,6 +190,11 @@ class pyroplot(object):
         :class:`matplotlib.axes.Axes`
             Axes on which the heatmapped scatterplot is added.
 
+        Notes
+        -----
+        Both approximate methods evaluate the estimate after the log (bivariate) or
+        ILR (ternary) transforms used for the exact estimate.
+
         """
         obj = to_frame(self._obj)
         components = _check_components(obj, components=components)
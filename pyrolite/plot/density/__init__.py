@@ -110,6 +110,10 @@ def density(
     `mode="density"`; future updates may allow the use of a histogram
     basis, which would give results closer to 95% data percentiles.
 
+    For large datasets, kernel density estimates are evaluated from data binned to
+    a regular grid; this can be controlled with the :code:`kde_method` keyword
+    argument (see :func:`~pyrolite.util.distributions.sample_kde`).
+
     Todo
     ----
     * Allow generation of contours from histogram data, rather than just
@@ -240,7 +244,12 @@ def density(
             if mode == "hexbin":
                 raise NotImplementedError
             # density, histogram etc parsed here
-            coords, zi, _ = ternary_heatmap(arr, bins=bins, mode=mode)
+            coords, zi, _ = ternary_heatmap(
+                arr,
+                bins=bins,
+                mode=mode,
+                **{k: kwargs[k] for k in ["bw_method", "kde_method"] if k in kwargs},
+            )
 
             if percentiles:  # 98th percentile
                 vmin = percentile_contour_values_from_meshz(zi, [1.0 - vmin])[1][0]
@@ -156,9 +156,29 @@ class DensityGrid(object):
         ytransform=lambda x: x,
         mode="centres",
         bw_method=None,
+        kde_method="auto",
     ):
         """
         Take an x-y array and sample a KDE on the grid.
+
+        Parameters
+        -----------
+        xy : :class:`numpy.ndarray`
+            Array of x-y points to estimate the density from.
+        xtransform, ytransform : :class:`callable`
+            Transforms for the x and y axes, applied before the KDE.
+        mode : :class:`str`
+            Whether to sample the KDE at grid 'centres' or 'edges'.
+        bw_method : :class:`str`, :class:`float`, callable
+            Method used to calculate the estimator bandwidth.
+            See :func:`scipy.stats.gaussian_kde`.
+        kde_method : :class:`str`
+            Method used to evaluate the KDE ('exact', 'binned' or 'auto'). See
+            :func:`~pyrolite.util.distributions.sample_kde`.
+
+        Returns
+        --------
+        :class:`numpy.ndarray`
         """
         arr = xy.copy()
         # generate x grid over range spanned by log(x)
@@ -173,6 +193,7 @@ class DensityGrid(object):
                     np.meshgrid(xtransform(self.grid_xc), ytransform(self.grid_yc))
                 ),
                 bw_method=bw_method,
+                kde_method=kde_method,
             )
             zi = zi.reshape(self.grid_xci.shape)
         elif mode == "edges":
@@ -183,6 +204,7 @@ class DensityGrid(object):
                     np.meshgrid(xtransform(self.grid_xe), ytransform(self.grid_ye))
                 ),
                 bw_method=bw_method,
+                kde_method=kde_method,
             )
             zi = zi.reshape(self.grid_xei.shape)
         else:
@@ -6,6 +6,7 @@ from ...comp.codata import ILR, close, inverse_ILR
 from ...util.distributions import sample_kde
 from ...util.log import Handle
 from ...util.math import flattengrid
+from ...util.meta import subkwargs
 from ...util.plot.grid import bin_centres_to_edges
 
 logger = Handle(__name__)
@@ -47,6 +48,9 @@ def ternary_heatmap(
         Grid coordinates to sample at, if already calculated. For the density mode,
         this is a (nsamples, 2) array. For histograms, this is a two-member list of
         bin edges.
+    kwargs
+        Keyword arguments passed to :func:`~pyrolite.util.distributions.sample_kde`
+        for the density mode (e.g. :code:`bw_method`, :code:`kde_method`).
 
     Returns
     -------
@@ -125,7 +129,7 @@ def ternary_heatmap(
 
     if mode == "density":
         dgrid = grid or flattengrid(tfm_edgegrid)
-        H = sample_kde(tdata, dgrid)
+        H = sample_kde(tdata, dgrid, **subkwargs(kwargs, sample_kde))
         H = H.reshape(tfm_edgegrid[0].shape)
         coords = tern_edge_grid
     elif "hist" in mode:
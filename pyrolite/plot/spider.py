@@ -68,6 +68,9 @@ def spider(
     mode : :class:`str`,  :code:`["plot", "fill", "binkde", "ckde", "kde", "hist"]`
         Mode for plot. Plot will produce a line-scatter diagram. Fill will return
         a filled range. Density will return a conditional density diagram.
+        Keyword arguments for density modes (e.g. :code:`kde_method` and
+        :code:`processes`) are passed to
+        :func:`~pyrolite.util.plot.density.conditional_prob_density`.
     unity_line : :class:`bool`
         Add a line at y=1 for reference.
     scatter_kw : :class:`dict`
@@ -8,6 +8,8 @@ Todo
   gabbroic Pyroxene-Olivine-Plagioclase,
   ultramafic Olivine-Orthopyroxene-Clinopyroxene
 """
+import copy
+import functools
 import json
 
 import matplotlib.lines
@@ -50,6 +52,214 @@ def _read_poly(poly):
     ]
 
 
+def _passthrough(x):
+    """Identity transform for classifiers defined in cartesian coordinates."""
+    return x
+
+
+@functools.lru_cache(maxsize=None)  # cache outputs for speed
+def _read_json_config(src):
+    """Read a classifier configuration file."""
+    with open(src, "r") as f:
+        return json.load(f)
+
+
+def _load_config(src):
+    """
+    Load a classifier configuration, reading each file only once.
+
+    Parameters
+    -----------
+    src : :class:`str` | :class:`pathlib.Path`
+        Path to the JSON configuration file.
+
+    Returns
+    -------
+    :class:`dict`
+        Copy of the configuration, which can be modified safely.
+    """
+    return copy.deepcopy(_read_json_config(str(src)))
+
+
+def _points_in_polygon(points, vertices):
+    """
+    Vectorised crossing-number test for points within a closed polygon, consistent
+    with :meth:`matplotlib.path.Path.contains_points`.
+
+    Parameters
+    -----------
+    points : :class:`numpy.ndarray`
+        Array of shape (n, 2) of points to test.
+    vertices : :class:`numpy.ndarray`
+        Array of shape (m, 2) of polygon vertices.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Boolean array indicating which points are within the polygon.
+    """
+    x, y = points[:, 0], points[:, 1]
+    inside = np.zeros(x.shape, dtype=bool)
+    x0, y0 = vertices[-1]  # close the polygon
+    yflag0 = y0 >= y
+    for x1, y1 in vertices:
+        yflag1 = y1 >= y
+        crossing = yflag0 != yflag1
+        crossing &= ((y1 - y) * (x0 - x1) >= (x1 - x) * (y0 - y1)) == yflag1
+        inside ^= crossing
+        x0, y0, yflag0 = x1, y1, yflag1
+    return inside
+
+
+class _PolygonIndex(object):
+    """
+    Compiled set of polygons with a uniform grid index over their extents.
+
+    Grid cells which are not crossed by any polygon edge are labelled in advance,
+    and points falling in the remaining cells are tested only against the polygons
+    whose extents overlap the cell.
+
+    Parameters
+    -----------
+    polygons : :class:`list`
+        List of arrays of shape (m, 2) of polygon vertices.
+    resolution : :class:`int`
+        Number of grid cells along each axis.
+    """
+
+    def __init__(self, polygons, resolution=128):
+        self.polygons = [np.asarray(p, dtype=float) for p in polygons]
+        self.resolution = resolution
+        if not self.polygons:
+            return
+        lower = np.array([p.min(axis=0) for p in self.polygons])
+        upper = np.array([p.max(axis=0) for p in self.polygons])
+        self.lower, self.upper = lower.min(axis=0), upper.max(axis=0)
+        extent = self.upper - self.lower
+        self.cellsize = np.where(extent > 0, extent, 1.0) / resolution
+        # polygons which could contain points within each grid cell
+        candidates = np.zeros((len(self.polygons), resolution, resolution), dtype=bool)
+        for ix, (lo, hi) in enumerate(zip(self._cell(lower), self._cell(upper))):
+            candidates[ix, lo[0] : hi[0] + 1, lo[1] : hi[1] + 1] = True
+        self.candidates = candidates.reshape(len(self.polygons), -1)
+        # label cells which are not crossed by a polygon edge using their centres,
+        # and flag the remainder (-2) for testing of individual points
+        boundary = self._boundary_cells().ravel()
+        cells = np.indices((resolution, resolution)).reshape(2, -1).T
+        centres = self.lower + (cells + 0.5) * self.cellsize
+        self.labels = np.full(cells.shape[0], -2, dtype=int)
+        self.labels[~boundary] = self._test(
+            centres[~boundary], np.flatnonzero(~boundary)
+        )
+
+    def _cell(self, points):
+        """Get the grid cell indexes for an array of points."""
+        cells = np.floor((points - self.lower) / self.cellsize)
+        return np.clip(cells, 0, self.resolution - 1).astype(int)
+
+    def _boundary_cells(self, tol=1e-6):
+        """
+        Find grid cells which are crossed or touched by any polygon edge, with cells
+        expanded by a small tolerance (as a fraction of the cell size).
+        """
+        res = self.resolution
+        boundary = np.zeros((res, res), dtype=bool)
+        margin = tol * self.cellsize
+        edges = np.arange(res + 1)
+        xs = self.lower[0] + edges * self.cellsize[0]
+        ys = self.lower[1] + edges * self.cellsize[1]
+        for vertices in self.polygons:
+            for a, b in zip(vertices, np.roll(vertices, -1, axis=0)):
+                lo = self._cell(np.minimum(a, b) - margin)
+                hi = self._cell(np.maximum(a, b) + margin) + 1
+                cx0 = xs[lo[0] : hi[0]][:, None] - margin[0]
+                cx1 = xs[lo[0] + 1 : hi[0] + 1][:, None] + margin[0]
+                cy0 = ys[lo[1] : hi[1]][None, :] - margin[1]
+                cy1 = ys[lo[1] + 1 : hi[1] + 1][None, :] + margin[1]
+                # side of the edge on which each cell corner lies
+                sides = np.array(
+                    [
+                        (b[0] - a[0]) * (cy - a[1]) - (b[1] - a[1]) * (cx - a[0])
+                        for cx in (cx0, cx1)
+                        for cy in (cy0, cy1)
+                    ]
+                )
+                crossed = ~((sides > 0).all(axis=0) | (sides < 0).all(axis=0))
+                boundary[lo[0] : hi[0], lo[1] : hi[1]] |= crossed
+        return boundary
+
+    def _test(self, points, cells):
+        """
+        Test points against the candidate polygons for their grid cells, returning
+        the index of the first polygon containing each point (or -1).
+        """
+        candidates = self.candidates[:, cells]
+        found = np.full(points.shape[0], -1, dtype=int)
+        for ix, vertices in enumerate(self.polygons):
+            test = np.flatnonzero(candidates[ix])
+            if test.size:
+                test = test[found[test] < 0]  # keep the first polygon found
+                inside = _points_in_polygon(points[test], vertices)
+                found[test[inside]] = ix
+        return found
+
+    def predict(self, points, chunksize=2**20):
+        """
+        Get the index of the first polygon containing each point.
+
+        Parameters
+        -----------
+        points : :class:`numpy.ndarray`
+            Array of shape (n, 2) of points to classify.
+        chunksize : :class:`int`
+            Number of points to process at a time.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Integer array of polygon indexes, with -1 where points are not found
+            within any polygon.
+        """
+        points = np.asarray(points, dtype=float)
+        out = np.full(points.shape[0], -1, dtype=int)
+        if not self.polygons:
+            return out
+        for start in range(0, points.shape[0], chunksize):
+            chunk = points[start : start + chunksize]
+            with np.errstate(invalid="ignore"):
+                valid = ((chunk >= self.lower) & (chunk <= self.upper)).all(axis=1)
+            rows = np.flatnonzero(valid)  # excludes points outside the grid and nans
+            cells = self._cell(chunk[rows])
+            cells = cells[:, 0] * self.resolution + cells[:, 1]
+            found = self.labels[cells]
+            test = np.flatnonzero(found == -2)
+            found[test] = self._test(chunk[rows[test]], cells[test])
+            out[start + rows] = found
+        return out
+
+
+@functools.lru_cache(maxsize=None)  # cache outputs for speed
+def _compile_polygons(transform, polygons):
+    """
+    Transform and index a set of classifier polygons, such that each model and
+    mode is compiled only once.
+
+    Parameters
+    -----------
+    transform : :class:`callable`
+        Transform from classifier to cartesian coordinates.
+    polygons : :class:`tuple`
+        Tuple of polygons, each a tuple of vertices in classifier coordinates.
+
+    Returns
+    -------
+    :class:`_PolygonIndex`
+    """
+    return _PolygonIndex(
+        [np.asarray(transform(np.array(poly)), dtype=float) for poly in polygons]
+    )
+
+
 class PolygonClassifier(object):
     """
     A classifier model built form a series of polygons defining specific classes.
@@ -97,7 +307,7 @@ class PolygonClassifier(object):
             else:
                 self.transform = transform
         else:
-            self.transform = lambda x: x  # passthrough
+            self.transform = _passthrough
 
         self.name = name
         self.axes = axes or {}
@@ -143,13 +353,6 @@ class PolygonClassifier(object):
             it inherit the index.
         """
         classes = [k for (k, cfg) in self.fields.items() if cfg["poly"]]
-        # transformed polys
-        polys = [
-            matplotlib.patches.Polygon(
-                self.transform(_read_poly(self.fields[k]["poly"])), closed=True
-            )
-            for k in classes
-        ]
         if isinstance(X, pd.DataFrame):
             # check whether the axes names are in the columns
             axes = self.axis_components
@@ -166,15 +369,32 @@ class PolygonClassifier(object):
                 rescale_by = self.default_scale / data_scale
 
         X = self.transform(X) * rescale_by  # transformed X
-        indexes = np.array([p.contains_points(X) for p in polys]).T
-        notfound = np.logical_not(indexes.sum(axis=-1))
-        outlist = list(map(lambda ix: classes[ix], np.argmax(indexes, axis=-1)))
-        out.loc[:] = outlist
-        out.loc[(notfound)] = "none"
+        indexes = self._polygon_index(classes).predict(X)
+        labels = np.array(classes + ["none"], dtype="object")
+        out.loc[:] = labels[indexes]  # index -1 (not found) maps to 'none'
         # for those which are none, we could check if they're on polygon boundaries
         # and assign to the closest centroid (e.g. for boundary points on axes)
         return out
 
+    def _polygon_index(self, classes):
+        """
+        Get the compiled polygon index for a set of classes, which is cached for each
+        classifier model and mode.
+
+        Parameters
+        -----------
+        classes : :class:`list`
+            Classes for which to compile polygons.
+
+        Returns
+        -------
+        :class:`_PolygonIndex`
+        """
+        polygons = tuple(
+            tuple(map(tuple, _read_poly(self.fields[k]["poly"]))) for k in classes
+        )
+        return _compile_polygons(self.transform, polygons)
+
     @property
     def axis_components(self):
         """
@@ -392,8 +612,7 @@ class TAS(PolygonClassifier):
             # fallback to Middlemost
             src = pyrolite_datafolder(subfolder="models") / "TAS" / "config.json"
 
-        with open(src, "r") as f:
-            config = json.load(f)
+        config = _load_config(src)
         kw = dict(scale=100.0, xlim=[30, 90], ylim=[0, 20])
         kw.update(kwargs)
         poly_config = {**config, **kw}
@@ -530,8 +749,7 @@ class USDASoilTexture(PolygonClassifier):
             pyrolite_datafolder(subfolder="models") / "USDASoilTexture" / "config.json"
         )
 
-        with open(src, "r") as f:
-            config = json.load(f)
+        config = _load_config(src)
 
         poly_config = {**config, **kwargs, "transform": "ternary"}
         super().__init__(**poly_config)
@@ -569,8 +787,7 @@ class QAP(PolygonClassifier):
     def __init__(self, **kwargs):
         src = pyrolite_datafolder(subfolder="models") / "QAP" / "config.json"
 
-        with open(src, "r") as f:
-            config = json.load(f)
+        config = _load_config(src)
 
         poly_config = {**config, **kwargs, "transform": "ternary"}
         super().__init__(**poly_config)
@@ -609,8 +826,7 @@ class FeldsparTernary(PolygonClassifier):
             pyrolite_datafolder(subfolder="models") / "FeldsparTernary" / "config.json"
         )
 
-        with open(src, "r") as f:
-            config = json.load(f)
+        config = _load_config(src)
 
         poly_config = {**config, **kwargs, "transform": "ternary"}
         super().__init__(**poly_config)
@@ -671,8 +887,7 @@ class JensenPlot(PolygonClassifier):
     def __init__(self, **kwargs):
         src = pyrolite_datafolder(subfolder="models") / "JensenPlot" / "config.json"
 
-        with open(src, "r") as f:
-            config = json.load(f)
+        config = _load_config(src)
 
         poly_config = {**config, **kwargs, "transform": "ternary"}
         super().__init__(**poly_config)
@@ -700,8 +915,7 @@ class SpinelTrivalentTernary(PolygonClassifier):
             / "config.json"
         )
 
-        with open(src, "r") as f:
-            config = json.load(f)
+        config = _load_config(src)
 
         poly_config = {**config, **kwargs, "transform": "ternary"}
         super().__init__(**poly_config)
@@ -729,8 +943,7 @@ class SpinelFeBivariate(PolygonClassifier):
             / "config.json"
         )
 
-        with open(src, "r") as f:
-            config = json.load(f)
+        config = _load_config(src)
 
         poly_config = {**config, **kwargs}
         super().__init__(**poly_config)
@@ -766,8 +979,7 @@ class Pettijohn(PolygonClassifier):
             / "config_pettijohn.json"
         )
 
-        with open(src, "r") as f:
-            config = json.load(f)
+        config = _load_config(src)
 
         poly_config = {**config, **kwargs}
         super().__init__(**poly_config)
@@ -805,8 +1017,7 @@ class Herron(PolygonClassifier):
             / "config_herron.json"
         )
 
-        with open(src, "r") as f:
-            config = json.load(f)
+        config = _load_config(src)
 
         poly_config = {**config, **kwargs}
         super().__init__(**poly_config)
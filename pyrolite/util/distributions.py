@@ -1,4 +1,6 @@
+import itertools
 from functools import partial
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 import scipy.stats
@@ -9,6 +11,12 @@ from .log import Handle
 
 logger = Handle(__name__)
 
+# above this number of kernel evaluations (data points x sample points), KDEs are
+# estimated on a grid of binned data by default
+_BINNED_KDE_THRESHOLD = 10**8
+# maximum number of bins along each dimension for binned KDE grids
+_BINNED_KDE_MAXBINS = {1: 2**14, 2: 2**10, 3: 2**7}
+
 
 def get_scaler(*fs):
     """
@@ -32,7 +40,143 @@ def get_scaler(*fs):
     return partial(scaler, fs=fs)
 
 
-def sample_kde(data, samples, renorm=False, transform=lambda x: x, bw_method=None):
+def _binned_kde(K, samples, tail=4.0, oversampling=8):
+    """
+    Evaluate a Gaussian kernel density estimate by linearly binning the data to a
+    regular grid, convolving the binned data with the kernel using a fast Fourier
+    transform, and interpolating the resulting grid at the sample points. This
+    scales with the number of data points plus the size of the grid, rather than
+    their product.
+
+    Parameters
+    ------------
+    K : :class:`scipy.stats.gaussian_kde`
+        Kernel density estimate, specifying the data, weights and kernel covariance.
+    samples : :class:`numpy.ndarray`
+        Finite coordinates to sample the KDE estimate at (:code:`npoints, ndim`).
+    tail : :class:`float`
+        Number of kernel standard deviations to extend the grid and kernel by.
+    oversampling : :class:`int`
+        Minimum number of grid bins per kernel standard deviation.
+
+    Returns
+    ----------
+    :class:`numpy.ndarray`
+    """
+    import scipy.interpolate
+    import scipy.signal
+
+    data = K.dataset.T
+    sd = np.sqrt(np.diag(K.covariance))
+    lower = np.minimum(data.min(axis=0), samples.min(axis=0)) - tail * sd
+    upper = np.maximum(data.max(axis=0), samples.max(axis=0)) + tail * sd
+    nbins = np.ceil((upper - lower) / sd * oversampling).astype(int) + 1
+    nbins = np.clip(nbins, 16, _BINNED_KDE_MAXBINS[K.d])
+    step = (upper - lower) / (nbins - 1)
+    # linear binning, distributing the weight of each point across the corners
+    # of the grid cell it falls within
+    position = (data - lower) / step
+    base = np.clip(np.floor(position).astype(int), 0, nbins - 2)
+    frac = position - base
+    binned = np.zeros(np.prod(nbins))
+    for corner in itertools.product([0, 1], repeat=K.d):
+        corner = np.array(corner)
+        weights = np.prod(np.where(corner, frac, 1 - frac), axis=1) * K.weights
+        index = np.ravel_multi_index((base + corner).T, nbins)
+        binned += np.bincount(index, weights=weights, minlength=binned.size)
+    binned = binned.reshape(nbins)
+    # gaussian kernel evaluated at grid offsets out to the tails
+    half = np.minimum(np.ceil(tail * sd / step).astype(int), nbins - 1)
+    offsets = np.meshgrid(
+        *[np.arange(-h, h + 1) * s for h, s in zip(half, step)], indexing="ij"
+    )
+    u = np.stack([o.ravel() for o in offsets])
+    kernel = np.exp(-0.5 * np.sum(u * (np.linalg.inv(K.covariance) @ u), axis=0))
+    kernel /= np.sqrt(np.linalg.det(2 * np.pi * K.covariance))
+    density = scipy.signal.fftconvolve(
+        binned, kernel.reshape(offsets[0].shape), mode="same"
+    )
+    interpolator = scipy.interpolate.RegularGridInterpolator(
+        [lower[ix] + step[ix] * np.arange(nbins[ix]) for ix in range(K.d)],
+        np.clip(density, 0, None),  # remove small negative values from the FFT
+        bounds_error=False,
+        fill_value=0.0,
+    )
+    return interpolator(samples)
+
+
+def _tree_kde(K, samples, tol=1e-4, cellsize=0.25, maxpairs=10**7):
+    """
+    Evaluate a Gaussian kernel density estimate by summing kernels truncated at a
+    relative height :code:`tol`, using k-d trees to find the data within the
+    truncation radius of each sample point. Data are first aggregated to the
+    weighted centroids of cells of a fraction of the kernel bandwidth, such that the
+    cost scales with the number of neighbouring pairs of samples and cells, rather
+    than all pairs of samples and data points.
+
+    Parameters
+    ------------
+    K : :class:`scipy.stats.gaussian_kde`
+        Kernel density estimate, specifying the data, weights and kernel covariance.
+    samples : :class:`numpy.ndarray`
+        Finite coordinates to sample the KDE estimate at (:code:`npoints, ndim`).
+    tol : :class:`float`
+        Relative kernel height (compared to its peak) below which contributions
+        are neglected.
+    cellsize : :class:`float`
+        Size of the cells used to aggregate the data, relative to the kernel
+        bandwidth.
+    maxpairs : :class:`int`
+        Approximate maximum number of neighbouring pairs to evaluate at once, to
+        limit memory use.
+
+    Returns
+    ----------
+    :class:`numpy.ndarray`
+    """
+    import scipy.spatial
+
+    # whiten the data and samples such that the kernel is a standard normal
+    L = np.linalg.cholesky(K.covariance)
+    data = np.linalg.solve(L, K.dataset).T
+    whitened = np.linalg.solve(L, samples.T).T
+    # aggregate data within cells to their weighted centroids
+    _, cells = np.unique(
+        np.floor(data / cellsize).astype(int), axis=0, return_inverse=True
+    )
+    cells = cells.ravel()
+    weights = np.bincount(cells, weights=K.weights)
+    centroids = (
+        np.column_stack([np.bincount(cells, weights=K.weights * x) for x in data.T])
+        / weights[:, np.newaxis]
+    )
+    tree = scipy.spatial.cKDTree(centroids)
+    radius = np.sqrt(-2 * np.log(tol))
+    # estimate the number of neighbours per sample to limit the size of each chunk
+    probe = whitened[:: max(1, whitened.shape[0] // 100)]
+    neighbours = tree.query_ball_point(probe, radius, return_length=True).mean()
+    chunksize = int(max(1, maxpairs // max(neighbours, 1)))
+
+    density = np.zeros(samples.shape[0])
+    for start in range(0, samples.shape[0], chunksize):
+        chunk = scipy.spatial.cKDTree(whitened[start : start + chunksize])
+        pairs = chunk.sparse_distance_matrix(tree, radius, output_type="ndarray")
+        contributions = np.exp(-0.5 * pairs["v"] ** 2) * weights[pairs["j"]]
+        density[start : start + chunksize] = np.bincount(
+            pairs["i"], weights=contributions, minlength=chunk.n
+        )
+    return density / np.sqrt(np.linalg.det(2 * np.pi * K.covariance))
+
+
+def sample_kde(
+    data,
+    samples,
+    renorm=False,
+    transform=lambda x: x,
+    bw_method=None,
+    kde_method="auto",
+    tol=1e-4,
+):
     """
     Sample a Kernel Density Estimate at points or a grid defined.
 
@@ -48,10 +192,30 @@ def sample_kde(data, samples, renorm=False, transform=lambda x: x, bw_method=Non
     bw_method : :class:`str`, :class:`float`, callable
         Method used to calculate the estimator bandwidth.
         See :func:`scipy.stats.gaussian_kde`.
+    kde_method : :class:`str`
+        Method used to evaluate the kernel density estimate, either directly at each
+        sample point (:code:`"exact"`), or from data binned to a regular grid using
+        a fast Fourier transform (:code:`"binned"`; for up to three dimensions), or
+        by summing kernels truncated at a relative height :code:`tol` over
+        neighbouring data points found with k-d trees (:code:`"tree"`). The default
+        (:code:`"auto"`) will use the binned method for large numbers of data and
+        sample points.
+    tol : :class:`float`
+        Relative kernel height below which kernel contributions are neglected, for
+        the :code:`"tree"` method.
 
     Returns
     ----------
     :class:`numpy.ndarray`
+
+    Notes
+    ------
+    All methods use the same kernel bandwidth; the binned method approximates the
+    data locations to a fraction of the bandwidth, and is substantially faster
+    for large datasets sampled at many points (e.g. over a grid). The tree method
+    is best suited to data which are spread widely relative to the bandwidth, as its
+    cost scales with the number of data points within the truncated kernel of each
+    sample point.
     """
     # check shape info first
     data = np.atleast_2d(data)
@@ -81,8 +245,25 @@ def sample_kde(data, samples, renorm=False, transform=lambda x: x, bw_method=Non
         logger.warn("Dimensions of data and samples do not match.")
 
     kfltr = np.isfinite(ksamples).all(axis=1)
+    if kde_method == "auto":
+        large = tdata.shape[0] * kfltr.sum() > _BINNED_KDE_THRESHOLD
+        kde_method = ["exact", "binned"][large and (K.d in _BINNED_KDE_MAXBINS)]
+        logger.debug("Using {} KDE.".format(kde_method))
+
     zi = np.ones(zshape, dtype=float) * np.nan
-    zi.flat[kfltr] = K(ksamples[kfltr, :].T)
+    if not kfltr.any():
+        pass  # no valid points to sample at
+    elif kde_method == "exact":
+        zi.flat[kfltr] = K(ksamples[kfltr, :].T)
+    elif kde_method == "binned":
+        if K.d not in _BINNED_KDE_MAXBINS:
+            msg = "Binned KDEs are not implemented for {} dimensions.".format(K.d)
+            raise NotImplementedError(msg)
+        zi.flat[kfltr] = _binned_kde(K, ksamples[kfltr, :])
+    elif kde_method == "tree":
+        zi.flat[kfltr] = _tree_kde(K, ksamples[kfltr, :], tol=tol)
+    else:
+        raise NotImplementedError("KDE method {} not recognised.".format(kde_method))
 
     if renorm:
         logger.debug("Normalising KDE sample.")
@@ -90,6 +271,213 @@ def sample_kde(data, samples, renorm=False, transform=lambda x: x, bw_method=Non
     return zi
 
 
+def _column_kde_bandwidths(data, bw_method=None):
+    """
+    Get the kernel bandwidths (standard deviations) which
+    :class:`scipy.stats.gaussian_kde` would use for the finite values of each
+    column of an array.
+
+    Parameters
+    ------------
+    data : :class:`numpy.ndarray`
+        Array of data, with observations in rows (:code:`npoints, ncolumns`).
+    bw_method : :class:`str`, :class:`float`, callable
+        Method used to calculate the estimator bandwidth.
+        See :func:`scipy.stats.gaussian_kde`.
+
+    Returns
+    ----------
+    :class:`numpy.ndarray`
+        Bandwidths for each column, which are :code:`nan` for columns with fewer
+        than two finite values.
+    """
+    finite = np.isfinite(data)
+    counts = finite.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(finite, data, 0).sum(axis=0) / counts
+        deviations = np.where(finite, data - mean, 0)
+        std = np.sqrt((deviations**2).sum(axis=0) / (counts - 1))
+        if bw_method is None or bw_method == "scott":
+            factor = counts ** (-1 / 5)
+        elif bw_method == "silverman":
+            factor = (counts * 3 / 4) ** (-1 / 5)
+        elif np.isscalar(bw_method) and not isinstance(bw_method, str):
+            factor = np.full(counts.shape, float(bw_method))
+        elif callable(bw_method):
+            factor = np.full(counts.shape, np.nan)
+            for ix in np.flatnonzero(counts > 1):
+                values = data[finite[:, ix], ix]
+                factor[ix] = scipy.stats.gaussian_kde(values, bw_method).factor
+        else:
+            msg = "`bw_method` should be 'scott', 'silverman', a scalar or a callable."
+            raise ValueError(msg)
+        return np.where(counts > 1, std * factor, np.nan)
+
+
+def _binned_column_kde(
+    columns, data, bandwidths, lower, step, nbins, samples, tail=4.0
+):
+    """
+    Evaluate univariate Gaussian kernel density estimates for a number of columns
+    of an array by linearly binning each column onto a shared regular grid, and
+    convolving all columns with their respective kernels at once in the frequency
+    domain.
+
+    Parameters
+    ------------
+    columns : :class:`numpy.ndarray`
+        Indexes of the columns to evaluate.
+    data : :class:`numpy.ndarray`
+        Array of data, with observations in rows (:code:`npoints, ncolumns`).
+    bandwidths : :class:`numpy.ndarray`
+        Kernel standard deviations for each column.
+    lower : :class:`float`
+        Lower bound of the grid.
+    step : :class:`float`
+        Grid spacing.
+    nbins : :class:`int`
+        Number of grid nodes.
+    samples : :class:`numpy.ndarray`
+        Finite points at which to sample the estimates, which should fall within the
+        grid.
+    tail : :class:`float`
+        Number of kernel standard deviations to pad the grid by for the convolution.
+
+    Returns
+    ----------
+    :class:`numpy.ndarray`
+        Array of densities (:code:`nsamples, ncolumns`).
+    """
+    import scipy.fft
+
+    X = np.ascontiguousarray(data[:, columns].T)  # (ncolumns, npoints)
+    finite = np.isfinite(X)
+    weights = (1 / finite.sum(axis=1))[:, np.newaxis]
+    position = (X - lower) / step
+    position[~finite] = 0
+    base = np.clip(position.astype(int), 0, nbins - 2)  # positions are >= 0
+    frac = (position - base) * weights
+    frac[~finite] = 0
+    # offset each column to bin all columns at once
+    index = (base + (np.arange(X.shape[0]) * nbins)[:, np.newaxis]).ravel()
+    upper = np.bincount(index + 1, frac.ravel(), X.shape[0] * nbins)
+    binned = np.bincount(index, (finite * weights - frac).ravel(), upper.size)
+    binned = (binned + upper).reshape(X.shape[0], nbins)
+    # gaussian kernels applied as a transfer function, padding to avoid wrapping
+    h = bandwidths[columns]
+    nfft = scipy.fft.next_fast_len(nbins + int(np.ceil(tail * h.max() / step)))
+    freq = np.fft.rfftfreq(nfft, d=step)
+    transfer = np.exp(-2 * (np.pi * freq[np.newaxis, :] * h[:, np.newaxis]) ** 2)
+    density = scipy.fft.irfft(
+        scipy.fft.rfft(binned, n=nfft, axis=1) * transfer, n=nfft, axis=1
+    )[:, :nbins]
+    density = np.clip(density / step, 0, None)  # remove small negative values
+    # linearly interpolate at the sample points
+    position = (samples - lower) / step
+    base = np.clip(np.floor(position).astype(int), 0, nbins - 2)
+    frac = position - base
+    return (density[:, base] * (1 - frac) + density[:, base + 1] * frac).T
+
+
+def sample_column_kde(
+    data,
+    samples,
+    renorm=False,
+    transform=lambda x: x,
+    bw_method=None,
+    processes=None,
+    tail=4.0,
+    oversampling=8,
+):
+    """
+    Sample univariate kernel density estimates for each column of an array at a
+    common set of points. This is equivalent to using :func:`sample_kde` for each
+    column, but evaluates all columns at once using binned data convolved with
+    each kernel using fast Fourier transforms.
+
+    Parameters
+    ------------
+    data : :class:`numpy.ndarray`
+        Source data to estimate the kernel density estimates; observations should be
+        in rows (:code:`npoints, ncolumns`).
+    samples : :class:`numpy.ndarray`
+        1D array of coordinates to sample the KDE estimates at.
+    renorm : :class:`bool`
+        Whether to normalise the estimate for each column to a maximum of one.
+    transform
+        Transformation used prior to kernel density estimate.
+    bw_method : :class:`str`, :class:`float`, callable
+        Method used to calculate the estimator bandwidth.
+        See :func:`scipy.stats.gaussian_kde`.
+    processes : :class:`int`
+        Number of threads across which to distribute the columns. By default
+        (:code:`None`), columns are evaluated in a single batch.
+    tail : :class:`float`
+        Number of kernel standard deviations to extend the grid by.
+    oversampling : :class:`int`
+        Minimum number of grid bins per kernel standard deviation.
+
+    Returns
+    ----------
+    :class:`numpy.ndarray`
+        Array of densities (:code:`nsamples, ncolumns`). Columns with fewer than two
+        distinct finite values will have zero density.
+
+    Notes
+    ------
+    Each column uses the same bandwidth as :class:`scipy.stats.gaussian_kde` would;
+    the binned data approximates the data locations to a fraction of the smallest
+    bandwidth.
+    """
+    data = np.asarray(data, dtype=float)
+    if data.ndim == 1:
+        data = data[:, np.newaxis]
+    tdata = transform(data)
+    tsamples = transform(np.asarray(samples, dtype=float).ravel())
+
+    bandwidths = _column_kde_bandwidths(tdata, bw_method=bw_method)
+    valid = np.isfinite(bandwidths) & (bandwidths > 0)
+    sfltr = np.isfinite(tsamples)
+
+    zi = np.zeros((tsamples.size, tdata.shape[1]))
+    zi[~sfltr, :] = np.nan
+    if valid.any() and sfltr.any():
+        h = bandwidths[valid]
+        values = tdata[:, valid]
+        lower = min(np.nanmin(values), tsamples[sfltr].min()) - tail * h.max()
+        upper = max(np.nanmax(values), tsamples[sfltr].max()) + tail * h.max()
+        nbins = int(np.ceil((upper - lower) / h.min() * oversampling)) + 1
+        nbins = int(np.clip(nbins, 16, _BINNED_KDE_MAXBINS[1]))
+        step = (upper - lower) / (nbins - 1)
+
+        chunks = [
+            c for c in np.array_split(np.flatnonzero(valid), processes or 1) if c.size
+        ]
+        func = partial(
+            _binned_column_kde,
+            data=tdata,
+            bandwidths=bandwidths,
+            lower=lower,
+            step=step,
+            nbins=nbins,
+            samples=tsamples[sfltr],
+            tail=tail,
+        )
+        if processes is None or processes <= 1:
+            results = list(map(func, chunks))
+        else:
+            with ThreadPool(processes) as p:
+                results = p.map(func, chunks)
+        for columns, z in zip(chunks, results):
+            zi[np.ix_(sfltr, columns)] = z
+
+    if renorm:
+        logger.debug("Normalising KDE samples.")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            zi = zi / np.nanmax(zi, axis=0)
+    return zi
+
+
 def sample_ternary_kde(data, samples, transform=ILR):
     """
     Sample a Kernel Density Estimate in ternary space points or a grid defined by
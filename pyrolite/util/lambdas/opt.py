@@ -11,6 +11,7 @@ import scipy.optimize
 from ..log import Handle
 from ..meta import update_docstring_references
 from ..missing import md_pattern
+from ..multip import multiprocess
 from .eval import get_function_components
 from .helpers import _collect_lambda_outputs
 from .params import parse_sigmas
@@ -225,6 +226,279 @@ def optimize_fit_components(
     return B, s, χ2
 
 
+def _batch_jacobian(ls, ys, func_components, residuals_function, eps=1.0e-8):
+    """
+    Estimate residuals and Jacobians for a stack of rows using forward differences,
+    perturbing each of the weights for all rows at once.
+
+    Parameters
+    ------------
+    ls : :class:`numpy.ndarray`
+        Lambda values for each row (shape :math:`n, d`).
+    ys : :class:`numpy.ndarray`
+        Target y values (shape :math:`n, m`).
+    func_components : :class:`numpy.ndarray`
+        Arrays representing the individual unweighted function components.
+    residuals_function : callable
+        Residuals function accepting 2D arrays of weights and target values.
+    eps : :class:`float`
+        Relative step size for the finite differences.
+
+    Returns
+    -------
+    residuals, jacobian : :class:`numpy.ndarray`
+        Residuals (shape :math:`n, m`) and Jacobians (shape :math:`n, m, d`).
+    """
+    residuals = residuals_function(ls, ys, func_components)
+    jacobian = np.zeros(residuals.shape + (ls.shape[1],))
+    for k in range(ls.shape[1]):
+        h = eps * np.maximum(1.0, np.abs(ls[:, k]))
+        _ls = ls.copy()
+        _ls[:, k] += h
+        jacobian[:, :, k] = (
+            residuals_function(_ls, ys, func_components) - residuals
+        ) / h[:, None]
+    return residuals, jacobian
+
+
+def _batch_least_squares(
+    y, x0, func_components, residuals_function=_residuals_func, max_iter=100, tol=1e-10
+):
+    """
+    Minimise the sum of squared residuals for a stack of rows at once using a
+    Gauss-Newton iteration, with Levenberg-Marquardt damping where steps fail to reduce
+    the cost.
+
+    Parameters
+    -----------
+    y : :class:`numpy.ndarray`
+        Array of target values to fit (shape :math:`n, m`).
+    x0 : :class:`numpy.ndarray`
+        Starting guess for the function weights.
+    func_components : :class:`list` ( :class:`numpy.ndarray` )
+        List of arrays representing static/evaluated function components.
+    residuals_function : callable
+        Residuals function accepting 2D arrays of weights and target values.
+    max_iter : :class:`int`
+        Maximum number of iterations.
+    tol : :class:`float`
+        Relative tolerance for the change in cost and weights used to determine
+        convergence.
+
+    Returns
+    -------
+    ls, residuals, jacobian : :class:`numpy.ndarray`
+        Optimized weights (shape :math:`n, d`), and the residuals (shape
+        :math:`n, m`) and Jacobians (shape :math:`n, m, d`) at these weights.
+    """
+    ls = np.repeat(np.atleast_2d(x0).astype(float), y.shape[0], axis=0)
+    # start with undamped Gauss-Newton steps, which solve linear models directly
+    damping = np.zeros(y.shape[0])
+    active = np.ones(y.shape[0], dtype=bool)
+    residuals, jacobian = _batch_jacobian(ls, y, func_components, residuals_function)
+    cost = 0.5 * (residuals**2).sum(axis=1)
+    eye = np.eye(ls.shape[1])
+    for iteration in range(max_iter):
+        r, J = residuals[active], jacobian[active]
+        # solve the damped least squares problem for the step as an augmented system
+        # rather than through the normal equations, which are poorly conditioned
+        scale = np.sqrt(damping[active, None] * (J**2).sum(axis=1))
+        A = np.concatenate([J, scale[:, :, None] * eye], axis=1)
+        b = np.concatenate([r, np.zeros_like(scale)], axis=1)
+        step = -np.einsum("nkm,nm->nk", np.linalg.pinv(A), b)
+
+        _ls = ls[active] + step
+        _residuals, _jacobian = _batch_jacobian(
+            _ls, y[active], func_components, residuals_function
+        )
+        _cost = 0.5 * (_residuals**2).sum(axis=1)
+        improved = _cost <= cost[active]
+
+        converged = (
+            np.abs(cost[active] - _cost) <= tol * np.maximum(cost[active], tol)
+        ) | (np.abs(step).max(axis=1) <= tol * (np.abs(_ls).max(axis=1) + tol))
+
+        rows = np.flatnonzero(active)
+        accept = rows[improved]
+        ls[accept], cost[accept] = _ls[improved], _cost[improved]
+        residuals[accept], jacobian[accept] = _residuals[improved], _jacobian[improved]
+        damping[accept] /= 10.0
+        damping[rows[~improved]] = np.maximum(damping[rows[~improved]] * 10.0, 1e-3)
+        active[rows[converged]] = False
+        if not active.any():
+            break
+    return ls, residuals, jacobian
+
+
+def _batch_pcov_from_jac(jac):
+    """
+    Extract covariance matrices from a stack of Jacobian matrices, as for
+    :func:`pcov_from_jac`.
+
+    Parameters
+    ----------
+    jac : :class:`numpy.ndarray`
+        Stack of Jacobian arrays (shape :math:`n, m, d`).
+
+    Returns
+    -------
+    pcov : :class:`numpy.ndarray`
+        Stack of square covariance arrays (shape :math:`n, d, d`); these haven't yet
+        been scaled by residuals.
+    """
+    _, s, VT = np.linalg.svd(jac, full_matrices=False)
+    threshold = np.finfo(float).eps * max(jac.shape[1:]) * s[:, :1]
+    # discard zero singular values
+    inv_s_sq = np.divide(1.0, s**2, out=np.zeros_like(s), where=s > threshold)
+    return np.einsum("nji,nj,njk->nik", VT, inv_s_sq, VT)
+
+
+def _linear_least_squares(y, x0, func_components, present):
+    """
+    Minimise the sum of squared residuals for a stack of rows sharing a missing data
+    pattern where the residuals are linear in the weights (as for
+    :func:`_residuals_func`), such that all rows share a single Jacobian.
+
+    Parameters
+    -----------
+    y : :class:`numpy.ndarray`
+        Array of target values to fit (shape :math:`n, m`).
+    x0 : :class:`numpy.ndarray`
+        Starting guess for the function weights.
+    func_components : :class:`list` ( :class:`numpy.ndarray` )
+        List of arrays representing static/evaluated function components.
+    present : :class:`numpy.ndarray`
+        Boolean array indicating which of the target values are present for this
+        group of rows.
+
+    Returns
+    -------
+    ls, residuals, jacobian : :class:`numpy.ndarray`
+        Optimized weights (shape :math:`n, d`), the residuals at these weights
+        (shape :math:`n, m`) and the shared Jacobian (shape :math:`m, d`).
+    """
+    func_components = np.array(func_components)
+    # missing values don't contribute to the residuals, nor their derivatives
+    jacobian = func_components.T * present[:, None]
+    ls = np.repeat(np.atleast_2d(x0).astype(float), y.shape[0], axis=0)
+    # a single Gauss-Newton step from the starting guess solves the linear problem
+    ls -= _residuals_func(ls, y, func_components) @ np.linalg.pinv(jacobian).T
+    return ls, _residuals_func(ls, y, func_components), jacobian
+
+
+def batch_optimize_fit_components(
+    y,
+    x0,
+    func_components,
+    residuals_function=_residuals_func,
+    sigmas=None,
+    processes=None,
+):
+    r"""
+    Fit a weighted sum of function components using least squares optimization,
+    for batches of rows sharing the same missing data pattern at once.
+
+    Where the residuals are linear in the weights (i.e. for the default
+    :func:`_residuals_func`), rows sharing a missing data pattern share a Jacobian,
+    and each group is solved directly to give the least squares solution (as for
+    :func:`linear_fit_components`). Otherwise, residuals are minimised using a
+    batched Levenberg-Marquardt iteration with finite difference Jacobians.
+
+    Results agree with :func:`optimize_fit_components` up to the convergence
+    tolerance of :func:`scipy.optimize.least_squares`. For over-determined fits,
+    chi-squared values agree to within a relative tolerance of :math:`10^{-5}` and
+    uncertainties within :math:`10^{-3}`. Weights agree within a relative
+    tolerance of :math:`10^{-3}` (absolute :math:`5 \times 10^{-3}`) for well
+    constrained fits, but can differ more for poorly constrained components (e.g.
+    higher order polynomials or tetrads), where the iterative optimization can stop
+    short of the minimum.
+
+    Parameters
+    -----------
+    y : :class:`numpy.ndarray`
+        Array of target values to fit.
+    x0 : :class:`numpy.ndarray`
+        Starting guess for the function weights.
+    func_components : :class:`list` ( :class:`numpy.ndarray` )
+        List of arrays representing static/evaluated function components.
+    residuals_function : callable
+        Callable funciton to compute residuals which accepts ordered arguments for
+        weights, target values and function components. This should accept 2D arrays
+        of weights and target values (i.e. multiple rows), as
+        :func:`_residuals_func` does.
+    sigmas : :class:`float` | :class:`numpy.ndarray`
+        Single value or 1D array of normalised observed value uncertainties
+        (:math:`\sigma_{REE} / REE`).
+    processes : :class:`int`
+        Number of processes across which to distribute the missing data pattern
+        groups, if any.
+
+    Returns
+    -------
+    B, s, χ2 : :class:`numpy.ndarray`
+        Arrays for the optimized parameter values (B; (n, d)), parameter
+        uncertaintes (s, 1σ; (n, d)) and chi-chi_squared (χ2; (n, 1)).
+    """
+    x0 = np.array(x0)
+    B = np.ones((y.shape[0], len(func_components))) * np.nan
+    s = np.ones((y.shape[0], len(func_components))) * np.nan
+    χ2 = np.ones((y.shape[0], 1)) * np.nan
+
+    md_inds, patterns = md_pattern(y)
+    inds = np.unique(md_inds)
+    groups = [np.flatnonzero(md_inds == ind) for ind in inds]
+    if processes is not None and processes > 1 and len(groups) > 1:
+        # distribute the groups across jobs, largest groups first
+        groups = sorted(groups, key=len, reverse=True)
+        jobs = [[] for _ in range(min(processes, len(groups)))]
+        for ix, group in enumerate(groups):
+            jobs[ix % len(jobs)].append(group)
+        jobs = [np.concatenate(rows) for rows in jobs]
+        results = multiprocess(
+            batch_optimize_fit_components,
+            [
+                dict(
+                    y=y[rows],
+                    x0=x0,
+                    func_components=func_components,
+                    residuals_function=residuals_function,
+                    sigmas=sigmas,
+                )
+                for rows in jobs
+            ],
+        )
+        for rows, (_B, _s, _χ2) in zip(jobs, results):
+            B[rows], s[rows], χ2[rows] = _B, _s, _χ2
+        return B, s, χ2
+
+    sigmas = parse_sigmas(y.shape[1], sigmas=sigmas)
+    yd, xd = y.shape[1], x0.size
+    dof = yd - xd  # effective degrees of freedom
+    for ind, rows in zip(inds, groups):
+        if residuals_function is _residuals_func:
+            # rows with the same missing data pattern share a Jacobian, such that
+            # the group can be solved at once and shares a covariance matrix
+            ls, residuals, jacobian = _linear_least_squares(
+                y[rows], x0, func_components, ~patterns[ind]["pattern"]
+            )
+            pcov = _batch_pcov_from_jac(jacobian[np.newaxis])
+        else:  # estimate Jacobians for each row by finite differences
+            ls, residuals, jacobian = _batch_least_squares(
+                y[rows], x0, func_components, residuals_function=residuals_function
+            )
+            pcov = _batch_pcov_from_jac(jacobian)
+        if yd > xd:  # check samples in y vs parameter dimension
+            s_sq = 0.5 * (residuals**2).sum(axis=1) / (yd - xd)
+            pcov = pcov * s_sq[:, None, None]
+        else:
+            pcov = np.full((rows.size, xd, xd), np.inf)
+
+        B[rows, :] = ls
+        s[rows, :] = np.sqrt(np.einsum("nkk->nk", pcov))  # sigmas on parameters
+        χ2[rows, 0] = (residuals**2 / sigmas**2).sum(axis=1) / dof
+    return B, s, χ2
+
+
 @update_docstring_references
 def lambdas_optimize(
     df,
@@ -257,7 +531,9 @@ def lambdas_optimize(
     tetrad_params : :class:`list`
         List of parameter sets for tetrad functions.
     fit_method : :class:`str`
-        Which fit method to use: :code:`"optimization"` or :code:`"linear"`.
+        Which fit method to use: :code:`"optimization"` or :code:`"linear"`. The
+        optimization uses :func:`batch_optimize_fit_components`, to which keyword
+        arguments (e.g. :code:`processes`) are passed.
     sigmas : :class:`float` | :class:`numpy.ndarray`
         Single value or 1D array of observed value uncertainties.
     add_uncertainties : :class:`bool`
@@ -288,7 +564,7 @@ def lambdas_optimize(
         radii, params=params, fit_tetrads=fit_tetrads, tetrad_params=tetrad_params
     )
     if fit_method.lower().startswith("opt"):
-        fit = optimize_fit_components
+        fit = batch_optimize_fit_components
     else:
         fit = linear_fit_components
 
@@ -2,7 +2,6 @@ from copy import copy
 
 import numpy as np
 import scipy
-import sympy
 
 from .log import Handle
 
@@ -544,6 +543,7 @@ def symbolic_helmert_basis(D, full=False):
     --------
     :class:`sympy.matrices.dense.DenseMatrix`
     """
+    import sympy  # imported on use, as it is slow to import
 
     rows = []
     if full:
@@ -605,6 +605,8 @@ def solve_ratios(*eqs, evaluate=True):
     Solve a ternary system (top-left-right) given two constraints on
     two ratios, which together describe intersecting lines/a point.
     """
+    import sympy  # imported on use, as it is slow to import
+
     t, L, r = sympy.symbols("t l r")
 
     def to_sympy(t):  # rearrange to have =0 equvalent expressions
@@ -2,7 +2,6 @@ from collections import defaultdict
 
 import numpy as np
 import pandas as pd
-import scipy.special
 
 
 def md_pattern(Y):
@@ -17,39 +16,41 @@ def md_pattern(Y):
     Returns
     ---------
     pattern_ids : :class:`numpy.ndarray`
-        Pattern ID array.
+        Integer pattern ID array.
     pattern_dict : :class:`dict`
         Dictionary of patterns indexed by pattern IDs. Contains a pattern and count
         for each pattern ID.
+
+    Notes
+    ------
+    Pattern 0 is always the pattern with no missing data (and will have a count of
+    zero if there are no complete rows). Other patterns are numbered in order of
+    their first occurrence. Patterns are identified by sorting bit-packed row
+    signatures, such that the cost scales with the number of rows rather than
+    with the number of rows multiplied by the number of patterns.
     """
     if isinstance(Y, pd.DataFrame):
         Y = Y.values
     N, D = Y.shape
-    # use int64 for higher-D arrays
-    pID = np.zeros(N)
     Ymiss = ~np.isfinite(Y)
-    rows = np.arange(N)[~np.isfinite(np.sum(Y, axis=1))]
-    max_pats = scipy.special.comb(D, np.arange(0, D + 1)).sum()
-    pID[rows] = max_pats * 5  # initialise to high value
     pD = defaultdict(dict)
-
-    pindex = 0  # 0 = no missing data
-    pD[int(0)] = {"pattern": np.zeros(D).astype(bool), "freq": np.sum(pID == 0)}
-    indexes = np.arange(N)
-    indexes = indexes[pID[indexes] > pindex]  # only look at md rows
-    for idx in indexes:
-        if pID[idx] > pindex:  # has missing data
-            pindex += 1
-            pID[idx] = pindex
-            pattern = Ymiss[idx, :]
-            pD[int(pindex)] = {"pattern": pattern, "freq": 0}
-            if idx < N:
-                _rix = np.arange(idx + 1, N)
-                to_compare = _rix[pID[_rix] > pindex]
-                where_same = to_compare[(Ymiss[to_compare, :] == pattern).all(axis=1)]
-                pID[where_same] = pindex
-    for ID in np.unique(pID):
-        pD[ID]["freq"] = np.sum(pID == ID)
+    pD[0] = {"pattern": np.zeros(D).astype(bool), "freq": 0}
+    if not N:
+        return np.zeros(0, dtype=int), pD
+    # represent each row's pattern as a single opaque value of packed bits
+    packed = np.ascontiguousarray(np.packbits(Ymiss, axis=1))
+    signatures = packed.view(np.dtype((np.void, max(packed.shape[1], 1)))).ravel()
+    _, first, inverse, counts = np.unique(
+        signatures, return_index=True, return_inverse=True, return_counts=True
+    )
+    # number patterns by first occurrence, with the complete pattern as 0
+    complete = ~Ymiss[first].any(axis=1)
+    order = np.lexsort((first, ~complete))
+    pattern_ids = np.empty(order.size, dtype=int)
+    pattern_ids[order] = np.arange(order.size) + int(not complete.any())
+    for ID, ix, freq in zip(pattern_ids, first, counts):
+        pD[int(ID)] = {"pattern": Ymiss[ix], "freq": int(freq)}
+    pID = pattern_ids[inverse.ravel()]
     return pID, pD
 
 
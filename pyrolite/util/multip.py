@@ -1,3 +1,7 @@
+import itertools
+import os
+import time
+
 import numpy as np
 
 try:
@@ -5,6 +9,11 @@ try:
 except ImportError:
     from multiprocessing import Pool
 
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # python < 3.8
+    shared_memory = None
+
 from .log import Handle
 
 logger = Handle(__name__)
@@ -13,7 +22,63 @@ logger = Handle(__name__)
 # pickle, which has a hard time serializing even simple objects
 
 
-def combine_choices(choices, include_none=False):
+def _unique(values):
+    """
+    Get the unique values from a list, preserving their order. Values need not be
+    hashable.
+
+    Parameters
+    ------------
+    values : :class:`list`
+        List of values.
+
+    Returns
+    ---------
+    :class:`list`
+    """
+    out = []
+    for v in values:
+        if not any((v is o) or (v == o) for o in out):
+            out.append(v)
+    return out
+
+
+def _iter_choices(choices, include_none=False):
+    """
+    Generate the unique combinations from a set of choices.
+
+    Parameters
+    ------------
+    choices : :class:`dict`
+        Dictionary where keys are names, and values are list of potential
+        choices.
+    include_none : :class:`bool`
+        Whether to include 'None' values, or otherwise omit them.
+
+    Yields
+    -------
+    :class:`dict`
+        Dictionary containing a set of choice combinations.
+    """
+    # with unique values for each choice, each combination is also unique
+    keys = list(choices.keys())
+    # iterate in the order of a transposed 'xy' meshgrid over the choices, where the
+    # last choice varies slowest, then the third last to the third, then the first,
+    # and the second fastest
+    order = list(range(len(keys)))[::-1]
+    if len(order) > 1:
+        order = order[:-2] + [0, 1]
+    values = [_unique(choices[keys[ix]]) for ix in order]
+    for combination in itertools.product(*values):
+        combination = dict(zip(order, combination))
+        yield {
+            k: combination[ix]
+            for ix, k in enumerate(keys)
+            if ((combination[ix] is not None) or include_none)
+        }
+
+
+def combine_choices(choices, include_none=False, lazy=False):
     """
     Explode a set of choices into possible combinations.
 
@@ -24,6 +89,8 @@ def combine_choices(choices, include_none=False):
         choices.
     include_none : :class:`bool`
         Whether to include 'None' values, or otherwise omit them.
+    lazy : :class:`bool`
+        Whether to return a generator of combinations, rather than a list.
 
     Returns
     ---------
@@ -42,27 +109,10 @@ def combine_choices(choices, include_none=False):
 
             X = [0, 1, 2], Y = [A, B, C] --> {X:0, Y:A}, {X:1, Y:B}, {X:2, Y:C}
     """
-    if choices:  # if there are values specified
-        index = np.array(
-            np.meshgrid(*[np.arange(len(v)) for k, v in choices.items()])
-        ).T.reshape(-1, len(choices))
-
-        combs = []
-        for ix in index:
-            combs.append(
-                {
-                    k: v[vix]
-                    for vix, (k, v) in zip(ix, choices.items())
-                    if ((v[vix] is not None) or include_none)
-                }
-            )
-        out = []
-        for c in combs:  # don't duplicate configs
-            if c not in out:
-                out += [c]
-        return out
-    else:
-        return [{}]
+    combinations = _iter_choices(choices, include_none=include_none)
+    if lazy:
+        return combinations
+    return list(combinations)
 
 
 def func_wrapper(arg):
@@ -70,13 +120,187 @@ def func_wrapper(arg):
     return func(**kwargs)
 
 
-def multiprocess(func, param_sets):
+class _SharedArray(object):
+    """
+    Reference to a :class:`numpy.ndarray` held in shared memory, which can be passed
+    to worker processes in place of the array itself.
+
+    Parameters
+    ------------
+    name : :class:`str`
+        Name of the shared memory block.
+    shape : :class:`tuple`
+        Shape of the array.
+    dtype : :class:`numpy.dtype`
+        Data type of the array.
+    """
+
+    def __init__(self, name, shape, dtype):
+        self.name, self.shape, self.dtype = name, shape, dtype
+
+
+# shared memory blocks attached within a worker process, by name
+_ATTACHED = {}
+
+
+def _attach(ref):
+    """
+    Get a (read-only) view of an array in shared memory from within a worker
+    process, attaching to the shared memory block where this hasn't already been
+    done.
+
+    Parameters
+    ------------
+    ref : :class:`_SharedArray`
+        Reference to the shared array.
+
+    Returns
+    ---------
+    :class:`numpy.ndarray`
+    """
+    if ref.name not in _ATTACHED:
+        # the block is owned (and unlinked) by the parent process
+        _ATTACHED[ref.name] = shared_memory.SharedMemory(name=ref.name)
+    arr = np.ndarray(ref.shape, dtype=ref.dtype, buffer=_ATTACHED[ref.name].buf)
+    arr.flags.writeable = False
+    return arr
+
+
+def _job_wrapper(arg):
+    """
+    Call a function with a set of keyword arguments within a worker process,
+    retrieving any arrays passed through shared memory.
+
+    Parameters
+    ------------
+    arg : :class:`tuple`
+        Tuple of the job index, function and keyword arguments.
+
+    Returns
+    ---------
+    :class:`tuple`
+        Tuple of the job index, result and execution time (in seconds).
+    """
+    ix, func, kwargs = arg
+    kwargs = {
+        k: (_attach(v) if isinstance(v, _SharedArray) else v) for k, v in kwargs.items()
+    }
+    start = time.perf_counter()
+    result = func(**kwargs)
+    return ix, result, time.perf_counter() - start
+
+
+def _share_arrays(param_sets, blocks, share_threshold=2**20):
+    """
+    Replace large arrays within sets of keyword arguments with references to copies
+    in shared memory, such that each array is copied once rather than being
+    serialized for each job.
+
+    Parameters
+    ------------
+    param_sets : :class:`list`
+        Iterable of keyword argument dictionaries.
+    blocks : :class:`dict`
+        Dictionary to which shared memory blocks will be added, indexed by the
+        :func:`id` of the source array.
+    share_threshold : :class:`int`
+        Minimum size (in bytes) of arrays to place in shared memory.
+
+    Yields
+    -------
+    :class:`dict`
+        Keyword arguments, with large arrays replaced by references.
+    """
+    for params in param_sets:
+        shared = {}
+        for k, v in params.items():
+            if (
+                isinstance(v, np.ndarray)
+                and v.nbytes >= share_threshold
+                and v.dtype != object
+            ):
+                if id(v) not in blocks:
+                    shm = shared_memory.SharedMemory(create=True, size=v.nbytes)
+                    np.ndarray(v.shape, dtype=v.dtype, buffer=shm.buf)[:] = v
+                    blocks[id(v)] = (shm, _SharedArray(shm.name, v.shape, v.dtype), v)
+                v = blocks[id(v)][1]
+            shared[k] = v
+        yield shared
+
+
+def multiprocess(
+    func,
+    param_sets,
+    processes=None,
+    chunksize=None,
+    callback=None,
+    share_threshold=2**20,
+):
     """
     Multiprocessing utility function, targeted towards large requests.
     Note that async is commonly slower for this use case.
+
+    Parameters
+    ------------
+    func
+        Function to call with each set of keyword arguments.
+    param_sets : :class:`list`
+        Iterable of keyword argument dictionaries for each job.
+    processes : :class:`int`
+        Maximum number of worker processes, which defaults to the number of CPUs.
+        No more processes than jobs will be created.
+    chunksize : :class:`int`
+        Number of jobs to dispatch to a worker at a time. By default, jobs are split
+        into around four chunks per process.
+    callback
+        Callable function f(index, result, elapsed) called as each job completes,
+        with the index of the job, its result and its execution time (in seconds).
+        Note that jobs may complete out of order.
+    share_threshold : :class:`int` | :code:`None`
+        Minimum size (in bytes) of :class:`numpy.ndarray` arguments to place in
+        shared memory, which are then passed to workers by name rather than being
+        serialized for each job. Shared arrays are read-only within jobs. Use
+        :code:`None` to pass all arguments directly.
+
+    Returns
+    ---------
+    :class:`list`
+        List of results, in the order of the parameter sets.
     """
-    jobs = [(func, params) for params in param_sets]
-    with Pool(processes=len(jobs)) as p:
-        results = p.map(func_wrapper, jobs)
+    if hasattr(param_sets, "__len__"):
+        njobs = len(param_sets)
+    else:
+        param_sets = list(param_sets)
+        njobs = len(param_sets)
+    if not njobs:
+        return []
+    processes = min(processes or os.cpu_count() or 1, njobs)
+    chunksize = chunksize or max(1, int(np.ceil(njobs / (4 * processes))))
+
+    blocks = {}
+    if share_threshold is not None and shared_memory is not None:
+        param_sets = _share_arrays(param_sets, blocks, share_threshold=share_threshold)
 
+    results = [None] * njobs
+    start = time.perf_counter()
+    try:
+        jobs = [(ix, func, params) for ix, params in enumerate(param_sets)]
+        with Pool(processes=processes) as p:
+            if hasattr(p, "imap_unordered"):
+                completed = p.imap_unordered(_job_wrapper, jobs, chunksize=chunksize)
+            else:  # pathos
+                completed = p.uimap(_job_wrapper, jobs)
+            for ix, result, elapsed in completed:
+                results[ix] = result
+                if callback is not None:
+                    callback(ix, result, elapsed)
+    finally:
+        for shm, _, _ in blocks.values():
+            shm.close()
+            shm.unlink()
+    logger.debug(
+        "Completed {} jobs across {} processes in {:.2f} s.".format(
+            njobs, processes, time.perf_counter() - start
+        )
+    )
     return results
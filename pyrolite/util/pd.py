@@ -53,6 +53,124 @@ def read_table(filepath, index_col=0, **kwargs):
     return df
 
 
+def read_table_chunks(filepath, chunksize=10000, index_col=0, **kwargs):
+    """
+    Read tabular data from an excel, csv or parquet file in chunks of rows.
+
+    Parameters
+    ------------
+    filepath : :class:`str` | :class:`pathlib.Path`
+        Path to file.
+    chunksize : :class:`int`
+        Number of rows for each chunk.
+    index_col : :class:`int` | :class:`str`
+        Column to use as the index (for excel and csv files).
+
+    Yields
+    -------
+    :class:`pandas.DataFrame`
+
+    Notes
+    -----
+    Parquet files require :mod:`pyarrow`. Excel files cannot be read in parts, and
+    so will be read in full before being split into chunks.
+    """
+    filepath = Path(filepath)
+    ext = filepath.suffix.replace(".", "")
+    assert ext in ["xls", "xlsx", "csv", "parquet"]
+    if ext in ["xls", "xlsx"]:
+        df = read_table(filepath, index_col=index_col, **kwargs)
+        for ix in range(0, df.index.size, chunksize):
+            yield df.iloc[ix : ix + chunksize]
+        return
+    elif ext in ["csv"]:
+        reader = pd.read_csv(
+            str(filepath),
+            index_col=index_col,
+            chunksize=chunksize,
+            **subkwargs(kwargs, pd.read_csv),
+        )
+        with reader:
+            for chunk in reader:
+                # columns are retained such that chunks are consistent
+                yield chunk.dropna(how="all", axis=0)
+    elif ext in ["parquet"]:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading parquet files requires pyarrow.")
+        for batch in pq.ParquetFile(str(filepath)).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas().dropna(how="all", axis=0)
+
+
+def write_table_chunks(chunks, filepath, index=True, **kwargs):
+    """
+    Write a sequence of dataframes with the same columns to a single csv or parquet
+    file, writing each as it becomes available.
+
+    Parameters
+    ------------
+    chunks
+        Iterable of :class:`pandas.DataFrame`.
+    filepath : :class:`str` | :class:`pathlib.Path`
+        Path to file.
+    index : :class:`bool`
+        Whether to write the index.
+
+    Returns
+    --------
+    :class:`pathlib.Path`
+        Path to the file.
+
+    Notes
+    -----
+    Parquet files require :mod:`pyarrow`. The columns of the first chunk are used
+    for the file; any additional columns in subsequent chunks will be dropped.
+    """
+    filepath = Path(filepath)
+    ext = filepath.suffix.replace(".", "")
+    assert ext in ["csv", "parquet"]
+    if ext == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Writing parquet files requires pyarrow.")
+    columns, writer = None, None
+    try:
+        for chunk in chunks:
+            chunk = to_frame(chunk)
+            if columns is None:
+                columns = chunk.columns
+            else:
+                extra = [c for c in chunk.columns if c not in columns]
+                if extra:
+                    logger.warning("Dropping additional columns: {}".format(extra))
+                chunk = chunk.reindex(columns=columns)
+            if ext == "csv":
+                chunk.to_csv(
+                    str(filepath),
+                    index=index,
+                    mode="w" if writer is None else "a",
+                    header=writer is None,
+                    **subkwargs(kwargs, pd.DataFrame.to_csv),
+                )
+                writer = True
+            else:
+                if writer is None:
+                    table = pa.Table.from_pandas(chunk, preserve_index=index)
+                    writer = pq.ParquetWriter(str(filepath), table.schema, **kwargs)
+                else:
+                    table = pa.Table.from_pandas(
+                        chunk, schema=writer.schema, preserve_index=index
+                    )
+                writer.write_table(table)
+    finally:
+        if writer is not None and writer is not True:
+            writer.close()
+    return filepath
+
+
 def column_ordered_append(df1, df2, **kwargs):
     """
     Appends one dataframe to another, preserving the column order of the
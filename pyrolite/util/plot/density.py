@@ -12,7 +12,7 @@ import numpy as np
 import scipy.interpolate
 from numpy.linalg import LinAlgError
 
-from ..distributions import sample_kde
+from ..distributions import sample_column_kde, sample_kde
 from ..log import Handle
 from ..math import interpolate_line, linspc_, logspc_
 from ..meta import subkwargs
@@ -239,6 +239,8 @@ def conditional_prob_density(
     rescale=True,
     mode="binkde",
     ret_centres=False,
+    kde_method="auto",
+    processes=None,
     **kwargs
 ):
     """
@@ -272,6 +274,15 @@ def conditional_prob_density(
     ret_centres : :class:`bool`
         Whether to return bin centres in addtion to histogram edges,
         e.g. for later contouring.
+    kde_method : :class:`str`
+        Method used to evaluate kernel density estimates. For :code:`"binkde"`, the
+        default (:code:`"auto"`) evaluates the estimates for all bins at once from
+        data binned along y
+        (see :func:`~pyrolite.util.distributions.sample_column_kde`), while
+        :code:`"exact"` evaluates a separate estimate for each bin
+        (see :func:`~pyrolite.util.distributions.sample_kde`).
+    processes : :class:`int`
+        Number of threads across which to distribute bins for :code:`"binkde"`.
 
     Returns
     -------
@@ -320,7 +331,7 @@ def conditional_prob_density(
     # bin centres may be off centre, but will be in the bins.
     xe, ye = np.meshgrid(bin_centres_to_edges(xx, sort=False), bin_centres_to_edges(yy))
 
-    kde_kw = subkwargs(kwargs, sample_kde)
+    kde_kw = {**subkwargs(kwargs, sample_kde), "kde_method": kde_method}
 
     if mode == "ckde":
         fltr = np.isfinite(y.flatten()) & np.isfinite(x.flatten())
@@ -333,7 +344,7 @@ def conditional_prob_density(
             raise ImportError("Requires statsmodels.")
         # statsmodels pdf takes values in reverse order
         zi = dens_c.pdf(yi.flatten(), xi.flatten()).reshape(xi.shape)
-    elif mode == "binkde":  # calclate a kde per bin
+    elif mode == "binkde" and kde_method == "exact":  # calclate a kde per bin
         zi = np.zeros(xi.shape)
         for bin_index in range(x.shape[1]):  # bins along the x-axis
             # if np.isfinite(y[:, bin_index]).any(): # bins can be empty
@@ -342,6 +353,13 @@ def conditional_prob_density(
             zi[:, bin_index] = sample_kde(src, sample_at, **kde_kw)
             # else:
             # pass
+    elif mode == "binkde":  # calculate kdes for all bins at once
+        if kde_method not in ["auto", "binned"]:
+            msg = "KDE method {} not recognised.".format(kde_method)
+            raise NotImplementedError(msg)
+        zi = sample_column_kde(
+            y, yy, processes=processes, **subkwargs(kde_kw, sample_column_kde)
+        )
     elif mode == "kde":  # eqivalent to 2D KDE for scatter x,y * resolution
         xkde = sample_kde(x[0], x[0])  # marginal density along x
         src = np.vstack([x.flatten(), y.flatten()]).T
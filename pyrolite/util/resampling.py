@@ -1,12 +1,32 @@
 """
 Utilities for (weighted) bootstrap resampling applied to geoscientific point-data.
 """
+from functools import partial
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+
 import numpy as np
 import pandas as pd
 
 from .log import Handle
 from .meta import subkwargs
-from .spatial import _get_sqare_grid_segment_indicies, great_circle_distance
+from .spatial import (
+    _get_GC_distance_function,
+    _get_sqare_grid_segment_indicies,
+    great_circle_distance,
+)
+
+try:
+    from psutil import virtual_memory  # memory check
+except ImportError:
+    virtual_memory = None
+
+try:
+    from sklearn.neighbors import BallTree, KDTree
+
+    HAVE_SKL = True
+except ImportError:
+    HAVE_SKL = False
 
 logger = Handle(__name__)
 
@@ -77,6 +97,337 @@ def univariate_distance_matrix(a, b=None, distance_metric=None):
     return _segmented_univariate_distance_matrix(a, b, distance_metric)
 
 
+def _block_rows(size, max_block_memory=2**27, itemsize=8, temporaries=8):
+    """
+    Get the number of rows of a :code:`(rows, size)` block of pairwise values which
+    can be processed at a time within a given memory budget.
+
+    Parameters
+    -----------
+    size : :class:`int`
+        Number of columns of the block (i.e. the number of points).
+    max_block_memory : :class:`int`
+        Memory budget for a single block, in bytes.
+    itemsize : :class:`int`
+        Size of the individual values, in bytes.
+    temporaries : :class:`int`
+        Number of block-sized temporary arrays expected to be alive at once.
+
+    Returns
+    -------
+    :class:`int`
+    """
+    rows = int(max_block_memory // max(size * itemsize * temporaries, 1))
+    return int(np.clip(rows, 1, max(size, 1)))
+
+
+def _cauchy_kernel(distance, norm):
+    """
+    Normalised inverse-distance kernel used for spatiotemporal weighting, with
+    non-finite values (e.g. from missing positions or ages) replaced by unity.
+
+    Parameters
+    -----------
+    distance : :class:`numpy.ndarray`
+        Distances.
+    norm : :class:`float`
+        Normalising constant for the distances.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+    """
+    k = 1.0 / ((distance / norm) ** 2 + 1)
+    k[~np.isfinite(k)] = 1
+    return k
+
+
+def _spatiotemporal_kernel_sums(
+    latlong,
+    ages,
+    spatial_norm=1.8,
+    temporal_norm=38,
+    method=None,
+    dtype="float32",
+    max_block_memory=2**27,
+):
+    """
+    Calculate the sums of normalised inverse spatial and temporal distances for each
+    point, streaming over blocks of rows of the (implicit) pairwise distance matrices
+    such that memory use is bounded by :code:`max_block_memory`.
+
+    Parameters
+    -----------
+    latlong : :class:`numpy.ndarray`
+        Array of latitudes and longitudes, in degrees.
+    ages : :class:`numpy.ndarray`
+        Array of ages.
+    spatial_norm : :class:`float`
+        Normalising constant for spatial measures (arc degrees).
+    temporal_norm : :class:`float`
+        Normalising constant for temporal measures.
+    method : :class:`str`, :code:`{'vicenty', 'cosines', 'haversine'}`
+        Which method to use for great circle distance calculation.
+    dtype : :class:`numpy.dtype`
+        Data type for the spatial distance blocks.
+    max_block_memory : :class:`int`
+        Memory budget for a single block, in bytes.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Sums of normalised inverse distances.
+    """
+    f = _get_GC_distance_function(method)
+    φ, λ = np.deg2rad(np.asarray(latlong).astype(dtype)).T
+    t = np.asarray(ages).astype(float)
+    size = t.size
+    rows = _block_rows(size, max_block_memory=max_block_memory)
+    logger.debug(
+        "Computing inverse distance sums for {} points in blocks of {} rows.".format(
+            size, rows
+        )
+    )
+    sums = np.zeros(size)
+    for ix in range(0, size, rows):
+        block = slice(ix, ix + rows)
+        z = np.rad2deg(f(φ[block, None], φ[None, :], λ[block, None], λ[None, :]))
+        sums[block] += _cauchy_kernel(z, spatial_norm).sum(axis=1, dtype=float)
+        dt = np.abs(t[block, None] - t[None, :])
+        sums[block] += _cauchy_kernel(dt, temporal_norm).sum(axis=1)
+    return sums
+
+
+def _angular_distance(A, B):
+    """
+    Angular distance (in degrees) between points given as unit vectors.
+
+    Parameters
+    -----------
+    A, B : :class:`numpy.ndarray`
+        Arrays of unit vectors, with the last dimension corresponding to cartesian
+        coordinates. These will be broadcast against each other.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+    """
+    return np.rad2deg(np.arccos(np.clip((A * B).sum(axis=-1), -1, 1)))
+
+
+def _absolute_distance(A, B):
+    """
+    Absolute distance between points on a line.
+
+    Parameters
+    -----------
+    A, B : :class:`numpy.ndarray`
+        Arrays of points with a trailing dimension of length one. These will be
+        broadcast against each other.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+    """
+    return np.abs(A - B)[..., 0]
+
+
+def _truncated_kernel_sums(
+    X,
+    labels,
+    centres,
+    distance,
+    tree,
+    tree_radius,
+    radius,
+    norm,
+    max_block_memory=2**27,
+):
+    """
+    Approximate the sums of normalised inverse distances for a set of points,
+    calculating kernel values exactly for neighbours within a given radius
+    (found using a spatial index) and from the centres of a set of cells for more
+    distant points.
+
+    Parameters
+    -----------
+    X : :class:`numpy.ndarray`
+        Points.
+    labels : :class:`numpy.ndarray`
+        Integer index of the cell for each point.
+    centres : :class:`numpy.ndarray`
+        Cell centres.
+    distance
+        Callable function f(a, b) giving the distance between points.
+    tree : :class:`sklearn.neighbors.BallTree` | :class:`sklearn.neighbors.KDTree`
+        Spatial index built on :code:`X`.
+    tree_radius : :class:`float`
+        Truncation radius in the metric of the index.
+    radius : :class:`float`
+        Truncation radius in the metric of :code:`distance`.
+    norm : :class:`float`
+        Normalising constant for distances.
+    max_block_memory : :class:`int`
+        Memory budget for a single block of points, in bytes.
+
+    Returns
+    -------
+    sums, errors : :class:`numpy.ndarray`
+        Estimated sums of normalised inverse distances and bounds on their absolute
+        error.
+    """
+    size, ncells = X.shape[0], centres.shape[0]
+    counts = np.bincount(labels, minlength=ncells)
+    # the maximum distance from a cell centre to any point within the cell
+    cell_radii = np.zeros(ncells)
+    np.maximum.at(cell_radii, labels, distance(X, centres[labels]))
+    sums, errors = np.zeros(size), np.zeros(size)
+    rows = _block_rows(size, max_block_memory=max_block_memory, temporaries=4)
+    for ix in range(0, size, rows):
+        block = slice(ix, ix + rows)
+        Xb = X[block]
+        nb = Xb.shape[0]
+        D = distance(Xb[:, np.newaxis], centres[np.newaxis, :])
+        K = _cauchy_kernel(D, norm)
+        sums[block] = K @ counts
+        # replace the cell approximation with exact values for near neighbours
+        neighbours = tree.query_radius(Xb, tree_radius)
+        n = np.array([i.size for i in neighbours])
+        ids = np.repeat(np.arange(nb), n)
+        ind = np.concatenate(neighbours).astype(int)
+        k = _cauchy_kernel(distance(Xb[ids], X[ind]), norm)
+        sums[block] += np.bincount(ids, weights=k - K[ids, labels[ind]], minlength=nb)
+        # the remaining (far) points within each cell lie between the truncation
+        # radius and the far edge of the cell, which bounds their kernel values
+        far = counts[np.newaxis, :] - np.bincount(
+            ids * ncells + labels[ind], minlength=nb * ncells
+        ).reshape(nb, ncells)
+        upper = _cauchy_kernel(np.maximum(D - cell_radii, radius), norm)
+        lower = _cauchy_kernel(D + cell_radii, norm)
+        errors[block] = (far * np.maximum(upper - K, K - lower)).sum(axis=1)
+    return sums, errors
+
+
+def _cell_centres(X, labels, spherical=False):
+    """
+    Get the centres of cells of points.
+
+    Parameters
+    -----------
+    X : :class:`numpy.ndarray`
+        Points.
+    labels : :class:`numpy.ndarray`
+        Integer index of the cell for each point.
+    spherical : :class:`bool`
+        Whether the points are unit vectors, in which case the centres will be
+        projected back onto the sphere.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+    """
+    ncells = labels.max() + 1
+    centres = (
+        np.vstack([np.bincount(labels, weights=x, minlength=ncells) for x in X.T]).T
+        / np.bincount(labels, minlength=ncells)[:, np.newaxis]
+    )
+    if spherical:
+        centres /= np.linalg.norm(centres, axis=1)[:, np.newaxis]
+    return centres
+
+
+def _approximate_spatiotemporal_kernel_sums(
+    latlong,
+    ages,
+    spatial_norm=1.8,
+    temporal_norm=38,
+    truncation=10,
+    max_block_memory=2**27,
+):
+    """
+    Approximate the sums of normalised inverse spatial and temporal distances for
+    each point. Kernel values are calculated exactly for neighbours within a
+    multiple of the normalising constants (found using a
+    :class:`~sklearn.neighbors.BallTree` on the sphere for positions and a
+    :class:`~sklearn.neighbors.KDTree` for ages), and for more distant points are
+    approximated from the centres of grid cells half the width of this radius.
+
+    Parameters
+    -----------
+    latlong : :class:`numpy.ndarray`
+        Array of latitudes and longitudes, in degrees.
+    ages : :class:`numpy.ndarray`
+        Array of ages.
+    spatial_norm : :class:`float`
+        Normalising constant for spatial measures (arc degrees).
+    temporal_norm : :class:`float`
+        Normalising constant for temporal measures.
+    truncation : :class:`float`
+        Multiple of the normalising constants within which kernel values are
+        calculated exactly.
+    max_block_memory : :class:`int`
+        Memory budget for a single block of points, in bytes.
+
+    Returns
+    -------
+    sums, errors : :class:`numpy.ndarray`
+        Estimated sums of normalised inverse distances and bounds on their absolute
+        error.
+    """
+    if not HAVE_SKL:
+        raise ImportError("Requires scikit-learn.")
+    latlong = np.asarray(latlong).astype(float)
+    t = np.asarray(ages).astype(float)
+    size = t.size
+    sums, errors = np.zeros(size), np.zeros(size)
+    # spatial component, using unit vectors on the sphere
+    fltr = np.isfinite(latlong).all(axis=1)
+    # points with missing positions contribute unity to the sums for every point
+    sums[~fltr] += size
+    if fltr.any():
+        radius = min(truncation * spatial_norm, 180.0)
+        φ, λ = np.deg2rad(latlong[fltr]).T
+        X = np.vstack([np.cos(φ) * np.cos(λ), np.cos(φ) * np.sin(λ), np.sin(φ)]).T
+        cell = np.floor((latlong[fltr] + [90, 180]) / (radius / 2)).astype(int)
+        labels = np.unique(cell, axis=0, return_inverse=True)[1].flatten()
+        _sums, _errors = _truncated_kernel_sums(
+            X,
+            labels,
+            _cell_centres(X, labels, spherical=True),
+            _angular_distance,
+            BallTree(X),
+            2 * np.sin(np.deg2rad(radius) / 2),  # chord length
+            radius,
+            spatial_norm,
+            max_block_memory=max_block_memory,
+        )
+        sums[fltr] += _sums + (~fltr).sum()
+        errors[fltr] += _errors
+    # temporal component
+    fltr = np.isfinite(t)
+    sums[~fltr] += size
+    if fltr.any():
+        radius = truncation * temporal_norm
+        T = t[fltr][:, np.newaxis]
+        labels = np.unique(
+            np.floor((T[:, 0] - T.min()) / (radius / 2)), return_inverse=True
+        )[1]
+        _sums, _errors = _truncated_kernel_sums(
+            T,
+            labels,
+            _cell_centres(T, labels),
+            _absolute_distance,
+            KDTree(T),
+            radius,
+            radius,
+            temporal_norm,
+            max_block_memory=max_block_memory,
+        )
+        sums[fltr] += _sums + (~fltr).sum()
+        errors[fltr] += _errors
+    return sums, errors
+
+
 def get_spatiotemporal_resampling_weights(
     df,
     spatial_norm=1.8,
@@ -85,6 +436,10 @@ def get_spatiotemporal_resampling_weights(
     age_name="Age",
     max_memory_fraction=0.25,
     normalized_weights=True,
+    max_block_memory=2**27,
+    approximate=False,
+    truncation=10,
+    return_error_bounds=False,
     **kwargs
 ):
     """
@@ -104,17 +459,32 @@ def get_spatiotemporal_resampling_weights(
     age_name : :class:`str`
         Column name corresponding to geological age or time.
     max_memory_fraction : :class:`float`
-        Constraint to switch to calculating mean distances where :code:`matrix=True`
-        and the distance matrix requires greater than a specified fraction of total
-        avaialbe physical memory. This is passed on to
-        :func:`~pyrolite.util.spatial.great_circle_distance`.
+        Maximum fraction of total physical memory to use for a single block of the
+        distance calculation (where this can be established).
     normalized_weights : :class:`bool`
         Whether to renormalise weights to unity.
+    max_block_memory : :class:`int`
+        Memory budget (in bytes) for a single block of the distance calculation.
+        Distances are calculated for blocks of rows and summed as they go, such that
+        the full distance matrices are never held in memory.
+    approximate : :class:`bool`
+        Whether to approximate the weights using spatial indexes and a truncated
+        kernel, rather than calculating all pairwise distances. Requires
+        :mod:`sklearn`.
+    truncation : :class:`float`
+        Multiple of the spatial and temporal normalising constants within which
+        kernel values are calculated exactly, where :code:`approximate=True`.
+    return_error_bounds : :class:`bool`
+        Whether to also return bounds for the relative error of each of the weights.
+        These will be zero unless :code:`approximate=True`.
 
     Returns
     --------
     weights : :class:`numpy.ndarray`
         Sampling weights.
+    errors : :class:`numpy.ndarray`
+        Bounds on the relative error of each of the weights, returned where
+        :code:`return_error_bounds=True`.
 
     Notes
     ------
@@ -124,38 +494,93 @@ def get_spatiotemporal_resampling_weights(
 
         W_i \\propto 1 \\Big / \\sum_{j=1}^{n} \\Big ( \\frac{1}{((z_i - z_j)/a)^2 + 1} + \\frac{1}{((t_i - t_j)/b)^2 + 1} \\Big )
 
-
+    Where :code:`approximate=True`, kernel terms for points beyond the truncation
+    radius are evaluated at the centres of grid cells, and as each of these points
+    lies between the truncation radius and the far edge of its cell, this gives a
+    strict bound on the error of each sum :math:`e_i`. The relative error of the
+    unnormalised weights is then bounded by :math:`\\delta_i = e_i / \\hat{S}_i`,
+    and that of the normalised weights by
+    :math:`(\\delta_i + \\delta_{max}) / (1 - \\delta_{max})`.
     """
+    if virtual_memory is not None:
+        max_block_memory = min(
+            max_block_memory, virtual_memory().total * max_memory_fraction
+        )
+    latlong, ages = df[[*latlong_names]].values, df[age_name].values
+    if approximate:
+        sums, errors = _approximate_spatiotemporal_kernel_sums(
+            latlong,
+            ages,
+            spatial_norm=spatial_norm,
+            temporal_norm=temporal_norm,
+            truncation=truncation,
+            max_block_memory=max_block_memory,
+        )
+    else:
+        gc_kwargs = subkwargs(kwargs, great_circle_distance)
+        sums = _spatiotemporal_kernel_sums(
+            latlong,
+            ages,
+            spatial_norm=spatial_norm,
+            temporal_norm=temporal_norm,
+            method=gc_kwargs.get("method"),
+            dtype=gc_kwargs.get("dtype", "float32"),
+            max_block_memory=max_block_memory,
+        )
+        errors = np.zeros_like(sums)
 
-    weights = pd.Series(index=df.index, dtype="float")
-    z = great_circle_distance(
-        df[[*latlong_names]],
-        absolute=False,
-        max_memory_fraction=max_memory_fraction,
-        **subkwargs(kwargs, great_circle_distance)
-    )  # angular distances
-
-    _invnormdistances = np.zeros_like(z)
-    # where the distances are zero, these weights will go to inf
-    # instead we replace with the smallest non-zero distance/largest non-inf
-    # inverse weight
-    norm_inverse_distances = 1.0 / ((z / spatial_norm) ** 2 + 1)
-    norm_inverse_distances[~np.isfinite(norm_inverse_distances)] = 1
-
-    _invnormdistances += norm_inverse_distances
+    weights = 1.0 / sums
+    errors = errors / sums
+    if normalized_weights:
+        weights = weights / weights.sum()
+        errors = (errors + errors.max()) / (1 - errors.max())
+    if return_error_bounds:
+        return weights, errors
+    return weights
 
-    # ages - might want to split this out as optional for spatial resampling only?
-    t = univariate_distance_matrix(df[age_name])
 
-    norm_inverse_time = 1.0 / ((t / temporal_norm) ** 2 + 1)
-    norm_inverse_time[~np.isfinite(norm_inverse_time)] = 1
+def _get_age_uncertainty(
+    df,
+    min_sigma=50,
+    age_uncertainty_name="AgeUncertainty",
+    min_age_name="MinAge",
+    max_age_name="MaxAge",
+):
+    """
+    Get uncertainties for a series of geological ages based on specified
+    uncertainties or age ranges.
 
-    _invnormdistances += norm_inverse_time
+    Parameters
+    -----------
+    df : :class:`pandas.DataFrame`
+        Dataframe with age data within which to look up uncertainties.
+    min_sigma : :class:`float`
+        Minimum uncertainty, used where uncertainties are smaller or missing.
+    age_uncertainty_name : :class:`str`
+        Name of the column specifiying absolute age uncertainties.
+    min_age_name : :class:`str`
+        Name of the column specifying minimum absolute ages (used where uncertainties
+        are otherwise unspecified).
+    max_age_name : :class:`str`
+        Name of the column specifying maximum absolute ages (used where uncertainties
+        are otherwise unspecified).
 
-    weights = 1.0 / np.sum(_invnormdistances, axis=0)
-    if normalized_weights:
-        weights = weights / weights.sum()
-    return weights
+    Returns
+    --------
+    :class:`numpy.ndarray`
+        Age uncertainties.
+    """
+    try:
+        age_uncertainty = df[age_uncertainty_name].values.astype(float)
+    except KeyError:
+        # otherwise get age uncertainties from min and max ages (half bin width)
+        age_uncertainty = (
+            np.abs(df[max_age_name] - df[min_age_name]).values.astype(float) / 2
+        )
+    age_uncertainty[
+        ~np.isfinite(age_uncertainty) | (age_uncertainty < min_sigma)
+    ] = min_sigma
+    return age_uncertainty
 
 
 def add_age_noise(
@@ -202,26 +627,153 @@ def add_age_noise(
     This modifies the dataframe which is input - be aware of this if using outside
     of the bootstrap resampling for which this was designed.
     """
-    # try and get age uncertainty
-    try:
-        age_uncertainty = df[age_uncertainty_name]
-    except KeyError:
-        # otherwise get age min age max
-        # get age uncertainties
-        age_uncertainty = (
-            np.abs(df[max_age_name] - df[min_age_name]) / 2
-        )  # half bin width
-    age_uncertainty[
-        ~np.isfinite(age_uncertainty) | age_uncertainty < min_sigma
-    ] = min_sigma
+    age_uncertainty = _get_age_uncertainty(
+        df,
+        min_sigma=min_sigma,
+        age_uncertainty_name=age_uncertainty_name,
+        min_age_name=min_age_name,
+        max_age_name=max_age_name,
+    )
     # generate gaussian age noise
-    age_noise = np.random.randn(df.index.size) * age_uncertainty.values
+    age_noise = np.random.randn(df.index.size) * age_uncertainty
     age_noise *= noise_level  # scale the noise
     # add noise to ages
     df[age_name] += age_noise
     return df
 
 
+# state for bootstrap resampling, set within each worker process
+_BOOTSTRAP_STATE = {}
+
+
+def _init_bootstrap_worker(state):
+    """
+    Initialize a worker process for bootstrap resampling with the (read-only) data
+    and configuration shared by all iterations, such that these are transferred
+    once per process rather than once per task.
+
+    Parameters
+    -----------
+    state : :class:`dict`
+        Data and configuration for the bootstrap resampling.
+    """
+    _BOOTSTRAP_STATE.clear()
+    _BOOTSTRAP_STATE.update(state)
+
+
+def _grouped_metric(X, codes, ngroups, metric):
+    """
+    Calculate a (missing-data aware) summary metric for the columns of an array
+    for each of a number of groups.
+
+    Parameters
+    -----------
+    X : :class:`numpy.ndarray`
+        2D array of values.
+    codes : :class:`numpy.ndarray`
+        Integer group index for each row, with negative values indicating rows which
+        belong to no group.
+    ngroups : :class:`int`
+        Number of groups.
+    metric : :class:`str`
+        Metric to calculate, one of :code:`{'count', 'sum', 'mean', 'var', 'std'}`.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Array of shape :code:`(ngroups, X.shape[1])`.
+    """
+    m = X.shape[1]
+    valid = np.isfinite(X) & (codes >= 0)[:, np.newaxis]
+    bins = (codes[:, np.newaxis] * m + np.arange(m)[np.newaxis, :])[valid]
+
+    def _sum(values):
+        return np.bincount(bins, weights=values[valid], minlength=ngroups * m).reshape(
+            ngroups, m
+        )
+
+    count = np.bincount(bins, minlength=ngroups * m).reshape(ngroups, m)
+    if metric == "count":
+        return count
+    total = _sum(X)
+    if metric == "sum":
+        return total
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        if metric == "mean":
+            return mean
+        var = _sum((X - mean[np.maximum(codes, 0)]) ** 2) / (count - 1)
+    if metric == "var":
+        return var
+    return np.sqrt(var)
+
+
+_GROUPED_METRICS = ["count", "sum", "mean", "var", "std"]
+
+
+def _bootstrap_iterations(seeds, state=None):
+    """
+    Run a set of bootstrap resampling iterations, each seeded independently.
+
+    Parameters
+    -----------
+    seeds : :class:`list`
+        List of :class:`numpy.random.SeedSequence` for the iterations.
+    state : :class:`dict`
+        Data and configuration for the bootstrap resampling. If not specified, that
+        of the current worker process will be used.
+
+    Returns
+    -------
+    :class:`list`
+        List of tuples of metric values (a dictionary of arrays of shape
+        :code:`(ngroups, ncolumns)`) and the groups present for each iteration.
+    """
+    state = _BOOTSTRAP_STATE if state is None else state
+    X, cdf, codes, ngroups = state["X"], state["cdf"], state["codes"], state["ngroups"]
+    uncert, noise_level = state["uncert"], state["noise_level"]
+    n, m = X.shape
+    results = []
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        # take a new sample with replacement equal in size to the original data
+        idx = np.searchsorted(cdf, rng.random(n) * cdf[-1], side="right")
+        smpl = X[idx]
+        if state["age_sigma"] is not None:
+            smpl[:, state["age_ix"]] += (
+                rng.standard_normal(n) * state["age_sigma"][idx] * noise_level
+            )
+        if state["transform"] is not None:
+            smpl = np.array([state["transform"](col) for col in smpl.T]).T.reshape(n, m)
+        if state["bootstrap_method"] is not None:  # smooth bootstrap
+            noise = rng.standard_normal((n, m)) * noise_level
+            if uncert is None:
+                noise *= smpl * state["default_uncertainty"]
+            else:
+                noise *= uncert if uncert.ndim < 2 else uncert[idx]
+                if state["relative_uncertainties"]:
+                    noise *= smpl
+            smpl += noise
+
+        smpl_codes = codes[idx]
+        values = {}
+        for name, metric in state["metrics"].items():
+            if isinstance(metric, str) and metric in _GROUPED_METRICS:
+                values[name] = _grouped_metric(smpl, smpl_codes, ngroups, metric)
+            else:
+                fltr = smpl_codes >= 0
+                values[name] = (
+                    pd.DataFrame(smpl[fltr])
+                    .groupby(smpl_codes[fltr])
+                    .agg(metric)
+                    .reindex(range(ngroups))
+                    .values
+                )
+        present = np.bincount(smpl_codes[smpl_codes >= 0], minlength=ngroups) > 0
+        results.append((values, present))
+    return results
+
+
 def spatiotemporal_bootstrap_resample(
     df,
     columns=None,
@@ -238,6 +790,9 @@ def spatiotemporal_bootstrap_resample(
     noise_level=1,
     age_name="Age",
     latlong_names=["Latitude", "Longitude"],
+    processes=None,
+    backend="process",
+    random_state=None,
     **kwargs
 ):
     """
@@ -262,8 +817,9 @@ def spatiotemporal_bootstrap_resample(
         List of sample categories to group the ouputs by, which has the same size as the
         dataframe index.
     transform
-        Callable function to transform input data prior to aggregation functions. Note
-        that the outputs will need to be inverse-transformed.
+        Callable function to transform input data prior to aggregation functions. This
+        is applied to each column (as a :class:`numpy.ndarray`). Note that the outputs
+        will need to be inverse-transformed.
     bootstrap_method : :class:`str`
         Which method to use to add gaussian noise to the input dataset parameters.
     add_gaussian_age_noise : :class:`bool`
@@ -282,6 +838,17 @@ def spatiotemporal_bootstrap_resample(
     latlong_names : :class:`list`
         Column names for latitude and longitude, or equvalent orthogonal spherical
         spatial measures.
+    processes : :class:`int`
+        Number of workers to distribute the resampling iterations across. By default
+        (:code:`None`), iterations are run serially.
+    backend : :class:`str`, :code:`{'process', 'thread'}`
+        Whether to distribute resampling iterations across a pool of processes or
+        threads.
+    random_state : :class:`int` | :class:`numpy.random.SeedSequence`
+        Seed for the resampling. Each iteration is seeded with an independent child
+        of this seed, such that results are reproducible regardless of the number of
+        workers. If not specified, a seed is drawn from the global :mod:`numpy.random`
+        state.
 
     Returns
     --------
@@ -289,6 +856,16 @@ def spatiotemporal_bootstrap_resample(
         Dictionary of aggregated Dataframe(s) indexed by statistical metrics. If
         categories are specified, the dataframe(s) will have a hierarchical index of
         :code:`categories, iteration`.
+
+    Notes
+    ------
+    Rather than copying the dataframe for each iteration, the data to be resampled is
+    held in a single (read-only) array which is indexed by each iteration, and
+    which is transferred once to each worker. Common metrics (:code:`'count'`,
+    :code:`'sum'`, :code:`'mean'`, :code:`'var'` and :code:`'std'`) are calculated
+    directly from these arrays, and other metrics are passed to
+    :meth:`pandas.DataFrame.agg`. Results are accumulated as each batch of
+    iterations completes.
     """
 
     # uncertainty managment ############################################################
@@ -308,6 +885,7 @@ def spatiotemporal_bootstrap_resample(
             # shape should be equal to parameter column number by rows
         else:
             raise NotImplementedError("Unknown format for uncertainties.")
+        uncert = np.asarray(uncert, dtype=float)
     # weighting ########################################################################
     # generate some weights for resampling - here addressing specifically spatial
     # and temporal resampling
@@ -318,8 +896,13 @@ def spatiotemporal_bootstrap_resample(
             latlong_names=latlong_names,
             **subkwargs(kwargs, get_spatiotemporal_resampling_weights)
         )
+    if isinstance(weights, pd.Series):
+        weights = weights.reindex(df.index)
+    weights = np.asarray(weights, dtype=float)
+    weights[~np.isfinite(weights)] = 0  # missing weights won't be sampled
 
     # to efficiently manage categories we can make sure we have an iterable here
+    category_name = None
     if categories is not None:
         if isinstance(categories, (list, tuple, pd.Series, np.ndarray)):
             pass
@@ -328,6 +911,12 @@ def spatiotemporal_bootstrap_resample(
         else:
             msg = "Categories unrecognized"
             raise NotImplementedError(msg)
+        if isinstance(categories, pd.Series):
+            category_name = categories.name
+            categories = categories.reindex(df.index)
+        codes, category_values = pd.factorize(np.asarray(categories), sort=True)
+    else:
+        codes, category_values = np.zeros(df.index.size, dtype=int), np.array([None])
     # column selection #################################################################
     # get the subset of parameters to be resampled, removing spatial and age names
     # and only taking numeric data
@@ -338,98 +927,105 @@ def spatiotemporal_bootstrap_resample(
         and np.issubdtype(df.dtypes[c], np.number)
     ]
 
+    # whether to add parameter noise, and if so which method to use?
+    # TODO: Update the naming of this? this is only one part of the bootstrap process
+    if bootstrap_method is not None:
+        if (bootstrap_method.upper() == "GP") or (
+            "process" in bootstrap_method.lower()
+        ):
+            # gaussian process regression to adapt to covariance matrix
+            msg = "Gaussian Process boostrapping not yet implemented."
+            raise NotImplementedError(msg)
+        elif bootstrap_method.lower() != "smooth":
+            msg = "Bootstrap method {} not recognised.".format(bootstrap_method)
+            raise NotImplementedError(msg)
+
+    # whether to specfically add noise to the geological ages
+    # note that the metadata around age names are passed through to this function
+    # TODO: Update to have external disambiguation of ages/min-max ages,
+    # and just pass an age series to this function.
+    age_sigma, age_ix = None, None
+    if add_gaussian_age_noise and age_name in subset:
+        age_ix = list(subset).index(age_name)
+        age_sigma = _get_age_uncertainty(
+            df, min_sigma=50, **subkwargs(kwargs, _get_age_uncertainty)
+        )
+
     # resampling #######################################################################
     def _metric_name(metric):
         return repr(metric).replace("'", "")
 
-    metric_data = {_metric_name(metric): [] for metric in metrics}
-    # samples are independent, so this could be processed in parallel
-    for repeat in range(niter):
-        # take a new sample with replacement equal in size to the original dataframe
-        smpl = df.sample(weights=weights, frac=1, replace=True)
-
-        # whether to specfically add noise to the geological ages
-        # note that the metadata around age names are passed through to this function
-        # TODO: Update to have external disambiguation of ages/min-max ages,
-        # and just pass an age series to this function.
-        if add_gaussian_age_noise:
-            smpl = add_age_noise(
-                smpl,
-                min_sigma=50,
-                age_name=age_name,
-                noise_level=noise_level,
-                **subkwargs(kwargs, add_age_noise)
-            )
+    state = dict(
+        X=df[subset].values.astype(float),
+        cdf=np.cumsum(weights),
+        codes=codes,
+        ngroups=category_values.size,
+        uncert=uncert,
+        noise_level=noise_level,
+        age_sigma=age_sigma,
+        age_ix=age_ix,
+        transform=transform,
+        bootstrap_method=bootstrap_method,
+        default_uncertainty=default_uncertainty,
+        relative_uncertainties=relative_uncertainties,
+        metrics={_metric_name(metric): metric for metric in metrics},
+    )
+    if not isinstance(random_state, np.random.SeedSequence):
+        if random_state is None:
+            random_state = np.random.randint(np.iinfo(np.int32).max)
+        random_state = np.random.SeedSequence(random_state)
+    # samples are independent, so can be processed in parallel in batches
+    seeds = random_state.spawn(niter)
+    batchsize = max(1, int(np.ceil(niter / (4 * (processes or 1)))))
+    batches = [seeds[ix : ix + batchsize] for ix in range(0, niter, batchsize)]
 
-        # transform the parameters to be estimated before adding parameter noise?
-        if transform is not None:
-            smpl[subset] = smpl[subset].apply(transform, axis="index")
-
-        # whether to add parameter noise, and if so which method to use?
-        # TODO: Update the naming of this? this is only one part of the bootstrap process
-        if bootstrap_method is not None:
-            # try to get uncertainties for the data, otherwise use standard deviations?
-            if bootstrap_method.lower() == "smooth":
-                # add random noise within uncertainty bounds
-                # this is essentially smoothing
-                # consider modulating the noise model using the covariance structure?
-                # this could be done by individual group to preserve varying covariances
-                # between groups?
-                if uncert is None:
-                    noise = (
-                        smpl[subset].values
-                        * default_uncertainty
-                        * np.random.randn(*smpl[subset].shape)
-                    ) * noise_level
-                else:
-                    noise = np.random.randn(*smpl[subset].shape) * noise_level
-                    if uncertainty_type in ["0D", "1D"]:
-                        # this should work if a float or series is passed
-                        noise *= uncert
-                    else:
-                        # need to get indexes of the sample to look up uncertainties
-                        # need to extract indexes for the uncertainties, which might be arrays
-                        arr_idxs = df.index.take(smpl.index).values
-                        noise *= uncert[arr_idxs, :]
-
-                    if relative_uncertainties:
-                        noise *= smpl[subset].values
-
-                smpl[subset] += noise
-            elif (bootstrap_method.upper() == "GP") or (
-                "process" in bootstrap_method.lower()
-            ):
-                # gaussian process regression to adapt to covariance matrix
-                msg = "Gaussian Process boostrapping not yet implemented."
-                raise NotImplementedError(msg)
-            else:
-                msg = "Bootstrap method {} not recognised.".format(bootstrap_method)
-                raise NotImplementedError(msg)
-
-        # whether to independently estimate metric values for individual categories?
-        # TODO: Should the categories argument be used to generate indiviudal
-        # bootstrap resampling processes?
-        if categories is not None:
-            for metric in metrics:
-                metric_data[_metric_name(metric)].append(
-                    smpl[subset].groupby(categories).agg(metric)
-                )
+    metric_data = {
+        name: np.full((niter, category_values.size, len(subset)), np.nan)
+        for name in state["metrics"]
+    }
+    present = np.zeros((niter, category_values.size), dtype=bool)
 
-        else:  # generate the metric summaries for the overall dataset
-            for metric in metrics:
-                metric_data[_metric_name(metric)].append(smpl[subset].agg(metric))
+    def _collect(results):
+        # accumulate batches of results as they complete
+        iteration = 0
+        for batch in results:
+            for values, _present in batch:
+                for name, value in values.items():
+                    metric_data[name][iteration] = value
+                present[iteration] = _present
+                iteration += 1
+
+    if processes is None or processes <= 1:
+        _collect(map(partial(_bootstrap_iterations, state=state), batches))
+    elif backend == "thread":
+        with ThreadPool(processes) as p:
+            _collect(p.imap(partial(_bootstrap_iterations, state=state), batches))
+    elif backend == "process":
+        with Pool(
+            processes, initializer=_init_bootstrap_worker, initargs=(state,)
+        ) as p:
+            _collect(p.imap(_bootstrap_iterations, batches))
+    else:
+        msg = "Backend {} not recognised.".format(backend)
+        raise NotImplementedError(msg)
 
     # where the whole dataset is presented
     if categories is not None:
-        # the dataframe will be indexed by iteration of the bootstrap
+        # the dataframe will be indexed by categories and iteration
+        iterations, groups = np.nonzero(present)
+        index = pd.MultiIndex.from_arrays(
+            [category_values[groups], iterations], names=[category_name, "Iteration"]
+        )
         return {
-            metric: pd.concat(data, keys=range(niter), names=["Iteration"])
-            .swaplevel(0, 1)
-            .sort_index()
+            metric: pd.DataFrame(
+                data[present], index=index, columns=subset
+            ).sort_index()
             for metric, data in metric_data.items()
         }
 
     else:
-        # the dataframe will be indexed by categories and iteration
-        # TODO: add iteration level to this index?
-        return {metric: pd.DataFrame(data) for metric, data in metric_data.items()}
+        # the dataframe will be indexed by iteration of the bootstrap
+        return {
+            metric: pd.DataFrame(data[:, 0, :], columns=subset)
+            for metric, data in metric_data.items()
+        }
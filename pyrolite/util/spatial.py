@@ -32,7 +32,7 @@ def _get_sqare_grid_segment_indicies(size, segments):
     """
     seg_size = size // segments
     segx = [(seg_size * ix, seg_size * (ix + 1)) for ix in range(segments)]
-    segx[-1] = (seg_size * (segments - 1), size - 1)
+    segx[-1] = (seg_size * (segments - 1), size)
     return [[*a, *b] for a, b in itertools.product(segx, segx)]
 
 
@@ -113,6 +113,30 @@ def _segmented_spatial_distance_matrix(
     return angle
 
 
+def _get_GC_distance_function(method=None):
+    """
+    Get the function used to calculate great circle distances (as central angles).
+
+    Parameters
+    ----------
+    method : :class:`str`, :code:`{'vicenty', 'cosines', 'haversine'}`
+        Which method to use for great circle distance calculation. Defaults to the
+        Vicenty formula.
+
+    Returns
+    -------
+    Callable function f(φ1, φ2, λ1, λ2) returning central angles in radians.
+    """
+    if method is None:
+        return _vicenty_GC_distance
+    if method.lower().startswith("cos"):
+        return _spherical_law_cosinse_GC_distance
+    elif method.lower().startswith("hav"):
+        return _haversine_GC_distance
+    else:  # Default to most precise
+        return _vicenty_GC_distance
+
+
 def great_circle_distance(
     a,
     b=None,
@@ -165,15 +189,7 @@ def great_circle_distance(
     φ1, φ2 = a[:, 0], b[:, 0]  # latitudes
     λ1, λ2 = a[:, 1], b[:, 1]  # longitudes
 
-    if method is None:
-        f = _vicenty_GC_distance
-    else:
-        if method.lower().startswith("cos"):
-            f = _spherical_law_cosinse_GC_distance
-        elif method.lower().startswith("hav"):
-            f = _haversine_GC_distance
-        else:  # Default to most precise
-            f = _vicenty_GC_distance
+    f = _get_GC_distance_function(method)
 
     if matrix:
         # if matrix mode we need to turn these 1d arrays into 2d
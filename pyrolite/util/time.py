@@ -208,7 +208,55 @@ class Timescale(object):
         )
         # should check that the keys are unique across all of these
         self.locate.update(dict(ChainMap(*dicts)))
+        self._aliases = pd.DataFrame.from_dict(
+            dict(self.locate), orient="index", columns=["Start", "End"]
+        )
         self.data = self.data.set_index("Ident")
+        self._build_intervals()
+
+    def _build_intervals(self):
+        """
+        Build sorted arrays of interval boundaries from the timescale, and the row of
+        the timescale corresponding to each boundary and to the intervals between
+        them for each level, such that ages can be located by bisection.
+        """
+        starts, ends = self.data.Start.values, self.data.End.values
+        breaks = np.unique(np.concatenate([starts, ends]))
+        self._breaks = breaks[np.isfinite(breaks)]
+        # representative ages: each boundary (even) and the midpoints between (odd)
+        points = np.empty(2 * self._breaks.size - 1)
+        points[::2] = self._breaks
+        points[1::2] = (self._breaks[:-1] + self._breaks[1:]) / 2
+        within = (starts[None, :] >= points[:, None]) & (
+            ends[None, :] <= points[:, None]
+        )
+        self._interval_rows = {}
+        for level in self.levels + ["Specific"]:
+            if level == "Specific":  # the last of the relevant rows
+                valid = within
+                rows = valid.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+            else:  # the first relevant row with a name at this level
+                valid = within & ~pd.isnull(self.data[level].values)[None, :]
+                rows = np.argmax(valid, axis=1)
+            rows[~valid.any(axis=1)] = -1
+            self._interval_rows[level] = rows
+
+    def _locate_rows(self, ages, level="Specific"):
+        """
+        Get the row of the timescale corresponding to an array of ages at a specific
+        level, with -1 for ages outside the timescale.
+        """
+        ages = np.asarray(ages, dtype=float)
+        rows = self._interval_rows[level]
+        ix = np.searchsorted(self._breaks, ages, side="left")
+        on_boundary = ix < self._breaks.size
+        on_boundary[on_boundary] = self._breaks[ix[on_boundary]] == ages[on_boundary]
+        # interval index: boundaries are even, the intervals between them are odd
+        interval = np.where(on_boundary, 2 * ix, 2 * ix - 1)
+        inside = on_boundary | ((ix > 0) & (ix < self._breaks.size))
+        out = np.full(ages.shape, -1, dtype=int)
+        out[inside] = rows[interval[inside]]
+        return out
 
     def text2age(self, entry, nulls=[None, "None", "none", np.nan, "NaN"]):
         """
@@ -233,6 +281,75 @@ class Timescale(object):
         except ValueError:
             return self.locate[entry.lower().strip()]
 
+    def text2ages(self, entries):
+        """
+        Converts a series of text-based ages to the corresponding age ranges (in Ma).
+
+        Parameters
+        ------------
+        entries : :class:`pandas.Series` | :class:`list`
+            Series of string names for geological age ranges, or numeric ages.
+
+        Returns
+        -------
+        :class:`pandas.DataFrame`
+            Dataframe with the maximum (:code:`Start`) and minimum (:code:`End`) ages
+            for each entry, with null values for unknown ages.
+        """
+        entries = pd.Series(entries)
+        numeric = pd.to_numeric(entries, errors="coerce")
+        names = entries.where(numeric.isnull()).dropna().astype(str)
+        ranges = self._aliases.reindex(names.str.lower().str.strip().values)
+        out = pd.DataFrame(
+            {"Start": numeric.values, "End": numeric.values},
+            index=entries.index,
+            dtype="float",
+        )
+        out.loc[names.index, ["Start", "End"]] = ranges.values
+        return out
+
+    def named_ages(self, ages, level="Specific", **kwargs):
+        """
+        Converts an array of numeric ages (in Ma) to named ages at a specific level.
+
+        Parameters
+        ----------
+        ages : :class:`numpy.ndarray` | :class:`pandas.Series` | :class:`list`
+            Numeric ages in Ma.
+        level : :class:`str`, :code:`{'Eon', 'Era', 'Period', 'Superepoch', 'Epoch', 'Age', 'Specific'}`
+            Level of specificity.
+
+        Returns
+        -------
+        :class:`pandas.Categorical` | :class:`pandas.Series`
+            Categorical array of names, with null values for ages outside the
+            timescale. Where a series is passed, a categorical series with the same
+            index will be returned.
+        """
+        level = titlecase(level)
+        rows = self._locate_rows(np.asarray(ages, dtype=float).ravel(), level=level)
+        found, codes = np.unique(rows, return_inverse=True)
+        if level == "Specific":
+            levels = self.data.loc[:, self.levels].values
+            names = [
+                (
+                    age_name([v for v in levels[r] if not pd.isnull(v)], **kwargs)
+                    if r >= 0
+                    else np.nan
+                )
+                for r in found
+            ]
+            categories = pd.unique(pd.Series([n for n in names if not pd.isnull(n)]))
+        else:
+            column = self.data[level].values
+            names = [column[r] if r >= 0 else np.nan for r in found]
+            categories = pd.unique(self.data[level].dropna())
+        values = np.array(names, dtype="object")[codes.ravel()]
+        out = pd.Categorical(values, categories=categories)
+        if isinstance(ages, pd.Series):
+            return pd.Series(out, index=ages.index, name=ages.name)
+        return out
+
     def named_age(self, age, level="Specific", **kwargs):
         """
         Converts a numeric age (in Ma) to named age at a specific level.
@@ -249,24 +366,7 @@ class Timescale(object):
         :class:`str`
             String representation for the entry.
         """
-
-        level = titlecase(level)
-
-        def wthn_rng(x):
-            return (age <= x.Start) & (age >= x.End)
-
-        relevant = self.data.loc[self.data.apply(wthn_rng, axis=1).values, :]
-        if level == "Specific":  # take the rightmost grouping
-            relevant = relevant.loc[:, self.levels]
-            counts = (~pd.isnull(relevant)).count(axis=1)
-            if sum(counts == counts.max()) > 1:
-                idx_rel_row = counts.index[
-                    max([ix for (ix, r) in enumerate(counts) if r == counts.iloc[0]])
-                ]
-            else:
-                idx_rel_row = counts.idxmax()
-            rel_row = relevant.loc[idx_rel_row, :]
-            return age_name(rel_row[~pd.isnull(rel_row)].to_list(), **kwargs)
-        else:
-            unique_values = relevant.loc[:, level].unique()
-            return unique_values[~pd.isnull(unique_values)][0]
+        name = self.named_ages([age], level=level, **kwargs)[0]
+        if pd.isnull(name):
+            raise ValueError("Age {} not found within the timescale.".format(age))
+        return name
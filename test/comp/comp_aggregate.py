@@ -247,6 +247,28 @@ class TestCrossRatios(unittest.TestCase):
         self.assertTrue((out[np.isfinite(out)] > 0).all())
         self.assertTrue(out.shape == (n, self.d, self.d))
 
+    def test_values(self):
+        out = cross_ratios(self.df)
+        X = self.df.values
+        self.assertTrue(np.allclose(out[:, 1, 2], X[:, 1] / X[:, 2]))
+
+    def test_dtype(self):
+        out = cross_ratios(self.df, dtype="float32")
+        self.assertEqual(out.dtype, np.float32)
+        self.assertTrue(np.allclose(out, cross_ratios(self.df), equal_nan=True))
+
+    def test_lazy(self):
+        """Checks the lazy view is consistent with the full array."""
+        out = cross_ratios(self.df)
+        view = cross_ratios(self.df, lazy=True)
+        self.assertEqual(view.shape, out.shape)
+        self.assertTrue(np.allclose(np.asarray(view), out, equal_nan=True))
+        keys = [(2,), (2, 1), (2, 1, 3), (slice(None), 1, 3), (slice(1, 4), [0, 2])]
+        for key in keys:
+            with self.subTest(key=key):
+                self.assertTrue(np.allclose(view[key], out[key], equal_nan=True))
+        self.assertTrue(np.allclose(view.pairs([0, 1], [2, 3]), out[:, [0, 1], [2, 3]]))
+
 
 class TestNPCrossRatios(unittest.TestCase):
     """Tests numpy cross ratios utility."""
@@ -291,6 +313,29 @@ class TestNPCrossRatios(unittest.TestCase):
         self.assertTrue((out[np.isfinite(out)] > 0).all())
         self.assertTrue(out.shape == (n, self.d, self.d))
 
+    def test_values(self):
+        X = self.df.values
+        out = np_cross_ratios(X)
+        self.assertTrue(np.allclose(out[:, 1, 2], X[:, 2] / X[:, 1]))
+
+    def test_dtype(self):
+        arr = self.df.values
+        out = np_cross_ratios(arr, dtype="float32")
+        self.assertEqual(out.dtype, np.float32)
+        self.assertTrue(np.allclose(out, np_cross_ratios(arr), equal_nan=True))
+
+    def test_lazy(self):
+        """Checks the lazy view is consistent with the full array."""
+        arr = self.df.values
+        out = np_cross_ratios(arr)
+        view = np_cross_ratios(arr, lazy=True)
+        self.assertEqual(view.shape, out.shape)
+        self.assertTrue(np.allclose(np.asarray(view), out, equal_nan=True))
+        keys = [(2,), (2, 1), (2, 1, 3), (slice(None), 1, 3), (slice(1, 4), [0, 2])]
+        for key in keys:
+            with self.subTest(key=key):
+                self.assertTrue(np.allclose(view[key], out[key], equal_nan=True))
+
 
 class TestStandardiseAggregate(unittest.TestCase):
     """Tests pandas internal standardisation aggregation method."""
@@ -2,7 +2,13 @@ import unittest
 
 import numpy as np
 
-from pyrolite.comp.impute import EMCOMP, _little_sweep, _multisweep
+from pyrolite.comp.impute import (
+    EMCOMP,
+    _little_sweep,
+    _multisweep,
+    _pattern_regressions,
+    _reg_sweep,
+)
 from pyrolite.util.math import augmented_covariance_matrix
 from pyrolite.util.synthetic import random_composition, random_cov_matrix
 
@@ -17,6 +23,15 @@ class TestRegSweep(unittest.TestCase):
     def test_default(self):
         pass
 
+    def test_pattern_regressions(self):
+        M, C = np.array([1.1, 0.9, 1.05, 1.2]), random_cov_matrix(4)
+        varobs = [np.array(v) for v in [[0, 1], [0], [1, 3], [0, 1, 2], [2]]]
+        for (B, σ2_res), obs in zip(_pattern_regressions(M, C, varobs), varobs):
+            with self.subTest(obs=obs):
+                _B, _σ2_res = _reg_sweep(M, C, obs)
+                self.assertTrue(np.allclose(B, _B))
+                self.assertTrue(np.allclose(σ2_res, _σ2_res))
+
 
 class TestLittleSweep(unittest.TestCase):
     def setUp(self):
@@ -52,6 +67,12 @@ class TestLittleSweep(unittest.TestCase):
             ),
         )
 
+    def test_inplace(self):
+        G = self.G3.copy()
+        H = _little_sweep(self.G3, k=1)
+        _little_sweep(G, k=1, inplace=True)
+        self.assertTrue(np.allclose(G, H))
+
 
 class TestEMCOMP(unittest.TestCase):
     def setUp(self):
@@ -62,6 +83,31 @@ class TestEMCOMP(unittest.TestCase):
             self.data, threshold=0.5 * np.nanmin(self.data, axis=0), tol=0.01
         )
 
+    def test_processes(self):
+        threshold = 0.5 * np.nanmin(self.data, axis=0)
+        impute, p0, ni = EMCOMP(self.data, threshold=threshold, tol=0.01)
+        for backend in ["thread", "process"]:
+            with self.subTest(backend=backend):
+                _impute, _p0, _ni = EMCOMP(
+                    self.data,
+                    threshold=threshold,
+                    tol=0.01,
+                    processes=2,
+                    backend=backend,
+                )
+                self.assertEqual(ni, _ni)
+                self.assertTrue(np.allclose(impute, _impute, equal_nan=True))
+
+    def test_diagnostics(self):
+        impute, p0, ni, diagnostics = EMCOMP(
+            self.data,
+            threshold=0.5 * np.nanmin(self.data, axis=0),
+            tol=0.01,
+            return_diagnostics=True,
+        )
+        self.assertEqual(diagnostics.index.size, ni)
+        self.assertIn("mean_change", diagnostics.columns)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 
+import numpy as np
 import periodictable as pt
 
 from pyrolite.geochem.ind import (
@@ -10,6 +11,9 @@ from pyrolite.geochem.ind import (
     common_elements,
     common_oxides,
     get_cations,
+    get_formula,
+    get_formula_masses,
+    get_formula_properties,
     get_ionic_radii,
     simple_oxides,
 )
@@ -50,6 +54,52 @@ class TestGetCations(unittest.TestCase):
                 self.assertTrue(len(get_cations(ox, exclude=excl)) == 1)
 
 
+class TestGetFormula(unittest.TestCase):
+    """Tests the cached formula parser."""
+
+    def test_cached(self):
+        self.assertIs(get_formula("SiO2"), get_formula("SiO2"))
+
+    def test_formula(self):
+        formula = pt.formula("Al2O3")
+        self.assertEqual(get_formula(formula).atoms, formula.atoms)
+
+
+class TestGetFormulaProperties(unittest.TestCase):
+    """Tests the formula property registry."""
+
+    def test_oxide(self):
+        props = get_formula_properties("Fe2O3")
+        self.assertTrue(np.isclose(props.mass, pt.formula("Fe2O3").mass))
+        self.assertEqual(props.cations, (("Fe", 2),))
+        self.assertEqual(props.oxygen, 3)
+        self.assertEqual(props.charge, 3)
+
+    def test_element(self):
+        props = get_formula_properties("O")
+        self.assertEqual(props.cations, ())
+        self.assertEqual(props.charge, pt.O.default_charge)
+
+    def test_uncommon_component(self):
+        props = get_formula_properties("Al2O3 (SiO2)2")
+        self.assertTrue(np.isclose(props.mass, pt.formula("Al2O3 (SiO2)2").mass))
+        self.assertIsNone(props.charge)
+
+
+class TestGetFormulaMasses(unittest.TestCase):
+    """Tests the vectorised mass lookup."""
+
+    def test_default(self):
+        components = ["SiO2", "MgO", "Ni", "FeO"]
+        masses = get_formula_masses(components)
+        self.assertIsInstance(masses, np.ndarray)
+        self.assertTrue(np.allclose(masses, [pt.formula(c).mass for c in components]))
+
+    def test_unknown_component(self):
+        with self.assertRaises(ValueError):
+            get_formula_masses(["SiO2", "LOI"])
+
+
 class TestCommonElements(unittest.TestCase):
     """Tests the common element generator."""
 
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from io import StringIO
 
@@ -108,6 +110,43 @@ class TestSCSS(unittest.TestCase):
         self.assertIsInstance(sulfide, np.ndarray)
         self.assertTrue(sulfide.ndim == 3)
 
+    def test_grid_chunked_float32(self):
+        T, P = self.T[:5], self.P[:3]
+        sulfate, sulfide = SCSS(self.df, T=T, P=P, grid="grid")
+        _sulfate, _sulfide = SCSS(
+            self.df, T=T, P=P, grid="grid", dtype="float32", chunksize=3
+        )
+        self.assertEqual(_sulfide.dtype, np.float32)
+        self.assertTrue(np.allclose(_sulfate, sulfate, rtol=1e-6))
+        self.assertTrue(np.allclose(_sulfide, sulfide, rtol=1e-6))
+
+    def test_grid_memmap(self):
+        T, P = self.T[:5], self.P[:3]
+        sulfate, sulfide = SCSS(self.df, T=T, P=P, grid="grid")
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = os.path.join(tmp, "scss")
+            _sulfate, _sulfide = SCSS(self.df, T=T, P=P, grid="grid", memmap=prefix)
+            self.assertIsInstance(_sulfide, np.memmap)
+            saved = np.load(prefix + "_sulfide.npy")
+            self.assertTrue(np.allclose(saved, sulfide))
+            del _sulfate, _sulfide
+
+    def test_summary(self):
+        for grid in ["geotherm", "grid"]:
+            with self.subTest(grid=grid):
+                sulfate, sulfide = SCSS(self.df, T=self.T, P=self.P, grid=grid)
+                axes = tuple(range(1, sulfide.ndim))
+                _sulfate, _sulfide = SCSS(
+                    self.df, T=self.T, P=self.P, grid=grid, summary="max"
+                )
+                self.assertTrue(np.allclose(_sulfide, sulfide.max(axis=axes)))
+                stats = SCSS(
+                    self.df, T=self.T, P=self.P, grid=grid, summary=["min", "mean"]
+                )[0]
+                self.assertEqual(stats.shape, (self.df.index.size, 2))
+                self.assertTrue(np.allclose(stats[:, 0], sulfate.min(axis=axes)))
+                self.assertTrue(np.allclose(stats[:, 1], sulfate.mean(axis=axes)))
+
 
 if __name__ == "__main__":
     unittest.main()
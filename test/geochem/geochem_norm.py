@@ -1,10 +1,13 @@
 import unittest
 
+import numpy as np
+
 from pyrolite.geochem.norm import (
     Composition,
     all_reference_compositions,
     get_reference_composition,
     get_reference_files,
+    get_reference_table,
     update_database,
 )
 from pyrolite.util.general import remove_tempdir, temp_path
@@ -39,6 +42,14 @@ class TestComposition(unittest.TestCase):
         s = repr(C)
         self.assertIn("Composition(", s)
 
+    def test_copy(self):
+        C = Composition(self.filename)
+        _C = C.copy()
+        self.assertIsInstance(_C, Composition)
+        self.assertEqual(_C.name, C.name)
+        _C.comp *= 0
+        self.assertFalse(np.allclose(C.comp.values, 0))
+
 
 class TestGetReferenceFiles(unittest.TestCase):
     def test_default(self):
@@ -61,6 +72,38 @@ class TestGetReferenceComposition(unittest.TestCase):
         out = get_reference_composition(rc)
         self.assertIsInstance(out, Composition)
 
+    def test_units(self):
+        rc = "Chondrite_PON"
+        out = get_reference_composition(rc, units="ppm")
+        self.assertTrue((out.units == "ppm").all())
+        expect = get_reference_composition(rc).set_units("ppm")
+        self.assertTrue(np.allclose(out.comp.values, expect.comp.values))
+
+    def test_cached_copies(self):
+        rc = "Chondrite_PON"
+        out = get_reference_composition(rc)
+        self.assertIsNot(out, get_reference_composition(rc))
+        # modifying the returned composition shouldn't affect later calls
+        out.set_units("ppb")
+        out.comp *= 0
+        self.assertFalse(np.allclose(get_reference_composition(rc).comp.values, 0))
+        self.assertFalse((get_reference_composition(rc).units == "ppb").all())
+
+
+class TestGetReferenceTable(unittest.TestCase):
+    def test_default(self):
+        names = ["Chondrite_PON", "PM_PON", "Chondrite_PON"]
+        table = get_reference_table(names, units="ppm")
+        self.assertEqual(list(table.index), names)
+        for name in names:
+            comp = get_reference_composition(name, units="ppm")
+            values = table.loc[[name], comp.comp.columns].values
+            self.assertTrue(np.allclose(values, comp.comp.values))
+
+    def test_empty(self):
+        table = get_reference_table([])
+        self.assertEqual(table.index.size, 0)
+
 
 class TestUpdateReferenceDataBase(unittest.TestCase):
     def setUp(self):
@@ -74,6 +117,16 @@ class TestUpdateReferenceDataBase(unittest.TestCase):
         update_database(path=self.path)
         self.assertTrue(self.path.exists())
 
+    def test_cache(self):
+        cachefile = self.path.with_suffix(".pkl")
+        for cache in [True, False]:
+            with self.subTest(cache=cache):
+                update_database(path=self.path, cache=cache)
+                self.assertEqual(cachefile.exists(), cache)
+                refs = all_reference_compositions(path=self.path)
+                self.assertIn("Chondrite_PON", refs)
+                self.assertIsInstance(refs["Chondrite_PON"], Composition)
+
     def tearDown(self):
         remove_tempdir(self.tmppath)
 
@@ -175,6 +175,45 @@ class TestPyrochem(unittest.TestCase):
         obj = self.df.copy(deep=True).pyrochem.compositional
         out = obj.pyrochem.denormalize_from(np.ones(obj.columns.size))
 
+    def test_pyrochem_normalize_to_series(self):
+        obj = self.df.copy(deep=True).pyrochem.compositional
+        refs = ["Chondrite_PON", "PM_PON"]
+        reference = pd.Series(np.array(refs * obj.index.size)[: obj.index.size])
+        reference.index = obj.index
+        reference.iloc[0] = np.nan
+        out = obj.pyrochem.normalize_to(reference, units="wt%")
+        self.assertTrue(out.iloc[0].isnull().all())
+        for ref in refs:
+            rows = reference == ref
+            expect = obj.loc[rows].pyrochem.normalize_to(ref, units="wt%")
+            self.assertTrue(np.allclose(out.loc[rows], expect, equal_nan=True))
+
+    def test_pyrochem_normalize_to_numeric_series(self):
+        obj = self.df.copy(deep=True).pyrochem.compositional
+        reference = pd.Series(np.arange(1, obj.columns.size + 1), index=obj.columns)
+        out = obj.pyrochem.normalize_to(reference)
+        self.assertTrue(np.allclose(out, obj / reference.values, equal_nan=True))
+        out = obj.pyrochem.denormalize_from(reference)
+        self.assertTrue(np.allclose(out, obj * reference.values, equal_nan=True))
+
+    def test_pyrochem_normalize_to_column(self):
+        obj = self.df.copy(deep=True).pyrochem.compositional
+        obj["reference"] = "Chondrite_PON"
+        out = obj.pyrochem.normalize_to("reference", units="wt%")
+        expect = obj.pyrochem.normalize_to("Chondrite_PON", units="wt%")
+        self.assertTrue(np.allclose(out, expect, equal_nan=True))
+
+    def test_pyrochem_denormalize_from_series(self):
+        obj = self.df.copy(deep=True).pyrochem.compositional
+        refs = ["Chondrite_PON", "PM_PON"]
+        reference = pd.Series(np.array(refs * obj.index.size)[: obj.index.size])
+        reference.index = obj.index
+        out = obj.pyrochem.denormalize_from(reference, units="wt%")
+        for ref in refs:
+            rows = reference == ref
+            expect = obj.loc[rows].pyrochem.denormalize_from(ref, units="wt%")
+            self.assertTrue(np.allclose(out.loc[rows], expect, equal_nan=True))
+
     def test_pyrochem_scale(self):
         obj = self.df.copy(deep=True).pyrochem.compositional
         REEppm = obj.pyrochem.REE.pyrochem.scale("wt%", "ppm")
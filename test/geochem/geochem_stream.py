@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from pyrolite.geochem.stream import apply_pipeline, process_table
+from pyrolite.util.general import remove_tempdir, temp_path
+from pyrolite.util.synthetic import normal_frame
+
+try:
+    import pyarrow
+
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+
+def add_total(df):
+    """An arbitrary operation on a dataframe."""
+    return df.assign(total=df.sum(axis=1))
+
+
+class TestApplyPipeline(unittest.TestCase):
+    def setUp(self):
+        self.df = normal_frame(columns=["SiO2", "MgO", "FeO", "CaO"], size=30)
+        self.chunks = [self.df.iloc[ix : ix + 7] for ix in range(0, 30, 7)]
+        self.operations = [("to_molecular", dict(renorm=False)), add_total]
+
+    def test_default(self):
+        out = pd.concat(apply_pipeline(self.chunks, self.operations))
+        expect = add_total(self.df.pyrochem.to_molecular(renorm=False))
+        self.assertTrue((out.columns == expect.columns).all())
+        self.assertTrue(np.allclose(out.values, expect.values))
+
+    def test_inplace_operation(self):
+        out = pd.concat(apply_pipeline(self.chunks, ["add_MgNo"]))
+        self.assertIn("Mg#", out.columns)
+
+    def test_processes(self):
+        expect = pd.concat(apply_pipeline(self.chunks, self.operations))
+        out = pd.concat(apply_pipeline(self.chunks, self.operations, processes=2))
+        self.assertTrue((out.index == expect.index).all())
+        self.assertTrue(np.allclose(out.values, expect.values))
+
+    def test_unknown_operation(self):
+        for operation in ["not_a_method", ("to_molecular", {}, None), 1]:
+            with self.subTest(operation=operation):
+                with self.assertRaises(NotImplementedError):
+                    list(apply_pipeline(self.chunks, [operation]))
+
+
+class TestProcessTable(unittest.TestCase):
+    def setUp(self):
+        self.dir = temp_path() / "test_process_table"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.df = normal_frame(columns=["La", "Ce", "Nd", "Sm"], size=30)
+        self.src = self.dir / "src.csv"
+        self.df.to_csv(self.src)
+        self.operations = [("normalize_to", dict(reference="PM_PON", units="ppm"))]
+
+    def _check(self, dst, **kwargs):
+        out = process_table(self.src, dst, self.operations, chunksize=8, **kwargs)
+        self.assertTrue(out.exists())
+        expect = self.df.pyrochem.normalize_to(reference="PM_PON", units="ppm")
+        df = pd.read_parquet(out) if out.suffix == ".parquet" else pd.read_csv(out)
+        self.assertTrue(np.allclose(df[expect.columns].values, expect.values))
+
+    def test_csv(self):
+        self._check(self.dir / "dst.csv")
+
+    @unittest.skipUnless(HAVE_PYARROW, "Requires pyarrow.")
+    def test_parquet(self):
+        self._check(self.dir / "dst.parquet")
+
+    def test_processes(self):
+        self._check(self.dir / "dst.csv", processes=2)
+
+    def test_same_file(self):
+        with self.assertRaises(ValueError):
+            process_table(self.src, self.src, self.operations)
+
+    def tearDown(self):
+        remove_tempdir(self.dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
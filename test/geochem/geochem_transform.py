@@ -325,6 +325,47 @@ class TestAggregateElement(unittest.TestCase):
                     pass
 
 
+class TestConversionPlan(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            np.random.rand(20, 6), columns=["SiO2", "MgO", "Mg", "FeO", "Fe2O3", "Sr"]
+        )
+        self.df.iloc[::3, 1:] = np.nan
+
+    def test_default(self):
+        to = ["SiO2", "Mg", {"FeO": 0.9, "Fe2O3": 0.1}]
+        plan = get_conversion_plan(self.df.columns, to)
+        self.assertEqual(plan.targets, ["SiO2", "Mg", "FeO", "Fe2O3"])
+        self.assertEqual(plan.drop, ["MgO"])
+        out = plan.apply(self.df)
+        self.assertEqual(list(out.columns), ["SiO2", "Mg", "FeO", "Fe2O3", "Sr"])
+        expect = elemental_sum(self.df, "Mg", to="Mg")
+        self.assertTrue(np.allclose(out["Mg"], expect, equal_nan=True))
+        Fe = elemental_sum(self.df, "Fe", to="FeO")
+        self.assertTrue(np.allclose(out["FeO"], Fe * 0.9, equal_nan=True))
+
+    def test_cached(self):
+        plan = get_conversion_plan(self.df.columns, ["SiO2", "FeOT"])
+        same = get_conversion_plan(list(self.df.columns), ["SiO2", "FeOT"])
+        self.assertIs(plan, same)
+        self.assertIsNot(
+            plan, get_conversion_plan(self.df.columns, ["SiO2", "FeOT"], molecular=True)
+        )
+
+    def test_chunks(self):
+        plan = get_conversion_plan(self.df.columns, ["SiO2", "MgO", "FeOT"])
+        out = plan.apply(self.df)
+        chunked = pd.concat([plan.apply(self.df.iloc[i : i + 7]) for i in [0, 7, 14]])
+        self.assertTrue(np.allclose(out, chunked, equal_nan=True))
+
+    def test_array_proportions(self):
+        props = np.linspace(0.1, 0.9, self.df.index.size)
+        to = [{"FeO": props, "Fe2O3": 1 - props}]
+        out = get_conversion_plan(self.df.columns, to).apply(self.df)
+        Fe = elemental_sum(self.df, "Fe", to="FeO")
+        self.assertTrue(np.allclose(out["FeO"], Fe * props, equal_nan=True))
+
+
 class TestGetRatio(unittest.TestCase):
     """Tests the ratio addition."""
 
@@ -549,6 +590,11 @@ class TestConvertChemistry(unittest.TestCase):
         conv_df = convert_chemistry(self.df, to=["FeO", "Fe2O3"])
         self.assertTrue((conv_df[["FeO", "Fe2O3"]] > 0).all().all())
 
+    def test_duplicated_cations(self):
+        conv_df = convert_chemistry(self.df, to=["MgO", "Mg"])
+        self.assertTrue(np.allclose(conv_df["MgO"], self.df["MgO"]))
+        self.assertTrue((conv_df["Mg"] < conv_df["MgO"]).all())
+
     def test_logdata(self):
         out_components = self.expect
         for logdata in [True, False]:
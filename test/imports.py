@@ -0,0 +1,37 @@
+import subprocess
+import sys
+import unittest
+
+
+def _imported_modules(statement, modules):
+    """
+    Check which of a list of modules are imported by a statement, run in a fresh
+    interpreter.
+    """
+    code = "import sys; {}; print(','.join(m for m in {} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code.format(statement, list(modules))],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+class TestLazyImports(unittest.TestCase):
+    def setUp(self):
+        self.heavy = ["matplotlib", "mpltern", "sympy", "scipy.stats", "sklearn"]
+
+    def test_import_pyrolite(self):
+        self.assertEqual(_imported_modules("import pyrolite", self.heavy), [])
+
+    def test_import_geochem(self):
+        self.assertEqual(_imported_modules("import pyrolite.geochem", self.heavy), [])
+
+    def test_submodule_access(self):
+        statement = "import pyrolite; pyrolite.plot"
+        self.assertIn("matplotlib", _imported_modules(statement, self.heavy))
+
+
+if __name__ == "__main__":
+    unittest.main()
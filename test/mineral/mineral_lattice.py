@@ -1,7 +1,10 @@
 import unittest
 
+import numpy as np
+import pandas as pd
+
 from pyrolite.geochem.ind import get_ionic_radii
-from pyrolite.mineral.lattice import strain_coefficient
+from pyrolite.mineral.lattice import fit_lattice_strain, strain_coefficient
 
 
 class TestStrainCoefficient(unittest.TestCase):
@@ -32,5 +35,58 @@ class TestStrainCoefficient(unittest.TestCase):
         self.assertTrue(D_j < self.D0)
 
 
+class TestFitLatticeStrain(unittest.TestCase):
+    def setUp(self):
+        self.ions = ["Ca", "Sr", "Ba", "Mg", "Mn", "Fe", "Pb", "Cd", "Zn"]
+        self.radii = np.array(get_ionic_radii(self.ions, charge=2, coordination=8))
+        rng = np.random.default_rng(32)
+        n = 50
+        self.D0 = np.exp(rng.uniform(-1, 2, n))
+        self.r0 = rng.uniform(1.0, 1.2, n)
+        self.E = rng.uniform(60, 250, n) * 10**9
+        self.T = rng.uniform(1100, 1600, n)
+        self.D = pd.DataFrame(
+            [
+                D0 * strain_coefficient(r0, self.radii, r0=r0, E=E, T=T)
+                for D0, r0, E, T in zip(self.D0, self.r0, self.E, self.T)
+            ],
+            columns=self.ions,
+        )
+
+    def test_default(self):
+        out = fit_lattice_strain(self.D, T=self.T, charge=2, coordination=8)
+        self.assertIsInstance(out, pd.DataFrame)
+        self.assertTrue((out.index == self.D.index).all())
+        self.assertTrue(np.allclose(out["D0"], self.D0))
+        self.assertTrue(np.allclose(out["r0"], self.r0))
+        self.assertTrue(np.allclose(out["E"], self.E))
+        for c in ["D0_" + chr(963), "r0_" + chr(963), "E_" + chr(963), "X2"]:
+            self.assertIn(c, out.columns)
+
+    def test_radii_array(self):
+        out = fit_lattice_strain(self.D.values, radii=self.radii, T=self.T)
+        self.assertTrue(np.allclose(out["r0"], self.r0))
+
+    def test_missing(self):
+        D = self.D.copy()
+        D.iloc[::2, 1] = np.nan
+        D.iloc[::3, 4] = 0.0
+        D.iloc[0, 2:] = np.nan  # too few values to fit
+        D.iloc[1, 3:] = np.nan  # exactly determined, no uncertainties
+        out = fit_lattice_strain(D, T=self.T, charge=2, coordination=8)
+        self.assertTrue(out.iloc[0].isnull().all())
+        self.assertTrue(np.isinf(out.loc[1, "r0_" + chr(963)]))
+        self.assertTrue(np.allclose(out["r0"][2:], self.r0[2:]))
+        self.assertTrue(np.allclose(out["E"][2:], self.E[2:]))
+
+    def test_uncertainties(self):
+        rng = np.random.default_rng(1)
+        D = self.D * np.exp(rng.normal(0, 0.01, self.D.shape))
+        out = fit_lattice_strain(D, T=self.T, sigmas=0.01, charge=2, coordination=8)
+        z = (out["r0"] - self.r0) / out["r0_" + chr(963)]
+        self.assertTrue((np.abs(z) < 5).all())
+        self.assertTrue(0.2 < out["X2"].median() < 5)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,6 +6,7 @@ from pyrolite.mineral.mindb import (
     __dbpath__,
     get_mineral,
     get_mineral_group,
+    get_minerals,
     list_formulae,
     list_groups,
     list_minerals,
@@ -69,6 +70,24 @@ class TestGetMineral(unittest.TestCase):
                 self.assertIsInstance(out, pd.Series)
 
 
+class TestGetMinerals(unittest.TestCase):
+    def setUp(self):
+        self.names = ["forsterite", "enstatite", "forsterite"]
+
+    def test_get_minerals(self):
+        out = get_minerals(self.names)
+        self.assertIsInstance(out, pd.DataFrame)
+        self.assertEqual(out["name"].tolist(), self.names)
+        for ix, name in enumerate(self.names):
+            with self.subTest(name=name):
+                mineral = get_mineral(name)
+                self.assertTrue((out.iloc[ix][mineral.index] == mineral).all())
+
+    def test_non_mineral(self):
+        with self.assertRaises(AssertionError):
+            out = get_minerals(self.names + ["andychristyite"])
+
+
 class TestParseComposition(unittest.TestCase):
     def setUp(self):
         pass
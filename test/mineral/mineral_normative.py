@@ -3,11 +3,12 @@ import unittest
 import numpy as np
 import pandas as pd
 
-from pyrolite.mineral.normative import (  # MiddlemostOxRatio, _aggregate_components, _update_molecular_masses,
+from pyrolite.mineral.normative import (
     CIPW_norm,
     LeMaitre_Fe_correction,
     LeMaitreOxRatio,
     Middlemost_Fe_correction,
+    MiddlemostOxRatio,
     endmember_decompose,
     unmix,
 )
@@ -29,6 +30,8 @@ class TestUnmix(unittest.TestCase):
 
     def test_default(self):
         res = unmix(self.comp, self.parts)
+        expect = unmix(self.comp, self.parts, method="minimize")
+        self.assertTrue(np.allclose(res, expect))
 
     def test_regularization(self):
         for order in [1, 2]:
@@ -40,6 +43,21 @@ class TestUnmix(unittest.TestCase):
             with self.subTest(det_lim=det_lim):
                 s = unmix(self.comp, self.parts, det_lim=det_lim)
 
+    def test_methods(self):
+        expect = unmix(self.comp, self.parts, method="minimize")
+        for method in ["nnls", "projected_gradient"]:
+            with self.subTest(method=method):
+                s = unmix(self.comp, self.parts, method=method)
+                self.assertTrue(np.allclose(s, expect, atol=1e-3))
+
+    def test_unknown_method(self):
+        with self.assertRaises(NotImplementedError):
+            s = unmix(self.comp, self.parts, method="unknown")
+
+    def test_processes(self):
+        s = unmix(self.comp, self.parts, method="nnls", processes=2)
+        self.assertTrue(np.allclose(s, unmix(self.comp, self.parts, method="nnls")))
+
 
 class TestEndmemberDecompose(unittest.TestCase):
     def setUp(self):
@@ -65,6 +83,12 @@ class TestEndmemberDecompose(unittest.TestCase):
             with self.subTest(molecular=molecular):
                 s = endmember_decompose(self.df, molecular=molecular)
 
+    def test_method(self):
+        for method in ["nnls", "projected_gradient", "minimize"]:
+            with self.subTest(method=method):
+                s = endmember_decompose(self.df, endmembers="olivine", method=method)
+                self.assertTrue(np.allclose(s["forsterite"], 80.0, atol=0.1))
+
 
 class Test_AggregateComponents(unittest.TestCase):
     def setUp(self):
@@ -76,6 +100,41 @@ class Test_UpdateMolecularMasses(unittest.TestCase):
         pass
 
 
+class TestMiddlemostOxRatio(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            [
+                [38, 3, 2, 10, 2, 0, 0, 0, 0, 0, 45],  # Foidite, 0.2
+                [38, 7, 5, 10, 2, 0, 0, 0, 0, 0, 38],  # Foidite, 0.4
+                [43, 3, 2, 10, 2, 0, 0, 0, 0, 0, 40],  # Tephrite, 0.2
+                [45, 5, 4, 10, 2, 0, 0, 0, 0, 0, 34],  # Tephrite, 0.3
+                [75, 3, 2, 10, 2, 0, 0, 0, 0, 0, 8],  # Rhyolite, 0.5
+                [np.nan, 4, 5, 10, 0, 0, 0, 0, 0, 0, 36],  # Unclassified, 0.15
+            ],
+            columns=[
+                "SiO2",
+                "Na2O",
+                "K2O",
+                "FeO",
+                "Fe2O3",
+                "Al2O3",
+                "MnO",
+                "MgO",
+                "CaO",
+                "P2O5",
+                "TiO2",
+            ],
+            dtype="float",
+        )
+
+    def test_default(self):
+        ratio = MiddlemostOxRatio(self.df)
+        self.assertIsInstance(ratio, pd.Series)
+        self.assertEqual(ratio.name, "Fe2O3/FeO")
+        self.assertTrue((ratio.index == self.df.index).all())
+        self.assertTrue(np.allclose(ratio, np.array([0.2, 0.4, 0.2, 0.3, 0.5, 0.15])))
+
+
 class TestMiddlemostFeCorrection(unittest.TestCase):
     def setUp(self):
         self.df = pd.DataFrame(
@@ -189,6 +248,13 @@ class TestLeMatireOxRatio(unittest.TestCase):
                 with self.assertLogs(self.handler, level="WARNING") as cm:
                     ratio = LeMaitreOxRatio(df)
 
+    def test_non_negative(self):
+        df = self.df.copy()
+        df.loc[0, "SiO2"] = 500.0
+        ratio = LeMaitreOxRatio(df)
+        self.assertTrue(np.isclose(ratio[0], 0.0))
+        self.assertTrue((ratio >= 0).all())
+
 
 class TestCIPW(unittest.TestCase):
     def setUp(self):
@@ -217,6 +283,17 @@ class TestCIPW(unittest.TestCase):
                     norm = CIPW_norm(self.df.drop(columns=drop))
                     logging_output = cm.output
 
+    def test_chunksize(self):
+        # results should be independent of the number of rows processed at a time
+        norm = CIPW_norm(self.df.copy(), chunksize=None, return_free_components=True)
+        for chunksize in [1, 3, 7, self.df.index.size]:
+            with self.subTest(chunksize=chunksize):
+                chunked = CIPW_norm(
+                    self.df.copy(), chunksize=chunksize, return_free_components=True
+                )
+                self.assertTrue((chunked.columns == norm.columns).all())
+                self.assertTrue(np.allclose(chunked.values, norm.values))
+
     def test_adjust_all_fe(self):
         pass
 
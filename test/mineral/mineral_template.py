@@ -41,6 +41,84 @@ class TestMineralTemplate(unittest.TestCase):
             out = hash(min)
 
 
+class TestMineralTemplateBatch(unittest.TestCase):
+    """Test recalculation and site occupancy for tables of compositions."""
+
+    def setUp(self):
+        self.pyx = pd.Series(
+            data=[57.10, 0.17, 0.70, 0.27, 0.60, 5.21, 0.17, 34.52, 0.62, 0.07],
+            index="SiO2, TiO2, Al2O3, Cr2O3, Fe2O3, FeO, MnO, MgO, CaO, Na2O".split(
+                ", "
+            ),
+        )
+        rng = np.random.default_rng(12)
+        self.df = pd.DataFrame(
+            self.pyx.values * rng.uniform(0.8, 1.2, (10, self.pyx.size)),
+            columns=self.pyx.index,
+        )
+
+    def test_apfu(self):
+        apfu = PYROXENE.apfu(self.df)
+        self.assertIsInstance(apfu, pd.DataFrame)
+        self.assertTrue((apfu.index == self.df.index).all())
+        # both iron species defined, so recalculated to oxygens
+        self.assertTrue(np.allclose(apfu["O"], PYROXENE.ideal_oxygens))
+
+    def test_calculate_occupancy(self):
+        occupancy = PYROXENE.calculate_occupancy(PYROXENE.apfu(self.df))
+        self.assertTrue((occupancy.index == self.df.index).all())
+        for site, count in PYROXENE.structure.items():
+            with self.subTest(site=site):
+                # sites shouldn't be filled beyond capacity
+                total = occupancy.loc[:, occupancy.columns.get_level_values(0) == site]
+                self.assertTrue((total.sum(axis=1) <= count + 10e-6).all())
+
+    def test_calculate_occupancy_capacity(self):
+        apfu = PYROXENE.apfu(pd.DataFrame([self.pyx] * 10))
+        with self.assertNoLogs("pyrolite.mineral.template", level="WARNING"):
+            PYROXENE.calculate_occupancy(apfu)
+        apfu.iloc[:3, apfu.columns.get_loc("Mg{2+}")] *= 2  # more Mg than can fit
+        with self.assertLogs("pyrolite.mineral.template", level="WARNING") as logs:
+            PYROXENE.calculate_occupancy(apfu)
+        self.assertEqual(len(logs.output), 2)  # both M sites are filled
+        for msg in logs.output:
+            self.assertIn("3 of 10", msg)
+            self.assertIn("Mg{2+}", msg)
+
+    def test_calculate_occupancy_expected(self):
+        """
+        Check site occupancies for a pyroxene against those from the previous
+        single-mineral implementation.
+        """
+        expect = {
+            ("T", "Si{4+}"): 1.9778402683,
+            ("T", "Al{3+}"): 0.0221597317,
+            ("M1", "Fe{2+}"): 0.0830893652,
+            ("M1", "Mg{2+}"): 0.8891997587,
+            ("M1", "Ca{2+}"): 0.0230098418,
+            ("M1", "Na{+}"): 0.0047010343,
+            ("M2", "Ti{4+}"): 0.0044299532,
+            ("M2", "Al{3+}"): 0.0064164763,
+            ("M2", "Cr{3+}"): 0.0073941413,
+            ("M2", "Fe{2+}"): 0.0834724547,
+            ("M2", "Mn{2+}"): 0.0049874960,
+            ("M2", "Mg{2+}"): 0.8932994785,
+            ("O", "O{2-}"): 6.0,
+        }
+        mineral = Mineral("pyroxene", PYROXENE, self.pyx)
+        occupancy = PYROXENE.calculate_occupancy(mineral.recalculate_cations())
+        for (site, ion), value in occupancy.iloc[0].items():
+            with self.subTest(site=site.name, ion=ion):
+                self.assertTrue(
+                    np.isclose(value, expect.get((site.name, ion), 0.0), atol=1e-8)
+                )
+        single = mineral.calculate_occupancy()
+        for (site, ion), value in expect.items():
+            with self.subTest(site=site, ion=ion):
+                column = [s for s in single.columns if s.name == site][0]
+                self.assertTrue(np.isclose(single.loc[ion, column], value, atol=1e-8))
+
+
 class TestMineral(unittest.TestCase):
     """Test the mineral functionality."""
 
@@ -1,5 +1,6 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 import periodictable as pt
 
@@ -53,6 +54,26 @@ class TestRecalcCations(unittest.TestCase):
         for min in [self.pyx, self.ol]:
             out = recalc_cations(min)
 
+    def test_dataframe(self):
+        """Check that each row of a dataframe is recalculated independently."""
+        df = pd.DataFrame([self.pyx, self.pyx * 1.1, self.pyx.drop("Fe2O3")])
+        out = recalc_cations(df)
+        self.assertIsInstance(out, pd.DataFrame)
+        self.assertEqual(out.index.size, df.index.size)
+        for ix in range(df.index.size):
+            with self.subTest(ix=ix):
+                expect = recalc_cations(df.iloc[ix].dropna())
+                self.assertTrue(np.allclose(out.iloc[ix][expect.index], expect))
+
+    def test_single_row_dataframe(self):
+        out = recalc_cations(self.pyx.to_frame().T)
+        self.assertIsInstance(out, pd.Series)
+        self.assertTrue(np.allclose(out, recalc_cations(self.pyx)))
+
+    def test_oxygen_constrained(self):
+        out = recalc_cations(self.ol, ideal_oxygens=4, oxygen_constrained=True)
+        self.assertTrue(np.isclose(out["O"], 4))
+
 
 if __name__ == "__main__":
     unittest.main()
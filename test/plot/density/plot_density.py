@@ -67,6 +67,14 @@ class TestDensityplot(unittest.TestCase):
                         except NotImplementedError:  # some are not implemented for 3D
                             pass
 
+    def test_kde_methods(self):
+        for arr in [self.biarr, self.triarr]:
+            for kde_method in ["exact", "binned"]:
+                with self.subTest(arr=arr, kde_method=kde_method):
+                    out = density(arr, kde_method=kde_method, bw_method=0.5)
+                    self.assertTrue(isinstance(out, matplotlib.axes.Axes))
+                    plt.close("all")
+
     def test_bivariate_logscale(self):  #
         """Tests logscale for different ploting modes using bivariate data."""
         arr = self.biarr
@@ -142,6 +150,11 @@ class TestTernaryHeatmap(unittest.TestCase):
         coords, H, data = out
         self.assertTrue(coords[0].shape == coords[1].shape)
 
+    def test_density_kde_method(self):
+        coords, H, data = ternary_heatmap(self.data, mode="density")
+        _, binned, _ = ternary_heatmap(self.data, mode="density", kde_method="binned")
+        self.assertTrue(np.allclose(binned, H, atol=np.nanmax(H) / 100))
+
     def test_transform(self):
         for tfm, itfm in [
             (ALR, inverse_ALR),
@@ -90,6 +90,12 @@ class TestPyroPlot(unittest.TestCase):
     def test_heatscatter_ternary(self):
         self.tridf.pyroplot.heatscatter()
 
+    def test_heatscatter_kde_methods(self):
+        for kde_method in ["exact", "binned", "tree"]:
+            with self.subTest(kde_method=kde_method):
+                self.bidf.pyroplot.heatscatter(kde_method=kde_method, logx=True)
+                self.tridf.pyroplot.heatscatter(kde_method=kde_method)
+
     def test_ree(self):
         self.multidf.pyroplot.REE()
 
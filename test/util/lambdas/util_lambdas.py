@@ -7,9 +7,19 @@ from pandas.testing import assert_frame_equal
 from pyrolite.geochem.ind import REE, get_ionic_radii
 from pyrolite.geochem.norm import get_reference_composition
 from pyrolite.util.lambdas import calc_lambdas
-from pyrolite.util.lambdas.eval import get_lambda_poly_function, lambda_poly
+from pyrolite.util.lambdas.eval import (
+    get_function_components,
+    get_lambda_poly_function,
+    lambda_poly,
+)
 from pyrolite.util.lambdas.oneill import lambdas_ONeill2016
-from pyrolite.util.lambdas.opt import lambdas_optimize
+from pyrolite.util.lambdas.opt import (
+    _residuals_func,
+    batch_optimize_fit_components,
+    lambdas_optimize,
+    linear_fit_components,
+    optimize_fit_components,
+)
 from pyrolite.util.lambdas.params import _get_params, orthogonal_polynomial_constants
 from pyrolite.util.synthetic import random_cov_matrix
 
@@ -265,6 +275,92 @@ class TestCalcLambdas(unittest.TestCase):
         self.assertTrue((~np.isfinite(ret.iloc[1, :])).values.flatten().all())
 
 
+class TestBatchOptimizeFitComponents(unittest.TestCase):
+    def setUp(self):
+        els = [i for i in REE() if not i == "Pm"]
+        self.radii = get_ionic_radii(els, charge=3, coordination=8)
+        ref = get_reference_composition("PM_PON")
+        ref.set_units("ppm")
+        y = np.log(
+            pd.DataFrame([ref[els]], columns=els).pyrochem.normalize_to(
+                "Chondrite_PON", units="ppm"
+            )
+        ).values
+        rng = np.random.default_rng(12)
+        self.y = y + rng.normal(0, 0.05, size=(20, len(els)))
+        self.y[rng.random(self.y.shape) < 0.1] = np.nan  # missing data patterns
+
+    def test_against_optimize_fit_components(self):
+        for fit_tetrads in [False, True]:
+            with self.subTest(fit_tetrads=fit_tetrads):
+                names, x0, func_components = get_function_components(
+                    self.radii, params=_get_params(degree=4), fit_tetrads=fit_tetrads
+                )
+                B, s, χ2 = batch_optimize_fit_components(
+                    self.y, np.array(x0), func_components
+                )
+                _B, _s, _χ2 = optimize_fit_components(
+                    self.y, np.array(x0), func_components
+                )
+                self.assertEqual(B.shape, _B.shape)
+                self.assertTrue(np.allclose(χ2, _χ2, rtol=1e-4))
+                self.assertTrue(np.allclose(B, _B, rtol=1e-3, atol=5e-3))
+                self.assertTrue(np.allclose(s, _s, rtol=1e-3))
+
+    def test_against_linear_fit_components(self):
+        rng = np.random.default_rng(32)
+        y = self.y[0] + rng.normal(0, 0.05, size=(400, self.y.shape[1]))
+        y[rng.random(y.shape) < 0.1] = np.nan
+        names, x0, func_components = get_function_components(
+            self.radii, params=_get_params(degree=5)
+        )
+        B, s, χ2 = batch_optimize_fit_components(y, np.array(x0), func_components)
+        _B, _s, _χ2 = linear_fit_components(y, np.array(x0), func_components)
+        self.assertTrue(np.allclose(B, _B, rtol=1e-8, atol=1e-8))
+
+    def test_against_optimize_fit_components_overdetermined(self):
+        rng = np.random.default_rng(32)
+        y = self.y[0] + rng.normal(0, 0.05, size=(400, self.y.shape[1]))
+        y[rng.random(y.shape) < 0.1] = np.nan
+        names, x0, func_components = get_function_components(
+            self.radii, params=_get_params(degree=5)
+        )
+        B, s, χ2 = batch_optimize_fit_components(y, np.array(x0), func_components)
+        _B, _s, _χ2 = optimize_fit_components(y, np.array(x0), func_components)
+        self.assertTrue(np.allclose(χ2, _χ2, rtol=1e-5))
+        self.assertTrue(np.allclose(s, _s, rtol=1e-3))
+        # the batch fit finds the least squares solution
+        self.assertTrue((χ2 <= _χ2 * (1 + 1e-9)).all())
+
+    def test_custom_residuals_function(self):
+        names, x0, func_components = get_function_components(
+            self.radii, params=_get_params(degree=4)
+        )
+        B, s, χ2 = batch_optimize_fit_components(
+            self.y,
+            np.array(x0),
+            func_components,
+            residuals_function=lambda *args: _residuals_func(*args),
+        )
+        _B, _s, _χ2 = batch_optimize_fit_components(
+            self.y, np.array(x0), func_components
+        )
+        self.assertTrue(np.allclose(χ2, _χ2, rtol=1e-5))
+        self.assertTrue(np.allclose(B, _B, rtol=1e-3, atol=5e-3))
+        self.assertTrue(np.allclose(s, _s, rtol=1e-3))
+
+    def test_processes(self):
+        names, x0, func_components = get_function_components(
+            self.radii, params=_get_params(degree=4)
+        )
+        expect = batch_optimize_fit_components(self.y, np.array(x0), func_components)
+        result = batch_optimize_fit_components(
+            self.y, np.array(x0), func_components, processes=2
+        )
+        for out, exp in zip(result, expect):
+            self.assertTrue(np.allclose(out, exp))
+
+
 class TestCalcLambdasSeries(unittest.TestCase):
     def setUp(self):
         self.C = get_reference_composition("PM_PON")
@@ -7,12 +7,40 @@ from matplotlib.lines import _get_dash_pattern, _scale_dashes
 from scipy.stats import multivariate_normal
 
 from pyrolite.util.plot.density import (
+    conditional_prob_density,
     percentile_contour_values_from_meshz,
     plot_Z_percentiles,
 )
 from pyrolite.util.plot.legend import proxy_line
 
 
+class TestConditionalProbDensity(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        self.y = np.exp(rng.normal(size=(500, 8)) + np.linspace(0, 2, 8))
+
+    def test_binkde(self):
+        for logy in [False, True]:
+            with self.subTest(logy=logy):
+                xe, ye, zi = conditional_prob_density(self.y, logy=logy)
+                _, _, exact = conditional_prob_density(
+                    self.y, logy=logy, kde_method="exact"
+                )
+                self.assertEqual(zi.shape, exact.shape)
+                self.assertTrue(
+                    np.allclose(zi, exact, atol=np.nanmax(exact) / 100, equal_nan=True)
+                )
+
+    def test_binkde_processes(self):
+        _, _, zi = conditional_prob_density(self.y, processes=2)
+        _, _, zi1 = conditional_prob_density(self.y)
+        self.assertTrue(np.allclose(zi, zi1, equal_nan=True))
+
+    def test_unknown_kde_method(self):
+        with self.assertRaises(NotImplementedError):
+            conditional_prob_density(self.y, kde_method="notamethod")
+
+
 class TestPercentileContourValuesFromMeshZ(unittest.TestCase):
     def setUp(self):
         x, y = np.mgrid[-1:1:100j, -1:1:100j]
@@ -1,6 +1,8 @@
 import unittest
 
+import matplotlib.patches
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 from pyrolite.util.classification import (
@@ -10,6 +12,7 @@ from pyrolite.util.classification import (
     JensenPlot,
     PeralkalinityClassifier,
     USDASoilTexture,
+    _read_poly,
 )
 from pyrolite.util.synthetic import normal_frame, random_cov_matrix
 
@@ -53,6 +56,37 @@ class TestTAS(unittest.TestCase):
         _ = classes.apply(lambda x: cm.fields.get(x, {"name": None})["name"])
         self.assertFalse(pd.isnull(classes).all())
 
+    def test_classifier_predict_consistent(self):
+        # should agree with point-in-polygon tests from matplotlib paths
+        cm = TAS()
+        classes = [k for (k, cfg) in cm.fields.items() if cfg["poly"]]
+        rng = np.random.default_rng(12)
+        X = np.vstack(
+            [
+                rng.uniform([30, 0], [90, 20], size=(5000, 2)),
+                np.vstack([_read_poly(cm.fields[k]["poly"]) for k in classes]),
+                [[np.nan, 5.0]],
+            ]
+        )
+        inside = np.array(
+            [
+                matplotlib.patches.Polygon(
+                    _read_poly(cm.fields[k]["poly"]), closed=True
+                ).contains_points(X)
+                for k in classes
+            ]
+        ).T
+        expect = np.where(
+            inside.any(axis=1), np.array(classes)[inside.argmax(axis=1)], "none"
+        )
+        self.assertTrue((cm.predict(X).values == expect).all())
+
+    def test_config_copied(self):
+        # configurations are cached, and shouldn't be shared between instances
+        cm = TAS()
+        cm.fields.clear()
+        self.assertTrue(len(TAS().fields))
+
     def tearDown(self):
         plt.close("all")
 
@@ -1,6 +1,104 @@
 import unittest
 
-from pyrolite.util.distributions import lognorm_to_norm, norm_to_lognorm
+import numpy as np
+
+from pyrolite.util.distributions import (
+    lognorm_to_norm,
+    norm_to_lognorm,
+    sample_column_kde,
+    sample_kde,
+)
+
+
+class TestSampleKDE(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        self.data = rng.multivariate_normal([0, 1], [[1, 0.5], [0.5, 2]], 2000)
+        self.samples = rng.uniform([-3, -3], [3, 5], (500, 2))
+
+    def test_default(self):
+        zi = sample_kde(self.data, self.samples)
+        self.assertEqual(zi.shape, (self.samples.shape[0],))
+        self.assertTrue((zi >= 0).all())
+
+    def test_meshgrid(self):
+        grid = np.meshgrid(np.linspace(-3, 3, 20), np.linspace(-3, 5, 30))
+        for kde_method in ["exact", "binned"]:
+            with self.subTest(kde_method=kde_method):
+                zi = sample_kde(self.data, grid, kde_method=kde_method)
+                self.assertEqual(zi.shape, grid[0].shape)
+
+    def test_binned(self):
+        """Check the binned estimate is consistent with the exact estimate."""
+        for bw_method in [None, "silverman", 0.2]:
+            for data in [self.data, self.data[:, :1]]:
+                with self.subTest(bw_method=bw_method, dim=data.shape[1]):
+                    samples = self.samples[:, : data.shape[1]]
+                    exact = sample_kde(
+                        data, samples, bw_method=bw_method, kde_method="exact"
+                    )
+                    binned = sample_kde(
+                        data, samples, bw_method=bw_method, kde_method="binned"
+                    )
+                    self.assertTrue(np.allclose(binned, exact, atol=exact.max() / 100))
+
+    def test_tree(self):
+        """Check the tree-based estimate is consistent with the exact estimate."""
+        for data in [self.data, self.data[:, :1]]:
+            with self.subTest(dim=data.shape[1]):
+                samples = self.samples[:, : data.shape[1]]
+                exact = sample_kde(data, samples, kde_method="exact")
+                tree = sample_kde(data, samples, kde_method="tree")
+                self.assertTrue(np.allclose(tree, exact, atol=exact.max() / 100))
+                loose = sample_kde(data, samples, kde_method="tree", tol=0.1)
+                self.assertTrue((loose <= tree + exact.max() / 100).all())
+
+    def test_nonfinite_samples(self):
+        samples = self.samples.copy()
+        samples[0, 0] = np.nan
+        zi = sample_kde(self.data, samples, kde_method="binned")
+        self.assertTrue(np.isnan(zi[0]))
+        self.assertTrue(np.isfinite(zi[1:]).all())
+
+    def test_unknown_method(self):
+        with self.assertRaises(NotImplementedError):
+            sample_kde(self.data, self.samples, kde_method="unknown")
+
+
+class TestSampleColumnKDE(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        self.data = rng.normal(size=(1000, 4)) * [1, 2, 0.2, 5] + [0, 3, 1, 0]
+        self.data[rng.random(self.data.shape) < 0.1] = np.nan
+        self.samples = np.linspace(-10, 15, 101)
+
+    def test_default(self):
+        zi = sample_column_kde(self.data, self.samples)
+        self.assertEqual(zi.shape, (self.samples.size, self.data.shape[1]))
+        for ix in range(self.data.shape[1]):
+            with self.subTest(column=ix):
+                exact = sample_kde(self.data[:, ix], self.samples, kde_method="exact")
+                self.assertTrue(np.allclose(zi[:, ix], exact, atol=exact.max() / 100))
+
+    def test_bw_method(self):
+        for bw_method in ["silverman", 0.5]:
+            with self.subTest(bw_method=bw_method):
+                zi = sample_column_kde(self.data, self.samples, bw_method=bw_method)
+                exact = sample_kde(self.data[:, 0], self.samples, bw_method=bw_method)
+                self.assertTrue(np.allclose(zi[:, 0], exact, atol=exact.max() / 100))
+
+    def test_processes(self):
+        zi = sample_column_kde(self.data, self.samples)
+        self.assertTrue(
+            np.allclose(zi, sample_column_kde(self.data, self.samples, processes=3))
+        )
+
+    def test_degenerate_columns(self):
+        data = self.data.copy()
+        data[:, 0], data[:, 1] = np.nan, 1.0
+        zi = sample_column_kde(data, self.samples)
+        self.assertTrue((zi[:, :2] == 0).all())
+        self.assertTrue((zi[:, 2:] > 0).any(axis=0).all())
 
 
 class TestLognorm2Norm(unittest.TestCase):
@@ -34,6 +34,26 @@ class TestMDPattern(unittest.TestCase):
                 (~np.isfinite(self.rdata[np.ix_(rows, where_not_present)])).all()
             )
 
+    def test_integer_ids(self):
+        pattern_ids, PD = md_pattern(self.rdata)
+        self.assertTrue(np.issubdtype(pattern_ids.dtype, np.integer))
+        self.assertEqual(sum(d["freq"] for d in PD.values()), self.rdata.shape[0])
+
+    def test_no_complete_rows(self):
+        # pattern 0 (no missing data) should be present regardless
+        pattern_ids, PD = md_pattern(self.static[1:])
+        self.assertEqual(PD[0]["freq"], 0)
+        self.assertTrue(np.allclose([1, 2, 3, 1], pattern_ids))
+
+    def test_many_columns(self):
+        # patterns for more than 64 columns
+        Y = np.ones((4, 100))
+        Y[[1, 3], 90] = np.nan
+        Y[2, 5] = np.nan
+        pattern_ids, PD = md_pattern(Y)
+        self.assertTrue(np.allclose([0, 1, 2, 1], pattern_ids))
+        self.assertTrue(PD[1]["pattern"][90] and PD[1]["freq"] == 2)
+
 
 class TestCooccurencePattern(unittest.TestCase):
     def setUp(self):
@@ -1,6 +1,9 @@
 import platform
+import types
 import unittest
 
+import numpy as np
+
 from pyrolite.util.multip import combine_choices, func_wrapper, multiprocess
 
 
@@ -9,6 +12,11 @@ def arbitary_function(**kwargs):
     return kwargs
 
 
+def array_function(arr, scale=1):
+    """A function which will return a summary of an array which is passed."""
+    return arr.sum() * scale, arr.flags.writeable
+
+
 class TestCombineChoices(unittest.TestCase):
     def setUp(self):
         self.choices = dict(A=[0, 1], B=["c", -1])
@@ -27,6 +35,32 @@ class TestCombineChoices(unittest.TestCase):
         self.assertEqual(c, start)  # don't change the grid
         self.assertTrue(len(out) == 2)
 
+    def test_lazy(self):
+        out = combine_choices(self.choices, lazy=True)
+        self.assertIsInstance(out, types.GeneratorType)
+        self.assertEqual(list(out), combine_choices(self.choices))
+
+    def test_include_none(self):
+        start = dict(A=[0, 1], B=[None, 1, None])
+        self.assertTrue(len(combine_choices(start)) == 4)
+        out = combine_choices(start, include_none=True)
+        self.assertTrue(len(out) == 4)
+        self.assertTrue(all("B" in c for c in out))
+
+    def test_order(self):
+        out = combine_choices(dict(A=[0, 1], B=[2, 3], C=[4, 5]))
+        expect = [
+            dict(A=0, B=2, C=4),
+            dict(A=0, B=3, C=4),
+            dict(A=1, B=2, C=4),
+            dict(A=1, B=3, C=4),
+            dict(A=0, B=2, C=5),
+            dict(A=0, B=3, C=5),
+            dict(A=1, B=2, C=5),
+            dict(A=1, B=3, C=5),
+        ]
+        self.assertEqual(out, expect)
+
     def test_no_choices(self):
         start = {}
         c = dict(start)
@@ -57,6 +91,47 @@ class TestMultiprocess(unittest.TestCase):
         results = multiprocess(arbitary_function, test_params)
         self.assertEqual(results, test_params)
 
+    def test_processes_chunksize(self):
+        test_params = [dict(test_kwarg=ix) for ix in range(20)]
+        for processes, chunksize in [(1, None), (2, 3), (None, 1)]:
+            with self.subTest(processes=processes, chunksize=chunksize):
+                results = multiprocess(
+                    arbitary_function,
+                    test_params,
+                    processes=processes,
+                    chunksize=chunksize,
+                )
+                self.assertEqual(results, test_params)
+
+    def test_iterable_params(self):
+        test_params = (dict(test_kwarg=ix) for ix in range(5))
+        results = multiprocess(arbitary_function, test_params)
+        self.assertEqual(results, [dict(test_kwarg=ix) for ix in range(5)])
+
+    def test_callback(self):
+        test_params = [dict(test_kwarg=ix) for ix in range(5)]
+        completed = []
+        results = multiprocess(
+            arbitary_function,
+            test_params,
+            callback=lambda ix, result, elapsed: completed.append((ix, result)),
+        )
+        self.assertEqual(
+            sorted(completed, key=lambda c: c[0]), list(enumerate(results))
+        )
+
+    def test_shared_arrays(self):
+        arr = np.ones((100, 100))
+        test_params = [dict(arr=arr, scale=ix) for ix in range(4)]
+        for share_threshold, writeable in [(0, False), (None, True)]:
+            with self.subTest(share_threshold=share_threshold):
+                results = multiprocess(
+                    array_function, test_params, share_threshold=share_threshold
+                )
+                self.assertEqual(
+                    results, [(arr.sum() * ix, writeable) for ix in range(4)]
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -11,13 +11,22 @@ from pyrolite.util.pd import (
     df_from_csvs,
     outliers,
     read_table,
+    read_table_chunks,
     to_frame,
     to_numeric,
     to_ser,
     uniques_from_concat,
+    write_table_chunks,
 )
 from pyrolite.util.synthetic import normal_frame, normal_series
 
+try:
+    import pyarrow
+
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
 
 class TestColumnOrderedAppend(unittest.TestCase):
     def setUp(self):
@@ -49,6 +58,46 @@ class TestReadTable(unittest.TestCase):
         self.assertTrue((df.columns == np.array(["C1", "C2"])).all())
 
 
+class TestTableChunks(unittest.TestCase):
+    def setUp(self):
+        self.dir = temp_path() / "test_table_chunks"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.df = normal_frame(columns=["SiO2", "MgO", "FeO"], size=25)
+        self.df.index = ["s{}".format(ix) for ix in self.df.index]
+
+    def _check_roundtrip(self, suffix):
+        fn = self.dir / ("test" + suffix)
+        chunks = [self.df.iloc[ix : ix + 10] for ix in range(0, 25, 10)]
+        out = write_table_chunks(chunks, fn)
+        self.assertTrue(out.exists())
+        for chunksize in [7, 25, 100]:
+            with self.subTest(chunksize=chunksize):
+                read = list(read_table_chunks(fn, chunksize=chunksize))
+                self.assertEqual(len(read), int(np.ceil(25 / chunksize)))
+                self.assertTrue(all(c.index.size <= chunksize for c in read))
+                df = pd.concat(read)
+                self.assertTrue((df.index == self.df.index).all())
+                self.assertTrue(np.allclose(df.values, self.df.values))
+
+    def test_csv(self):
+        self._check_roundtrip(".csv")
+
+    @unittest.skipUnless(HAVE_PYARROW, "Requires pyarrow.")
+    def test_parquet(self):
+        self._check_roundtrip(".parquet")
+
+    def test_inconsistent_columns(self):
+        fn = self.dir / "test.csv"
+        chunks = [self.df.iloc[:10], self.df.iloc[10:].assign(CaO=1.0)]
+        with self.assertLogs("pyrolite.util.pd", level="WARNING"):
+            write_table_chunks(chunks, fn)
+        df = pd.concat(read_table_chunks(fn))
+        self.assertTrue((df.columns == self.df.columns).all())
+
+    def tearDown(self):
+        remove_tempdir(self.dir)
+
+
 class TestAccumulate(unittest.TestCase):
     def setUp(self):
         self.df0 = normal_frame()
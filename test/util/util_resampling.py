@@ -10,6 +10,7 @@ from pyrolite.util.resampling import (  # _segmented_univariate_distance_matrix
     spatiotemporal_bootstrap_resample,
     univariate_distance_matrix,
 )
+from pyrolite.util.spatial import great_circle_distance
 from pyrolite.util.synthetic import normal_frame
 
 df = normal_frame()
@@ -85,6 +86,58 @@ class TestSpatioTemporalBoostrapResample(unittest.TestCase):
         _df = self.df
         output = spatiotemporal_bootstrap_resample(_df, niter=10, transform=np.log)
 
+    def test_random_state(self):
+        _df = self.df
+        outputs = [
+            spatiotemporal_bootstrap_resample(
+                _df, columns=self.geochem_columns, niter=10, random_state=seed
+            )
+            for seed in [1, 1, 2]
+        ]
+        self.assertTrue(np.allclose(outputs[0]["mean"], outputs[1]["mean"]))
+        self.assertFalse(np.allclose(outputs[0]["mean"], outputs[2]["mean"]))
+
+    def test_processes(self):
+        _df = self.df
+        _df["Grouping"] = np.random.randint(3, size=_df.index.size)
+        expect = spatiotemporal_bootstrap_resample(
+            _df,
+            columns=self.geochem_columns,
+            niter=10,
+            categories="Grouping",
+            random_state=5,
+        )
+        for backend in ["process", "thread"]:
+            with self.subTest(backend=backend):
+                output = spatiotemporal_bootstrap_resample(
+                    _df,
+                    columns=self.geochem_columns,
+                    niter=10,
+                    categories="Grouping",
+                    random_state=5,
+                    processes=2,
+                    backend=backend,
+                )
+                for metric, data in expect.items():
+                    self.assertTrue((output[metric].index == data.index).all())
+                    self.assertTrue(np.allclose(output[metric], data, equal_nan=True))
+
+    def test_metrics(self):
+        _df = self.df
+        metrics = ["mean", "var", "std", "median", np.max]
+        output = spatiotemporal_bootstrap_resample(
+            _df, columns=self.geochem_columns, niter=10, metrics=metrics
+        )
+        self.assertEqual(len(output), len(metrics))
+        for metric, data in output.items():
+            self.assertEqual(data.shape, (10, len(self.geochem_columns)))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(NotImplementedError):
+            spatiotemporal_bootstrap_resample(
+                self.df, columns=self.geochem_columns, processes=2, backend="unknown"
+            )
+
 
 class TestGetSpatiotemporalResamplingWeights(unittest.TestCase):
     def setUp(self):
@@ -97,6 +150,50 @@ class TestGetSpatiotemporalResamplingWeights(unittest.TestCase):
         self.assertTrue(np.isclose(weights.sum(), 1.0))
         self.assertTrue(weights.size == _df.index.size)
 
+    def test_max_block_memory(self):
+        # results should be independent of the number of rows processed at a time
+        _df = _get_spatiotemporal_dataframe(50)
+        weights = get_spatiotemporal_resampling_weights(_df)
+        for max_block_memory in [1, 10000, 2**20]:
+            with self.subTest(max_block_memory=max_block_memory):
+                blocked = get_spatiotemporal_resampling_weights(
+                    _df, max_block_memory=max_block_memory
+                )
+                self.assertTrue(np.allclose(blocked, weights))
+
+    def test_against_distance_matrices(self):
+        _df = _get_spatiotemporal_dataframe(50)
+        z = great_circle_distance(_df[["Latitude", "Longitude"]])
+        t = np.abs(_df["Age"].values[:, None] - _df["Age"].values[None, :])
+        invdist = 1.0 / ((z / 1.8) ** 2 + 1) + 1.0 / ((t / 38) ** 2 + 1)
+        expect = 1.0 / invdist.sum(axis=0)
+        weights = get_spatiotemporal_resampling_weights(_df)
+        self.assertTrue(np.allclose(weights, expect / expect.sum()))
+
+    def test_error_bounds(self):
+        _df = self.df
+        weights, errors = get_spatiotemporal_resampling_weights(
+            _df, return_error_bounds=True
+        )
+        self.assertTrue(weights.shape == errors.shape)
+        self.assertTrue((errors == 0).all())
+
+    def test_approximate(self):
+        _df = _get_spatiotemporal_dataframe(100)
+        weights = get_spatiotemporal_resampling_weights(_df)
+        for truncation in [0.5, 2, 10]:
+            with self.subTest(truncation=truncation):
+                approx, errors = get_spatiotemporal_resampling_weights(
+                    _df,
+                    approximate=True,
+                    truncation=truncation,
+                    return_error_bounds=True,
+                )
+                self.assertTrue(np.isclose(approx.sum(), 1.0))
+                # the reported relative errors should bound the actual errors
+                rel_error = np.abs(approx / weights - 1)
+                self.assertTrue((rel_error <= errors + 1e-6).all())
+
 
 class TestUnivariateDistanceMatrix(unittest.TestCase):
     def setUp(self):
@@ -83,6 +83,62 @@ class TestTimescale(unittest.TestCase):
         v = list(map(self.ts.text2age, ages))
         self.assertFalse(pd.isnull(v).any())
 
+    def test_named_ages(self):
+        ages = self.test_ages + [66.0]  # 66 Ma is the Cretaceous-Paleogene boundary
+        expected = {
+            "Eon": [
+                "Phanerozoic",
+                "Phanerozoic",
+                "Precambrian",
+                "Precambrian",
+                "Phanerozoic",
+            ],
+            "Era": ["Cenozoic", "Cenozoic", "Proterozoic", "Archean", "Cenozoic"],
+            "Period": [
+                "Quaternary",
+                "Neogene",
+                "Neo-proterozoic",
+                "Hadean",
+                "Paleogene",
+            ],
+            "Specific": [
+                "Meghalayan",
+                "Tortonian",
+                "Stenian",
+                "Hadean",
+                "Maastrichtian",
+            ],
+        }
+        for level, expect in expected.items():
+            with self.subTest(level=level):
+                names = self.ts.named_ages(ages, level=level)
+                self.assertIsInstance(names, pd.Categorical)
+                self.assertEqual(list(names), expect)
+                self.assertEqual(self.ts.named_age(ages[-1], level=level), expect[-1])
+
+    def test_named_age_not_found(self):
+        with self.assertRaises(ValueError):
+            self.ts.named_age(1000.0, level="Age")  # no ages defined in the Stenian
+
+    def test_named_ages_series(self):
+        ages = pd.Series(self.test_ages + [-10.0, np.nan], index=list("abcdef"))
+        names = self.ts.named_ages(ages, level="Era")
+        self.assertIsInstance(names, pd.Series)
+        self.assertTrue((names.index == ages.index).all())
+        self.assertTrue(names.iloc[-2:].isnull().all())
+
+    def test_text2ages(self):
+        ages = pd.Series(["Holocene", "Jurassic", "not an age", "10"])
+        ranges = self.ts.text2ages(ages)
+        self.assertTrue((ranges.columns == ["Start", "End"]).all())
+        for ix, entry in ages.items():
+            with self.subTest(entry=entry):
+                self.assertTrue(
+                    np.allclose(
+                        ranges.loc[ix].values, self.ts.text2age(entry), equal_nan=True
+                    )
+                )
+
 
 class TestTimescaleReferenceFrame(unittest.TestCase):
     """